@@ -0,0 +1,269 @@
+import tensorflow as tf
+tf.compat.v1.logging.set_verbosity(tf.compat.v1.logging.ERROR)
+import os
+os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
+import concurrent.futures
+import json
+import math
+import multiprocessing
+import sqlite3
+import sys
+import time
+import numpy as np
+from lib.Pre_Process import Pre_Process
+from lib.Train import Train
+from lib.Pre.Budget import Budget
+"""
+========================================================================================================================
+
+    This code is to search the settings of the FNN and the optimiser (width, depth and activation function of the FNN,
+    and the memory m and the line search steps maxls of the L-BFGS-B optimiser) for the 1D stretching rod problem, by
+    the Hyperband method: several brackets of successive halving, each of which trains a set of sampled settings for a
+    small budget of evaluations, and keeps the best 1/eta of them for a budget eta times larger, up to max_evals.
+
+    Each trial trains the PINN of Pre_Process() with the settings (see the 'settings' of Pre_Process()), from the same
+    seed and within its budget of evaluations (see Budget.py), and is ranked by its final loss. The trials run in
+    parallel worker processes, each pinned to its own set of cores, with the threads of TensorFlow limited to these
+    cores. The result of every trial is saved to a local SQLite database, so that a repeated (or extended) search
+    takes the trials already run from the database instead of training them again.
+
+    At the end, the best settings trained with the full budget are printed. The trials in the database are listed by:
+        sqlite3 Hyperband.db "SELECT settings, budget, loss FROM trials ORDER BY budget DESC, loss LIMIT 10"
+
+    Run this code in the '1D' folder:
+        python Hyperband.py
+
+========================================================================================================================
+"""
+
+### The name of the problem, which keys the trials in the database
+PROBLEM = '1D'
+
+class Database:
+    """
+    ====================================================================================================================
+
+    This is the class for the SQLite database of the trials, keyed by the problem, the settings, the seed and the
+    budget of evaluations. It is only accessed by the main process. This class include 3 functions, including:
+        1. __init__()         : Open the database, and create the table of the trials if required;
+        2. get()              : Return the result of a trial if it is in the database;
+        3. put()              : Save the result of a trial.
+
+    ====================================================================================================================
+    """
+
+    def __init__(self, path='Hyperband.db'):
+        self.connection = sqlite3.connect(path)
+        self.connection.execute('CREATE TABLE IF NOT EXISTS trials (problem TEXT, settings TEXT, seed INTEGER, '
+                                'budget INTEGER, loss REAL, evaluations INTEGER, time REAL, created TEXT, '
+                                'PRIMARY KEY (problem, settings, seed, budget))')
+        self.connection.commit()
+
+    def get(self, settings, seed, budget):
+        row = self.connection.execute('SELECT loss FROM trials WHERE problem = ? AND settings = ? AND seed = ? AND '
+                                      'budget = ?', (PROBLEM, Key(settings), seed, budget)).fetchone()
+        if row is None:
+            return None
+        return row[0] if row[0] is not None else np.inf
+
+    def put(self, settings, seed, budget, loss, evaluations, t):
+        self.connection.execute('INSERT OR REPLACE INTO trials VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                                (PROBLEM, Key(settings), seed, budget, loss if np.isfinite(loss) else None,
+                                 evaluations, t, time.strftime('%Y-%m-%d %H:%M:%S')))
+        self.connection.commit()
+
+def Key(settings):
+    """
+    ====================================================================================================================
+
+    Key function is to return the settings as a canonical JSON string, which keys the trials in the database.
+
+    ====================================================================================================================
+    """
+
+    return json.dumps(settings, sort_keys=True)
+
+def Pin(slots):
+    """
+    ====================================================================================================================
+
+    Pin function is run once by each worker process, to pin it to a free set of cores, and limit the threads of
+    TensorFlow to them (before TensorFlow is initialised).
+
+    --------------------------------------------------------------------------------------------------------------------
+
+    Name        Type                    Info.
+
+    [slots]     [Queue]                 : The disjoint sets of cores, one per worker process.
+
+    ====================================================================================================================
+    """
+
+    cores = slots.get()
+    if hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, cores)
+    tf.config.threading.set_intra_op_parallelism_threads(len(cores))
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+    ### The progress of the trials is printed by the main process only
+    sys.stdout = open(os.devnull, 'w')
+
+    return None
+
+def Trial(settings, seed, budget):
+    """
+    ====================================================================================================================
+
+    Trial function is run by a worker process, to train the PINN with the settings within the budget of evaluations.
+
+    --------------------------------------------------------------------------------------------------------------------
+
+    Name        Type                    Info.
+
+    [settings]  [dict]                  : The settings of the FNN and the optimiser (see Pre_Process());
+    [seed]      [int]                   : The random seed of the trial;
+    [budget]    [int]                   : The budget of evaluations;
+    [l]         [float]                 : The final loss;
+    [it]        [int]                   : The number of evaluations;
+    [t]         [float]                 : The training time.
+
+    ====================================================================================================================
+    """
+
+    tf.keras.backend.clear_session()
+    tf.random.set_seed(seed)
+    np.random.seed(seed)
+    opt = Pre_Process(checkpoint_path=None, settings=settings)[-1]
+    t, l, it, his_loss = Train(opt, budget=Budget(max_evals=budget))
+
+    return float(l), int(it), t
+
+def Sample(space, n, rng):
+    """
+    ====================================================================================================================
+
+    Sample function is to sample n distinct settings from the search space (fewer if the space is smaller).
+
+    --------------------------------------------------------------------------------------------------------------------
+
+    Name        Type                    Info.
+
+    [space]     [dict]                  : The candidate values of each setting;
+    [n]         [int]                   : Number of settings;
+    [rng]       [Generator]             : The random number generator of the search.
+
+    ====================================================================================================================
+    """
+
+    samples = {}
+    for _ in range(100 * n):
+        settings = { k: v[int(rng.integers(len(v)))] for k, v in space.items() }
+        samples[Key(settings)] = settings
+        if len(samples) == n:
+            break
+
+    return list(samples.values())
+
+def Hyperband(space, min_evals=50, max_evals=1350, eta=3, seed=0, cores_per_trial=1, path='Hyperband.db'):
+    """
+    ====================================================================================================================
+
+    Hyperband function is to search the settings by the Hyperband method.
+
+    --------------------------------------------------------------------------------------------------------------------
+
+    Name        Type                    Info.
+
+    [space]     [dict]                  : The candidate values of each setting, e.g., {'width': [5, 10, 20]};
+    [min_evals] [int]                   : The smallest budget of evaluations of a trial;
+    [max_evals] [int]                   : The largest budget of evaluations of a trial;
+    [eta]       [int]                   : The ratio between the budgets of two successive rungs, as well as the ratio
+                                          of the settings that are cut at each rung;
+    [seed]      [int]                   : The seed of the sampling of the settings and of the trials (the same seed
+                                          samples the same settings again, whose trials are taken from the database);
+    [cores_per_trial] [int]             : Number of cores of each trial;
+    [path]      [str]                   : The path of the SQLite database;
+    [s_max]     [int]                   : The index of the most exploratory bracket;
+    [n]         [int]                   : Number of the sampled settings of a bracket;
+    [r]         [float]                 : The budget of the first rung of a bracket;
+    [results]   [list]                  : The settings trained with the full budget, with their final losses.
+
+    ====================================================================================================================
+    """
+
+    database = Database(path)
+    rng = np.random.default_rng(seed)
+
+    ### Split the available cores into disjoint sets, one per worker process
+    if hasattr(os, 'sched_getaffinity'):
+        cores = sorted(os.sched_getaffinity(0))
+    else:
+        cores = list(range(os.cpu_count()))
+    cores_per_trial = max(1, min(cores_per_trial, len(cores)))
+    sets = [ cores[i:i + cores_per_trial] for i in range(0, len(cores) - cores_per_trial + 1, cores_per_trial) ]
+
+    ### The workers are spawned, as TensorFlow does not support forking
+    ctx = multiprocessing.get_context('spawn')
+    slots = ctx.Queue()
+    for s in sets:
+        slots.put(s)
+    executor = concurrent.futures.ProcessPoolExecutor(max_workers=len(sets), mp_context=ctx, initializer=Pin,
+                                                      initargs=(slots,))
+
+    s_max = int(math.log(max_evals / min_evals) / math.log(eta) + 1e-9)
+    results = []
+    time_start = time.time()
+    for s in range(s_max, -1, -1):
+
+        ### Sample the settings of the bracket
+        n = int(math.ceil((s_max + 1) / (s + 1) * eta ** s))
+        r = max_evals * eta ** (-s)
+        configs = Sample(space, n, rng)
+        print('\nBracket %d: %d settings from %d evaluations' % (s, len(configs), int(round(r))))
+
+        for i in range(s + 1):
+
+            ### Train the settings of the rung, taking the trials already run from the database
+            budget = int(round(r * eta ** i))
+            losses = { Key(c): database.get(c, seed, budget) for c in configs }
+            futures = { executor.submit(Trial, c, seed, budget): c for c in configs if losses[Key(c)] is None }
+            print('Rung %d: %d settings, %d evaluations, %d from the database' % (i, len(configs), budget,
+                  len(configs) - len(futures)))
+            for future in concurrent.futures.as_completed(futures):
+                c = futures[future]
+                try:
+                    l, it, t = future.result()
+                except Exception as error:
+                    print('Trial %s failed: %s' % (Key(c), error))
+                    l, it, t = np.inf, 0, 0.
+                l = l if np.isfinite(l) else np.inf
+                database.put(c, seed, budget, l, it, t)
+                losses[Key(c)] = l
+                print('%s: loss = %.6g' % (Key(c), l))
+
+            ### Keep the best 1/eta of the settings for the next rung
+            configs = sorted(configs, key=lambda c: losses[Key(c)])
+            if i == s:
+                results.extend((c, losses[Key(c)]) for c in configs)
+            configs = configs[:max(1, len(configs) // eta)]
+
+    executor.shutdown()
+
+    ### List the settings trained with the full budget
+    results = sorted(results, key=lambda x: x[1])
+    print('\n*************************************************')
+    print('Hyperband search, %d brackets in %.1f s' % (s_max + 1, time.time() - time_start))
+    print('*************************************************\n')
+    print('%-14s %s' % ('Final loss', 'Settings (%d evaluations)' % max_evals))
+    for c, l in results:
+        print('%-14.6g %s' % (l, Key(c)))
+    print('\nThe best settings are', Key(results[0][0]))
+    print('\n*************************************************\n')
+
+    return results[0][0]
+
+if __name__ == '__main__':
+
+    space = {'width': [3, 5, 10, 20], 'depth': [1, 2, 3, 4], 'acti_fun': ['tanh', 'sigmoid', 'swish'],
+             'm': [10, 50, 100], 'maxls': [20, 50]}
+    Hyperband(space, min_evals=50, max_evals=1350, eta=3, cores_per_trial=1)
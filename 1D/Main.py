@@ -1,10 +1,13 @@
 import tensorflow as tf
 tf.compat.v1.logging.set_verbosity(tf.compat.v1.logging.ERROR)
 import os
+import sys
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
 from lib.Pre_Process import Pre_Process
 from lib.Train import Train
 from lib.Post_Process import Post_Process
+from lib.Pre.Budget import Budget
+from lib.Pre.Validation import Validation
 """
 ========================================================================================================================
 
@@ -32,13 +35,29 @@ from lib.Post_Process import Post_Process
         'Matplotlib'     https://matplotlib.org/
         'time'           In Python3
         'os'             In Python3
+        'sys'            In Python3
         'Pre_Process'    Self developed                     ./lib
         'Train'          Self developed                     ./lib
         'Post_Process'   Self developed                     ./lib
         'Input_Info'     Self developed                     ./lib/Pre/
         'FNN'            Self developed                     ./lib/Pre/
         'PINN'           Self developed                     ./lib/Pre/
+        'Precision'      Self developed                     ./lib/Pre/
         'L_BFGS_B'       Self developed                     ./lib/Pre/
+        'L_BFGS_TF'      Self developed                     ./lib/Pre/
+        'L_BFGS_PLS'     Self developed                     ./lib/Pre/
+        'Newton_CG'      Self developed                     ./lib/Pre/
+        'Adam'           Self developed                     ./lib/Pre/
+        'Schedule'       Self developed                     ./lib/Pre/
+        'Parallel'       Self developed                     ./lib/Pre/
+        'Telemetry'      Self developed                     ./lib/Pre/
+        'Checkpoint'     Self developed                     ./lib/Pre/
+        'Sampler'        Self developed                     ./lib/Pre/
+        'Quadrature'     Self developed                     ./lib/Pre/
+        'Budget'         Self developed                     ./lib/Pre/
+        'Weighting'      Self developed                     ./lib/Pre/
+        'Augmented_Lagrangian' Self developed               ./lib/Pre/
+        'Validation'     Self developed                     ./lib/Pre/
         'Loss'           Self developed                     ./lib/Pre/
         
     This code is developed by @Jinshuai Bai and @Yuantong Gu. For more details, please contact: 
@@ -58,13 +77,24 @@ if __name__ == '__main__':
             5. Initialize the optimiser
     """
     
-    net_u, pinn, l_bfgs_b = Pre_Process()
+    ### Checkpoint the training only if asked for, by 'python Main.py checkpoint' or 'python Main.py resume'
+    checkpoint_path = 'Checkpoint.npz' if {'checkpoint', 'resume'} & set(sys.argv[1:]) else None
+    net_u, pinn, opt = Pre_Process(checkpoint_path=checkpoint_path)
     
     """
-        Train() function is to train the PINN with the selected optimiser 
+        Train() function is to train the PINN with the selected optimiser,
+        within the budgets of wall-clock time, plateau of the loss terms and validation error, if any are given
+        (python Main.py checkpoint saves a checkpoint every 10 minutes, python Main.py resume continues from the
+        latest checkpoint; with the checkpoints, the first Ctrl-C saves a checkpoint and stops the training at the
+        next evaluation of the loss, and only a second Ctrl-C interrupts it at once)
     """
     
-    T, L, it, his_loss = Train(l_bfgs_b)
+    budget = None
+
+    ### Or, stop the training within the budgets given (see Budget.py)
+    # budget = Budget(max_time=600., window=1000, validation=Validation(net_u), target_error=1e-3)
+
+    T, L, it, his_loss = Train(opt, resume='resume' in sys.argv[1:], budget=budget)
     
     """
         Post_Process() function is to:
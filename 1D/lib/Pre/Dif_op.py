@@ -1,4 +1,5 @@
 import tensorflow as tf
+from lib.Pre.Taylor import Taylor, Taylor_terms
 
 class Dif(tf.keras.layers.Layer):
     """
@@ -13,7 +14,7 @@ class Dif(tf.keras.layers.Layer):
     ====================================================================================================================
     """
 
-    def __init__(self, fnn, **kwargs):
+    def __init__(self, fnn, order=2, taylor=False, **kwargs):
         """
         ================================================================================================================
 
@@ -23,12 +24,20 @@ class Dif(tf.keras.layers.Layer):
 
         Name        Type                    Info.
 
-        [fnn]       [Keras model]           : The Feedforward Neural Network.
+        [fnn]       [Keras model]           : The Feedforward Neural Network;
+        [order]     [int]                   : The highest order of the derivatives to be calculated (1 or 2);
+        [taylor]    [bool]                  : Whether to obtain the differential terms by the Taylor-mode forward
+                                              sweep (see Taylor.py) instead of the nested GradientTape functions.
         
         ================================================================================================================
         """
         self.fnn = fnn
-        super().__init__(**kwargs)
+        self.order = order
+        self.taylor = Taylor(fnn, 0, order) if taylor else None
+
+        ### Keep the coordinates, the derivatives and the loss in the floating-point type of the inputs, as the layer
+        ### would otherwise follow the mixed precision policy and cast the coordinates to bfloat16 (see Precision.py)
+        super().__init__(dtype=kwargs.pop('dtype', tf.keras.backend.floatx()), **kwargs)
 
     def call(self, x):
         """
@@ -49,6 +58,22 @@ class Dif(tf.keras.layers.Layer):
         ================================================================================================================
         """
 
+        ### Obtain the differential terms by the Taylor-mode forward sweep, if required
+        if self.taylor is not None:
+            _, dU, ddU = self.taylor(x)
+            terms = Taylor_terms(dU, ddU)
+
+            return terms[0] if self.order == 1 else terms
+
+        ### Obtain the first-order derivative only, if the second-order derivative is not required
+        if self.order == 1:
+            with tf.GradientTape() as g:
+                g.watch(x)
+                u = self.fnn(x) * x
+            u_x = g.gradient(u, x)
+
+            return u_x
+
         ### Apply the GradientTape function
         with tf.GradientTape(persistent=True) as gg:
             gg.watch(x)
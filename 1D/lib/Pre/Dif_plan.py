@@ -0,0 +1,49 @@
+def Dif_plan(outputs):
+    """
+    ====================================================================================================================
+
+    This function is to plan the highest derivative order required by each point set, based on the outputs of the
+    Material function that the point set actually contributes to the PINN. Point sets which only need the strain or
+    stress (e.g., the traction boundaries) are then sent through a cheaper first-order differential operator.
+
+    --------------------------------------------------------------------------------------------------------------------
+
+    Name        Type                    Info.
+
+    [outputs]   [dict]                  : The names of the used Material outputs for each point set;
+    [order]     [dict]                  : The derivative order required by each output of the Material function;
+    [plan]      [dict]                  : The highest derivative order required by each point set.
+
+    ====================================================================================================================
+    """
+
+    ### Define the derivative order required by each output of the Material function
+    order = {'epsilon': 1, 'sigma': 1, 'Ge': 2}
+
+    ### Take the highest order over the used outputs of each point set
+    plan = { k: max([ order[o] for o in v ]) for k, v in outputs.items() }
+
+    return plan
+
+def Dif_terms(terms, n):
+    """
+    ====================================================================================================================
+
+    This function is to pad the terms returned by a differential operator with None, so that the first-order and the
+    second-order differential operators can be unpacked in the same way.
+
+    --------------------------------------------------------------------------------------------------------------------
+
+    Name        Type                    Info.
+
+    [terms]     [tuple]                 : The terms returned by the differential operator (or the single term);
+    [n]         [int]                   : Number of the terms returned by the second-order differential operator.
+
+    ====================================================================================================================
+    """
+
+    ### Wrap the single term returned by the first-order differential operator
+    if not isinstance(terms, (tuple, list)):
+        terms = (terms,)
+
+    return tuple(terms) + (None,) * (n - len(terms))
@@ -36,8 +36,9 @@ def FNN(n_input, n_output, layers, acti_fun='tanh', k_init='LecunNormal'):
     for l in layers:
         temp = tf.keras.layers.Dense(l, activation = acti_fun, kernel_initializer=k_init)(temp)
     
-    ### Setup the output layers of the FNN
-    y = tf.keras.layers.Dense(n_output, kernel_initializer=k_init)(temp)
+    ### Setup the output layers of the FNN (in the type of the inputs, also under the mixed precision policy, see
+    ### Precision.py)
+    y = tf.keras.layers.Dense(n_output, kernel_initializer=k_init, dtype=tf.keras.backend.floatx())(temp)
 
     ### Combine the input, hidden, and output layers to build up a FNN
     net = tf.keras.models.Model(inputs=x, outputs=y)
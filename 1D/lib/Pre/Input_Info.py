@@ -1,6 +1,9 @@
 import numpy as np
+from lib.Pre.Precision import Precision
+from lib.Pre.Sampler import Sampler
+from lib.Pre.Quadrature import Quadrature
 
-def Input_Info():
+def Input_Info(precision='float32', settings=None, sampler=None, quadrature=None):
     """
     ====================================================================================================================
 
@@ -14,8 +17,16 @@ def Input_Info():
 
     Name        Type                    Info.
 
+    [precision] [str]                   : The precision policy (see Precision.py);
+    [settings]  [dict]                  : The FNN settings that override the ones defined below, {'width', 'depth',
+                                          'acti_fun'} (e.g., in the trials of Hyperband.py);
+    [sampler]   [Sampler]               : The sampler of the point sets (None for the uniform grid, see Sampler.py);
+    [quadrature][tuple]                 : Number of cells along each axis and number of Gauss-Legendre points per
+                                          axis in each cell, (n_cells, order), for the energy-based loss (None for the
+                                          sample points of the sampler or the grid, see Quadrature.py);
+    [dtype]     [str]                   : The floating-point type of the point sets and the boundary conditions;
     [ns]        [int]                   : Total number of sample points;
-    [dx]        [float]                 : Sample points interval;
+    [dx]        [float or list]         : Sample points interval, or the quadrature weights of the domain points;
     [xy]        [Array of float32]      : Coordinates of all the sample points;
     [xy_r]      [Array of float32]      : Coordinates of the sample points on the right tip of the rod;
     [x_train]   [List]                  : PINN input list, contains all the coordinates information;
@@ -36,18 +47,29 @@ def Input_Info():
         
     ====================================================================================================================
     """
+
+    ### Set the precision policy
+    dtype = Precision(precision)
     
     ### Define the number of sample points
     ns = 51
     
-    ### Define the sample points' interval
-    dx = 1./(ns-1)
-    
-    ### Initialize sample points' coordinates
-    xy = np.zeros((ns, 1)).astype(np.float32)
-    for i in range(0, ns):
-        xy[i, 0] = i * dx
-    xy_r = np.array([1.])
+    ### Initialize sample points' coordinates, on the uniform grid unless a sampler is given
+    if sampler is not None and quadrature is not None:
+        raise ValueError('The sample points are either drawn by the sampler or placed by the quadrature.')
+    sampler = sampler if sampler is not None else Sampler('grid')
+    xy = sampler.interior(ns, [0.], [1.], key=0).astype(dtype)
+
+    ### Define the sample points' interval (the length per point for the points which are not on the grid)
+    dx = 1./(ns-1) if sampler.method == 'grid' else 1./ns
+
+    ### Or, place the sample points at the Gauss-Legendre points of n_cells cells, whose quadrature weights replace the
+    ### sample points' interval in the energy-based loss
+    if quadrature is not None:
+        n_cells, order = quadrature
+        xy, w = Quadrature([n_cells], order, [0.], [1.])
+        xy, ns, dx = xy.astype(dtype), len(xy), [w.astype(dtype)]
+    xy_r = np.array([1.]).astype(dtype)
     
     ### Create the PINN input list
     x_train = [xy, xy_r]
@@ -67,6 +89,11 @@ def Input_Info():
     layer = [np.array([5, 5, 5])]
     acti_fun = 'tanh'
     k_init = 'LecunNormal'
+
+    ### Override the FNN settings, if required
+    if settings is not None:
+        layer = [ np.full(settings.get('depth', len(l)), settings.get('width', l[0])) for l in layer ]
+        acti_fun = settings.get('acti_fun', acti_fun)
     NN_info = [n_input, n_output, layer, acti_fun, k_init]
 
     ### Visualise the summary of the problem setup
@@ -30,6 +30,32 @@ def Collocation_Loss(y_p, y):
 
     return loss, l1, l2
     
+def Collocation_Terms(y_p, y):
+    """
+    ====================================================================================================================
+
+    Collocation terms function, which gives the residuals of the equilibrium equation and the traction boundary
+    condition separately, so that the sum of squares of each is one term of the collocation loss. It is used by the
+    adaptive weighting of the loss terms (see Weighting.py).
+
+    --------------------------------------------------------------------------------------------------------------------
+
+    Name        Type                    Info.
+
+    [y_p]       [list]                  : Outputs from the PINN;
+    [y]         [list]                  : The ground truth data;
+    [terms]     [list]                  : The residuals, scaled by 1 / sqrt(number of points), as the loss terms are
+                                          means;
+    [n_eq]      [int]                   : Number of the terms from the equilibrium equation, which come first.
+
+    ====================================================================================================================
+    """
+
+    terms = [y_p[0], y_p[1]-y[0]]
+    terms = [ t / tf.sqrt(tf.cast(tf.size(t), t.dtype)) for t in terms ]
+
+    return terms, 1
+
 def Energy_Loss(y_p, y, dx):
     """
     ====================================================================================================================
@@ -42,7 +68,8 @@ def Energy_Loss(y_p, y, dx):
 
     [y_p]       [list]                  : Outputs from the PINN;
     [y]         [list]                  : The ground truth data;
-    [dx]        [float]                 : Sample points interval;
+    [dx]        [float or list]         : Sample points interval, or the quadrature weights of the domain points
+                                          (see Quadrature.py);
     [l1]        [Keras tensor]          : The internal potential energy;
     [l2]        [Keras tensor]          : The potential energy of the external traction force;
     [loss]      [Keras tensor]          : The final loss
@@ -50,8 +77,11 @@ def Energy_Loss(y_p, y, dx):
     ====================================================================================================================
     """
 
-    ### Internal potential energy
-    l1 = 0.5 * dx * tf.reduce_sum(y_p[2] * y_p[3])
+    ### Internal potential energy (the weighted sum of the quadrature, if the weights are given)
+    if isinstance(dx, (list, tuple)):
+        l1 = 0.5 * tf.reduce_sum(dx[0] * y_p[2] * y_p[3])
+    else:
+        l1 = 0.5 * dx * tf.reduce_sum(y_p[2] * y_p[3])
     ### Potential energy of the external force
     l2 = tf.reduce_sum(y_p[4] * y[0])
     ### Final Loss
@@ -9,7 +9,8 @@ def Material(U_x, U_xx, E):
     Name        Type                    Info.
 
     [U_x]       [Keras tensor]          : First-order derivative of displacement with respect to x direction;
-    [U_xx]      [Keras tensor]          : Second-order derivative of displacement with respect to x direction;
+    [U_xx]      [Keras tensor]          : Second-order derivative of displacement with respect to x direction (None if it
+                                          is not required);
     [epsilon]   [Keras tensor]          : Strain;
     [sigma]     [Keras tensor]          : Stress;
     [Ge]        [Keras tensor]          : Residual from the equilibrium equation;
@@ -24,7 +25,7 @@ def Material(U_x, U_xx, E):
     ### Calculate stress
     sigma = E * epsilon
 
-    ### Calculate the residual from equilibrium equation
-    Ge = E * U_xx
+    ### Calculate the residual from equilibrium equation (not available if the second-order derivative is not provided)
+    Ge = None if U_xx is None else E * U_xx
 
     return epsilon, sigma, Ge
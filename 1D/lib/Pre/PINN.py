@@ -1,8 +1,9 @@
 import tensorflow as tf
 from lib.Pre.Material import Material
 from lib.Pre.Dif_op import Dif
+from lib.Pre.Dif_plan import Dif_plan, Dif_terms
 
-def PINN(net_u, E):
+def PINN(net_u, E, taylor=False):
     """
     ====================================================================================================================
 
@@ -21,12 +22,14 @@ def PINN(net_u, E):
     [U_r_x]     [Keras tensor]          : First-order derivative of displacement at the right tip of the rod with
                                           respect to x direction;
     [U_r_xx]    [Keras tensor]          : Second-order derivative of displacement at the right tip of the rod with
-                                          respect to x direction;
+                                          respect to x direction (None, as it is not required);
+    [plan]      [dict]                  : The highest derivative order required by each point set;
     [epsilon]   [Keras tensor]          : Strain;
     [sigma]     [Keras tensor]          : Stress;
     [Ge]        [Keras tensor]          : Residual from the equilibrium equation;
     [sigma_r]   [Keras tensor]          : Stress at the right tip of the rod;
-    [E]         [float]                 : Young's module.
+    [E]         [float]                 : Young's module;
+    [taylor]    [bool]                  : Whether to obtain the differential terms by the Taylor-mode forward sweep.
 
     ====================================================================================================================
     """
@@ -35,15 +38,18 @@ def PINN(net_u, E):
     xy = tf.keras.layers.Input(shape=(1,))
     xy_r = tf.keras.layers.Input(shape=(1,))
     
-    ### initialize the differential operators
-    Dif_u = Dif(net_u)
+    ### plan the derivative orders required by each point set from the Material outputs it contributes
+    plan = Dif_plan({'xy': ['Ge', 'sigma', 'epsilon'], 'xy_r': ['sigma']})
+
+    ### initialize the differential operators, one for each of the planned orders
+    Dif_u = { o: Dif(net_u, order=o, taylor=taylor) for o in set(plan.values()) }
     
     ### obtain the displacment at the right tip of the rod
     u_r = net_u(xy_r) * xy_r
     
     ### obtain partial derivatives of u with respect to x
-    u_x, u_xx = Dif_u(xy)
-    u_r_x, u_r_xx = Dif_u(xy_r)
+    u_x, u_xx = Dif_terms(Dif_u[plan['xy']](xy), 2)
+    u_r_x, u_r_xx = Dif_terms(Dif_u[plan['xy_r']](xy_r), 2)
        
     ### obtain the residuals from the governing equation and traction boundary condition
     epsilon, sigma, Ge = Material(u_x, u_xx, E)
@@ -0,0 +1,215 @@
+import multiprocessing
+import numpy as np
+import tensorflow as tf
+from lib.Pre.L_BFGS_B import L_BFGS_B
+from lib.Pre.Precision import Precision
+
+def Worker(conn, build, build_args, x_train, y_train, dx, w, bc, n_threads, policy):
+    """
+    ====================================================================================================================
+
+    Worker function is to evaluate the physics-informed loss and its flat gradients on one shard of the domain points,
+    in a separate process. It builds up its own copy of the PINN, then repeatedly receives the flat weights and biases,
+    and sends back its contributions to the loss terms and the gradients, until None is received.
+
+    --------------------------------------------------------------------------------------------------------------------
+
+    Name        Type                    Info.
+
+    [conn]      [Connection]            : The pipe connected to the main process;
+    [build]     [function]              : The function that builds up the FNNs and the PINN (see Pre_Process.py);
+    [build_args][tuple]                 : The arguments of the build function;
+    [x_train]   [list]                  : PINN input list, with the shard of the domain points;
+    [y_train]   [list]                  : PINN boundary condition list, contains the traction boundary condition;
+    [dx]        [float]                 : Sample points interval;
+    [w]         [float]                 : The weight of the domain term of the shard;
+    [bc]        [float]                 : 1 if the worker counts the boundary term, otherwise 0;
+    [n_threads] [int]                   : Number of threads used by TensorFlow in the worker;
+    [policy]    [str]                   : The precision policy of the main process (see Precision.py).
+
+    ====================================================================================================================
+    """
+
+    ### Limit the threads of the worker, so that the workers do not compete for the cores
+    tf.config.threading.set_intra_op_parallelism_threads(n_threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+    ### Follow the precision policy of the main process, as the spawned worker starts with the default one
+    Precision(policy)
+
+    ### Build up the copy of the PINN and its optimiser on the shard
+    opt = L_BFGS_B(build(*build_args)[-1], x_train, y_train, dx)
+    w = tf.constant(w, dtype=opt.dtype)
+    bc = tf.constant(bc, dtype=opt.dtype)
+
+    while True:
+        weights = conn.recv()
+        if weights is None:
+            break
+        opt.set_weights(weights)
+        loss, grads, l1, l2 = opt.chunk_loss_grad(opt.x_train, opt.y_train, w, bc)
+        conn.send((loss.numpy(), grads.numpy(), l1.numpy(), l2.numpy()))
+
+    conn.close()
+
+class Parallel(L_BFGS_B):
+    """
+    ====================================================================================================================
+
+    This is the class for the data-parallel L-BFGS-B optimiser. The domain points are split into one shard per worker
+    process, each holding a copy of the PINN (see Worker). At every call of the SciPy optimiser, the flat weights and
+    biases are broadcast to the workers, and the loss terms and the gradients are reduced by summation. The boundary
+    term is only counted by the first worker, and the domain term of each shard is weighted in the same way as the
+    chunked mode of the L-BFGS-B optimiser, so that the sums are exactly the full-batch loss and gradients. The workers
+    are started by 'spawn', so no TensorFlow state is shared with the main process.
+    This class include 5 functions, including:
+        1. __init__()         : Initialise the parameters for the data-parallel L-BFGS-B optimiser;
+        2. start()            : Start the worker processes;
+        3. accumulate_loss_grad() : Broadcast the weights and biases, and reduce the loss and the gradients;
+        4. stop()             : Stop the worker processes;
+        5. fit()              : Execute training process.
+
+    ====================================================================================================================
+    """
+
+    def __init__(self, pinn, x_train, y_train, dx, build, build_args=(), n_workers=2, n_threads=1, **kwargs):
+        """
+        ================================================================================================================
+
+        This function is to initialise the parameters used in the data-parallel L-BFGS-B optimiser.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [pinn]      [Keras model]           : The Physics-informed neural network;
+        [x_train]   [list]                  : PINN input list, contains all the coordinates information;
+        [y_train]   [list]                  : PINN boundary condition list, contains the traction boundary condition;
+        [dx]        [float]                 : Sample points interval;
+        [build]     [function]              : The module-level function that builds up the FNNs and the PINN, whose
+                                              last output is a PINN with the same structure as pinn;
+        [build_args][tuple]                 : The arguments of the build function;
+        [n_workers] [int]                   : Number of the worker processes;
+        [n_threads] [int]                   : Number of threads used by TensorFlow in each worker;
+        [kwargs]    [dict]                  : The other options of the L-BFGS-B optimiser.
+
+        ================================================================================================================
+        """
+
+        ### Split the domain points into one shard per worker, by the chunked mode of the L-BFGS-B optimiser
+        n = len(np.load(x_train[0], mmap_mode='r') if isinstance(x_train[0], str) else x_train[0])
+        super().__init__(pinn, x_train, y_train, dx, chunk_size=-(-n // n_workers), **kwargs)
+        self.build = build
+        self.build_args = build_args
+        self.n_threads = n_threads
+        self.pipes = []
+        self.workers = []
+
+    def start(self):
+        """
+        ================================================================================================================
+
+        This function is to start the worker processes.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [x_k]       [list]                  : PINN input list of the k-th worker;
+        [pipes]     [list]                  : The pipes connected to the workers;
+        [workers]   [list]                  : The worker processes.
+
+        ================================================================================================================
+        """
+
+        ctx = multiprocessing.get_context('spawn')
+        n = len(self.x_train[0])
+        y_train = [ y.numpy() for y in self.y_train ]
+        for k, start in enumerate(range(0, n, self.chunk_size)):
+            x_k = [ np.asarray(self.x_train[0][start:start + self.chunk_size]) ]
+            x_k = x_k + [ x.numpy() for x in self.x_train[1:] ]
+            w = len(x_k[0]) / n if self.reduction == 'mean' else 1.
+            bc = 1. if k == 0 else 0.
+            conn, child = ctx.Pipe()
+            worker = ctx.Process(target=Worker, daemon=True,
+                args=(child, self.build, self.build_args, x_k, y_train, self.dx, w, bc, self.n_threads,
+                      tf.keras.mixed_precision.global_policy().name))
+            worker.start()
+            child.close()
+            self.pipes.append(conn)
+            self.workers.append(worker)
+
+        return None
+
+    def accumulate_loss_grad(self, weights):
+        """
+        ================================================================================================================
+
+        This function is to broadcast the weights and biases to the workers, and reduce the loss and the gradients.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [weights]   [ndarray]               : The flat weights and biases;
+        [results]   [list]                  : The contributions (loss, grads, l1, l2) of the workers;
+        [loss]      [Keras tensor]          : Current value of the physics-informed loss (float64);
+        [grads]     [Keras tensor]          : The flat gradients of the physics-informed loss (float64);
+        [l1]        [Keras tensor]          : The l1 loss term;
+        [l2]        [Keras tensor]          : The l2 loss term.
+
+        ================================================================================================================
+        """
+
+        for conn in self.pipes:
+            conn.send(weights)
+        results = [ conn.recv() for conn in self.pipes ]
+        loss, grads, l1, l2 = [ tf.constant(np.sum(r, axis=0)) for r in zip(*results) ]
+
+        return loss, grads, l1, l2
+
+    def stop(self):
+        """
+        ================================================================================================================
+
+        This function is to stop the worker processes.
+
+        ================================================================================================================
+        """
+
+        for conn in self.pipes:
+            conn.send(None)
+            conn.close()
+        for worker in self.workers:
+            worker.join()
+        self.pipes = []
+        self.workers = []
+
+        return None
+
+    def fit(self):
+        """
+        ================================================================================================================
+
+        This function is to execute training process with the worker processes.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [result]    [tuple]                 : The result returned by the optimiser;
+        [his_loss]  [list]                  : History values of the loss terms.
+
+        ================================================================================================================
+        """
+
+        self.start()
+        try:
+            result, his_loss = super().fit()
+        finally:
+            self.stop()
+
+        ### Set the optimised weights and biases back to the PINN of the main process
+        self.set_weights(result[0])
+
+        return result, his_loss
@@ -0,0 +1,36 @@
+import tensorflow as tf
+
+def Precision(policy='float32'):
+    """
+    ====================================================================================================================
+
+    This function is to set the global precision policy, which is followed by the FNNs built by FNN(), the point sets
+    and the boundary conditions created by Input_Info(), and the tensors created by the optimisers. It must be called
+    before the FNNs are built. Three policies are available:
+        'float64'        : The weights, the inputs, the derivatives and the loss are all in float64, so that the
+                           L-BFGS-B optimiser is not stalled by the float32 rounding of the loss and the gradients;
+        'float32'        : Everything in float32 (the default, as in the original code);
+        'mixed_bfloat16' : The hidden layers of the FNNs compute in bfloat16, while the weights, the output layer, the
+                           derivatives and the loss accumulate in float32 (the differential operators are built in the
+                           type of the inputs, so that the Taylor-mode forward sweep, which reads the weights directly,
+                           computes in float32).
+
+    --------------------------------------------------------------------------------------------------------------------
+
+    Name        Type                    Info.
+
+    [policy]    [str]                   : The precision policy ('float64', 'float32' or 'mixed_bfloat16');
+    [dtype]     [str]                   : The floating-point type of the inputs, the outputs and the loss.
+
+    ====================================================================================================================
+    """
+
+    if policy not in ('float64', 'float32', 'mixed_bfloat16'):
+        raise ValueError('Unknown precision policy: ' + str(policy) + '.')
+
+    ### Set the type of the inputs and the outputs, and the types of the computations and the weights of the layers
+    dtype = 'float64' if policy == 'float64' else 'float32'
+    tf.keras.backend.set_floatx(dtype)
+    tf.keras.mixed_precision.set_global_policy(policy)
+
+    return dtype
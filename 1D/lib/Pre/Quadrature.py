@@ -0,0 +1,46 @@
+import numpy as np
+
+def Quadrature(n_cells, order, lower, upper):
+    """
+    ====================================================================================================================
+
+    This function is to generate the points and the weights of the tensor-product Gauss-Legendre quadrature on a box,
+    which is split into n_cells cells along each axis, with order points per axis in each cell. The quadrature of
+    order points integrates the polynomials up to the degree 2 * order - 1 exactly on each cell, so that the smooth
+    energy densities are integrated far more accurately than by the rectangle rule on the grid of the same number of
+    points. The points and the weights are used by the energy-based loss as weighted sums (see Energy_Loss()).
+
+    --------------------------------------------------------------------------------------------------------------------
+
+    Name        Type                    Info.
+
+    [n_cells]   [list of int]           : Number of cells along each axis;
+    [order]     [int]                   : Number of the Gauss-Legendre points per axis in each cell;
+    [lower]     [list]                  : The lower corner of the box;
+    [upper]     [list]                  : The upper corner of the box;
+    [nodes]     [ndarray]               : The Gauss-Legendre points on [-1, 1];
+    [weights]   [ndarray]               : The Gauss-Legendre weights on [-1, 1];
+    [x_1d]      [list]                  : The quadrature points along each axis;
+    [w_1d]      [list]                  : The quadrature weights along each axis;
+    [x]         [ndarray]               : The quadrature points, with the last axis varying fastest;
+    [w]         [ndarray]               : The quadrature weights, with the shape (number of points, 1).
+
+    ====================================================================================================================
+    """
+
+    ### Obtain the Gauss-Legendre points and weights on [-1, 1]
+    nodes, weights = np.polynomial.legendre.leggauss(order)
+
+    ### Map them to each cell along each axis
+    x_1d, w_1d = [], []
+    for n, a, b in zip(n_cells, lower, upper):
+        edges = np.linspace(a, b, n + 1)
+        h = np.diff(edges)[:, np.newaxis]
+        x_1d.append((edges[:-1, np.newaxis] + 0.5 * h * (nodes + 1.)).reshape(-1))
+        w_1d.append((0.5 * h * weights).reshape(-1))
+
+    ### Form the tensor product of the points and of the weights
+    x = np.stack([ a.reshape(-1) for a in np.meshgrid(*x_1d, indexing='ij') ], axis=1)
+    w = np.prod(np.stack([ a.reshape(-1) for a in np.meshgrid(*w_1d, indexing='ij') ], axis=1), axis=1)
+
+    return x, w[:, np.newaxis]
@@ -0,0 +1,244 @@
+import json
+import os
+import queue
+import threading
+import time
+import numpy as np
+
+### The fields recorded for each evaluation, in the order of the columns of the buffer
+FIELDS = ['iter', 'l1', 'l2', 'grad_norm', 'time']
+
+class Telemetry:
+    """
+    ====================================================================================================================
+
+    This is the class for recording the training history of the optimisers. Each evaluation writes one row (iteration,
+    l1, l2, gradient norm and wall time) into a preallocated NumPy buffer, which is doubled in the rare case that it is
+    full, so that no tensor handles are kept and the history is already an array at the end of the training. If sinks
+    are given (see Memory_Sink, CSV_Sink and JSONL_Sink), the new rows are handed to the sinks in blocks by a background
+    thread; without sinks no thread is started, and recording is a single row assignment.
+    This class include 6 functions, including:
+        1. __init__()         : Initialise the buffer and start the background thread if required;
+        2. write()            : Hand the blocks of rows to the sinks (run by the background thread);
+        3. record()           : Record one evaluation;
+        4. restore()          : Restore the rows recorded before a checkpoint;
+        5. history()          : Return the history values of the loss terms;
+        6. close()            : Hand the remaining rows to the sinks and stop the background thread.
+
+    ====================================================================================================================
+    """
+
+    def __init__(self, capacity=40000, sinks=None, block=100):
+        """
+        ================================================================================================================
+
+        This function is to initialise the buffer, and start the background thread if any sink is given.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [capacity]  [int]                   : Initial number of rows of the buffer (e.g., maxfun of the optimiser);
+        [sinks]     [list]                  : The sinks that receive the rows (None to keep the history in the buffer
+                                              only);
+        [block]     [int]                   : Number of rows handed to the sinks at once;
+        [buffer]    [ndarray]               : The history of the evaluations, with the columns in FIELDS;
+        [n]         [int]                   : Number of the recorded rows;
+        [n_sent]    [int]                   : Number of the rows handed to the sinks;
+        [time_start][float]                 : The wall time at initialisation.
+
+        ================================================================================================================
+        """
+
+        self.buffer = np.full((max(int(capacity), 1), len(FIELDS)), np.nan)
+        self.n = 0
+        self.n_sent = 0
+        self.block = block
+        self.sinks = list(sinks) if sinks is not None else []
+        self.time_start = time.time()
+        self.queue = None
+        self.thread = None
+        if self.sinks:
+            self.queue = queue.Queue()
+            self.thread = threading.Thread(target=self.write, daemon=True)
+            self.thread.start()
+
+    def write(self):
+        """
+        ================================================================================================================
+
+        This function is run by the background thread, to hand the blocks of rows to the sinks until None is received.
+
+        ================================================================================================================
+        """
+
+        while True:
+            rows = self.queue.get()
+            if rows is None:
+                break
+            for sink in self.sinks:
+                sink.write(rows)
+
+        return None
+
+    def record(self, it, l1, l2, grad_norm=np.nan):
+        """
+        ================================================================================================================
+
+        This function is to record one evaluation.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [it]        [int]                   : Number of the training iteration;
+        [l1]        [float]                 : The l1 loss term (a scalar tensor is also accepted);
+        [l2]        [float]                 : The l2 loss term (a scalar tensor is also accepted);
+        [grad_norm] [float]                 : The norm of the gradients (NaN if not evaluated);
+        [l1, l2]    [float]                 : The recorded loss terms, as Python floats.
+
+        ================================================================================================================
+        """
+
+        ### Double the buffer if it is full
+        if self.n == len(self.buffer):
+            self.buffer = np.concatenate([self.buffer, np.full_like(self.buffer, np.nan)])
+
+        l1, l2 = float(l1), float(l2)
+        self.buffer[self.n] = (it, l1, l2, grad_norm, time.time() - self.time_start)
+        self.n = self.n + 1
+
+        ### Hand a full block of the new rows to the background thread
+        if self.queue is not None and self.n - self.n_sent >= self.block:
+            self.queue.put(self.buffer[self.n_sent:self.n].copy())
+            self.n_sent = self.n
+
+        return l1, l2
+
+    def restore(self, rows):
+        """
+        ================================================================================================================
+
+        This function is to restore the rows recorded before a checkpoint (see Checkpoint.py). These rows were already
+        handed to the sinks before the checkpoint, so they are not handed again, and the wall time continues from the
+        last of them.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [rows]      [ndarray]               : The rows recorded before the checkpoint, with the columns in FIELDS.
+
+        ================================================================================================================
+        """
+
+        while len(self.buffer) < len(rows):
+            self.buffer = np.concatenate([self.buffer, np.full_like(self.buffer, np.nan)])
+
+        self.buffer[:len(rows)] = rows
+        self.n = len(rows)
+        self.n_sent = len(rows)
+        if len(rows) > 0:
+            self.time_start = time.time() - rows[-1, 4]
+
+        return None
+
+    def history(self):
+        """
+        ================================================================================================================
+
+        This function is to return the history values of the loss terms.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [his_l1]    [ndarray]               : History values of the l1 loss term;
+        [his_l2]    [ndarray]               : History values of the l2 loss term.
+
+        ================================================================================================================
+        """
+
+        return [self.buffer[:self.n, 1].copy(), self.buffer[:self.n, 2].copy()]
+
+    def close(self):
+        """
+        ================================================================================================================
+
+        This function is to hand the remaining rows to the sinks, and stop the background thread.
+
+        ================================================================================================================
+        """
+
+        if self.thread is not None:
+            if self.n > self.n_sent:
+                self.queue.put(self.buffer[self.n_sent:self.n].copy())
+                self.n_sent = self.n
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+            self.queue = None
+
+        return None
+
+class Memory_Sink:
+    """
+    ====================================================================================================================
+
+    This is the class for the in-memory sink, which keeps the received rows as NumPy arrays.
+
+    ====================================================================================================================
+    """
+
+    def __init__(self):
+        self.blocks = []
+
+    def write(self, rows):
+        self.blocks.append(rows)
+
+    def array(self):
+        return np.concatenate(self.blocks) if self.blocks else np.zeros((0, len(FIELDS)))
+
+class CSV_Sink:
+    """
+    ====================================================================================================================
+
+    This is the class for the CSV sink. The file is created with the header at initialisation (or kept, if append is
+    True and the file exists, e.g., when the training is resumed from a checkpoint), and each block of rows is appended
+    to it, so that one sink can be shared by the stages of an optimiser schedule.
+
+    ====================================================================================================================
+    """
+
+    def __init__(self, path, append=False):
+        self.path = path
+        if not (append and os.path.exists(path)):
+            with open(path, 'w') as f:
+                f.write(','.join(FIELDS) + '\n')
+
+    def write(self, rows):
+        with open(self.path, 'a') as f:
+            np.savetxt(f, rows, delimiter=',', fmt=['%d', '%.9g', '%.9g', '%.9g', '%.6f'])
+
+class JSONL_Sink:
+    """
+    ====================================================================================================================
+
+    This is the class for the JSON Lines sink. The file is created at initialisation (or kept, if append is True and
+    the file exists), and each block of rows is appended to it, one JSON object per evaluation (the values not
+    evaluated are written as null).
+
+    ====================================================================================================================
+    """
+
+    def __init__(self, path, append=False):
+        self.path = path
+        if not (append and os.path.exists(path)):
+            open(path, 'w').close()
+
+    def write(self, rows):
+        with open(self.path, 'a') as f:
+            for row in rows:
+                record = { k: (None if np.isnan(v) else v) for k, v in zip(FIELDS, row.tolist()) }
+                record['iter'] = int(row[0])
+                f.write(json.dumps(record) + '\n')
@@ -0,0 +1,35 @@
+import numpy as np
+import tensorflow as tf
+
+def Validation(net_u, E=10., T=1., n=51):
+    """
+    ====================================================================================================================
+
+    Validation function is to build up the validation function of the rod problem, which returns the relative L2 error
+    of the predicted displacement against the analytic solution, u = T x / E, on the points evenly spaced along the rod
+    (see Budget.py).
+
+    --------------------------------------------------------------------------------------------------------------------
+
+    Name        Type                    Info.
+
+    [net_u]     [keras model]           : The FNN for displacement u;
+    [E]         [float]                 : The Young's modulus;
+    [T]         [float]                 : The traction at the right tip of the rod;
+    [n]         [int]                   : Number of the validation points;
+    [x]         [array of float]        : The validation points;
+    [u]         [array of float]        : The analytic displacement at the validation points;
+    [validation][function]              : The function that returns the relative L2 error of the current FNN.
+
+    ====================================================================================================================
+    """
+
+    x = np.linspace(0., 1., n).reshape(-1, 1).astype(tf.keras.backend.floatx())
+    u = T / E * x
+
+    def validation():
+        ### The displacement satisfies the fixed end by u = x * net_u(x), as in PINN.py
+        u_p = net_u(x).numpy() * x
+        return np.linalg.norm(u_p - u) / np.linalg.norm(u)
+
+    return validation
\ No newline at end of file
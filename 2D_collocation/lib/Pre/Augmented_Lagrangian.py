@@ -0,0 +1,250 @@
+import scipy.optimize
+import numpy as np
+import tensorflow as tf
+from lib.Pre.L_BFGS_B import L_BFGS_B
+from lib.Pre.Loss import Collocation_Loss, Collocation_Terms
+
+class Augmented_Lagrangian(L_BFGS_B):
+    """
+    ====================================================================================================================
+
+    This is the class for the augmented Lagrangian optimiser, which enforces the traction boundary conditions as the
+    constraints c = 0 on the residuals of the boundary outputs (see Collocation_Terms() in Loss.py), instead of the
+    plain quadratic penalty l2 = c^T c of the collocation loss. The inner L-BFGS-B solves minimise
+        L_A = l1 + lambda^T c + mu c^T c,
+    with one multiplier lambda per boundary point and output, each warm-started from the weights and biases of the
+    previous solve. Between the solves, the multipliers are updated by lambda <- lambda + 2 mu c, and the penalty mu is
+    multiplied by rho if the violation of the boundary conditions, ||c|| = sqrt(l2), did not drop below 'decrease'
+    times its previous value. The first solve (lambda = 0, mu = 1) is the plain collocation loss. The outer loop stops
+    when the violation is below tol. This class include 6 functions, including:
+        1. __init__()         : Initialise the parameters for the augmented Lagrangian optimiser;
+        2. weighted_loss()    : Apply the augmented Lagrangian of the collocation loss;
+        3. constraints()      : Calculate the residuals of the boundary outputs;
+        4. state()            : Return the state of the optimiser for the checkpoints;
+        5. restore()          : Restore the state of the optimiser from a checkpoint;
+        6. fit()              : Execute training process.
+
+    ====================================================================================================================
+    """
+
+    def __init__(self, pinn, x_train, y_train, dx, tol=1e-3, mu=1., rho=10., decrease=0.25, max_outer=20,
+                 inner_maxfun=2000, factr=10, pgtol=1e-10, m=50, maxls=50, maxfun=40000):
+        """
+        ================================================================================================================
+
+        This function is to initialise the parameters used in the augmented Lagrangian optimiser.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [pinn]      [Keras model]           : The Physics-informed neural network;
+        [x_train]   [list]                  : PINN input list, contains all the coordinates information;
+        [y_train]   [list]                  : PINN boundary condition list, contains the traction boundary condition;
+        [dx]        [float]                 : Sample points interval;
+        [tol]       [float]                 : Stop when the violation of the boundary conditions is below tol;
+        [mu]        [float]                 : The initial penalty;
+        [rho]       [float]                 : The growth factor of the penalty;
+        [decrease]  [float]                 : The penalty grows if the violation did not drop below decrease times its
+                                              previous value;
+        [max_outer] [int]                   : Maximum number of the outer iterations (the inner solves);
+        [inner_maxfun] [int]                : Maximum number of evaluations of each inner solve;
+        [factr]     [int]                   : The optimiser option. Please refer to SciPy;
+        [pgtol]     [float]                 : The optimiser option. Please refer to SciPy;
+        [m]         [int]                   : The optimiser option. Please refer to SciPy;
+        [maxls]     [int]                   : The optimiser option. Please refer to SciPy;
+        [maxfun]    [int]                   : Maximum number of evaluations for training, over all the inner solves;
+        [n_eq]      [int]                   : Number of the loss terms from the equilibrium equation;
+        [multipliers] [list]                : The multipliers, one tf.Variable per boundary output, shaped as its
+                                              residuals;
+        [penalty]   [tf.Variable]           : The current penalty.
+
+        ================================================================================================================
+        """
+
+        super().__init__(pinn, x_train, y_train, dx, factr=factr, pgtol=pgtol, m=m, maxls=maxls, maxfun=maxfun)
+        self.tol = tol
+        self.rho = rho
+        self.decrease = decrease
+        self.max_outer = max_outer
+        self.inner_maxfun = inner_maxfun
+
+        ### Create the multipliers with the shapes of the residuals of the boundary outputs
+        terms, self.n_eq = Collocation_Terms(self.pinn(self.x_train), self.y_train)
+        self.multipliers = [ tf.Variable(tf.zeros_like(t), trainable=False) for t in terms[self.n_eq:] ]
+        self.penalty = tf.Variable(mu, dtype=self.dtype, trainable=False)
+
+    def weighted_loss(self, y_p, y):
+        """
+        ================================================================================================================
+
+        This function is to apply the augmented Lagrangian of the collocation loss, which replaces the loss of the
+        L-BFGS-B optimiser (see L_BFGS_B.weighted_loss()), while the l1 and l2 loss terms stay those of the
+        collocation loss.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [y_p]       [list]                  : List of predictions from the PINN;
+        [y]         [list]                  : PINN boundary condition list, contains the traction boundary condition;
+        [c]         [list]                  : The residuals of the boundary outputs;
+        [loss]      [Keras tensor]          : The augmented Lagrangian;
+        [l1]        [Keras tensor]          : The l1 loss term;
+        [l2]        [Keras tensor]          : The l2 loss term.
+
+        ================================================================================================================
+        """
+
+        terms, n_eq = Collocation_Terms(y_p, y)
+        c = terms[n_eq:]
+        l1 = tf.add_n([ tf.reduce_sum(tf.square(t)) for t in terms[:n_eq] ])
+        l2 = tf.add_n([ tf.reduce_sum(tf.square(c_i)) for c_i in c ])
+        lc = tf.add_n([ tf.reduce_sum(tf.cast(lam, c_i.dtype) * c_i) for lam, c_i in zip(self.multipliers, c) ])
+        loss = l1 + lc + tf.cast(self.penalty, l2.dtype) * l2
+
+        return loss, l1, l2
+
+    @tf.function
+    def constraints(self):
+        """
+        ================================================================================================================
+
+        This function is to calculate the residuals of the boundary outputs at the current weights and biases.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [c]         [list]                  : The residuals of the boundary outputs;
+        [l1]        [Keras tensor]          : The l1 loss term;
+        [l2]        [Keras tensor]          : The l2 loss term.
+
+        ================================================================================================================
+        """
+
+        terms, n_eq = Collocation_Terms(self.pinn(self.x_train), self.y_train)
+        l1 = tf.add_n([ tf.reduce_sum(tf.square(t)) for t in terms[:n_eq] ])
+        l2 = tf.add_n([ tf.reduce_sum(tf.square(c_i)) for c_i in terms[n_eq:] ])
+
+        return terms[n_eq:], l1, l2
+
+    def state(self):
+        """
+        ================================================================================================================
+
+        This function is to return the state of the optimiser for the checkpoints (see Checkpoint.py), including the
+        multipliers and the penalty.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [multipliers] [ndarray]             : The flat multipliers;
+        [penalty]   [float]                 : The current penalty.
+
+        ================================================================================================================
+        """
+
+        state = super().state()
+        state['multipliers'] = np.concatenate([ lam.numpy().flatten() for lam in self.multipliers ])
+        state['penalty'] = self.penalty.numpy()
+
+        return state
+
+    def restore(self, state):
+        """
+        ================================================================================================================
+
+        This function is to restore the state of the optimiser from a checkpoint (the weights and biases are restored
+        by set_weights()).
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [state]     [dict]                  : The state of the training loaded from the checkpoint.
+
+        ================================================================================================================
+        """
+
+        super().restore(state)
+        if 'multipliers' in state:
+            split_ids = np.cumsum([0] + [ int(np.prod(lam.shape)) for lam in self.multipliers ])
+            for i, lam in enumerate(self.multipliers):
+                lam.assign(state['multipliers'][split_ids[i]:split_ids[i + 1]].reshape(lam.shape))
+            self.penalty.assign(state['penalty'])
+
+        return None
+
+    def fit(self):
+        """
+        ================================================================================================================
+
+        This function is to execute training process.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [x]         [ndarray]               : The current flat weights and biases;
+        [c]         [list]                  : The residuals of the boundary outputs;
+        [violation] [float]                 : The violation of the boundary conditions, ||c|| = sqrt(l2);
+        [nit]       [int]                   : Number of the outer iterations;
+        [warnflag]  [int]                   : 0 if the violation is below tol; 1 if max_outer or maxfun is reached;
+        [result]    [tuple]                 : The result in the same form as the one returned by the SciPy optimiser,
+                                              (weights and biases, final loss, {'funcalls', 'nit', 'violation',
+                                              'warnflag'}), with the loss of the collocation loss;
+        [his_l1]    [ndarray]               : History values of the l1 loss term;
+        [his_l2]    [ndarray]               : History values of the l2 loss term.
+
+        ================================================================================================================
+        """
+
+        print('Optimizer: Augmented Lagrangian (L-BFGS-B inner solves, provided by Scipy package)')
+        print('Initializing ...\n')
+
+        x = np.concatenate([ v.numpy().flatten() for v in self.variables ])
+        c, l1, l2 = self.constraints()
+        violation = float(np.sqrt(l2.numpy()))
+        violation_old = np.inf
+        warnflag = 1
+        nit = 0
+        while nit < self.max_outer and self.iter < self.maxfun:
+
+            ### Minimise the augmented Lagrangian, warm-started from the previous weights and biases
+            result = scipy.optimize.fmin_l_bfgs_b(func=self.pi_loss, x0=x, factr=self.factr, pgtol=self.pgtol,
+                m=self.m, maxls=self.maxls, maxfun=int(min(self.inner_maxfun, self.maxfun - self.iter)))
+            x = result[0]
+            nit = nit + 1
+
+            ### Measure the violation of the boundary conditions at the solution
+            self.set_weights(x)
+            c, l1, l2 = self.constraints()
+            violation = float(np.sqrt(l2.numpy()))
+            print('Outer iter: %d   L1 = %.4g   Violation = %.4g   Penalty = %.4g'
+                  % (nit, l1.numpy(), violation, self.penalty.numpy()))
+            if violation <= self.tol:
+                warnflag = 0
+                break
+
+            ### Update the multipliers, and increase the penalty if the violation did not drop enough
+            for lam, c_i in zip(self.multipliers, c):
+                lam.assign_add(2. * self.penalty * c_i)
+            if violation > self.decrease * violation_old:
+                self.penalty.assign(self.penalty * self.rho)
+            violation_old = violation
+
+            ### The cached evaluations belong to the previous augmented Lagrangian
+            self.cache.clear()
+
+        ### Report how many evaluations were returned from the cache
+        print('Cache: %d hits, %d misses' % (self.hits, self.misses))
+
+        ### Report the collocation loss of the final weights and biases
+        self.set_weights(x)
+        loss = Collocation_Loss(self.pinn(self.x_train), self.y_train)[0]
+        result = (x, float(loss), {'funcalls': int(self.iter), 'nit': nit, 'violation': violation,
+                                   'warnflag': warnflag})
+
+        return result, self.history()
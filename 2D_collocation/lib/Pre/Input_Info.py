@@ -1,7 +1,9 @@
 import numpy as np
 import math
+from lib.Pre.Precision import Precision
+from lib.Pre.Sampler import Sampler
 
-def Input_Info():
+def Input_Info(precision='float32', settings=None, sampler=None):
     """
     ====================================================================================================================
 
@@ -15,6 +17,11 @@ def Input_Info():
 
     Name        Type                    Info.
 
+    [precision] [str]                   : The precision policy (see Precision.py);
+    [settings]  [dict]                  : The FNN settings that override the ones defined below, {'width', 'depth',
+                                          'acti_fun'} (e.g., in the trials of Hyperband.py);
+    [sampler]   [Sampler]               : The sampler of the point sets (None for the uniform grid, see Sampler.py);
+    [dtype]     [str]                   : The floating-point type of the point sets and the boundary conditions;
     [ns]        [int]                   : Total number of sample points;
     [dx]        [float]                 : Sample points interval;
     [xy]        [Array of float32]      : Coordinates of all the sample points;
@@ -48,29 +55,25 @@ def Input_Info():
 
     ====================================================================================================================
     """
+
+    ### Set the precision policy
+    dtype = Precision(precision)
     
     ### Define the number of sample points
     ns_u = 51
     ns_l = 51
     ns = ns_u*ns_l
+    sampler = sampler if sampler is not None else Sampler('grid')
     
     ### Define the sample points' interval
     dx = 1./(ns_u-1)
     
-    ### Initialize sample points' coordinates
-    xy = np.zeros((ns, 2)).astype(np.float32)
-    for i in range(0,ns_u):
-        for j in range(0,ns_l):
-            xy[i*ns_l+j, 0] = i * dx
-            xy[i*ns_l+j, 1] = j * dx
-    xy_u = np.hstack([np.linspace(0,1, ns_u).reshape(ns_u, 1).astype(np.float32), \
-                      np.ones((ns_u,1)).astype(np.float32)])
-    xy_b = np.hstack([np.linspace(0,1, ns_u).reshape(ns_u, 1).astype(np.float32), \
-                      np.zeros((ns_u,1)).astype(np.float32)])
-    xy_l = np.hstack([np.zeros((ns_l,1)).astype(np.float32), \
-                  np.linspace(0,1, ns_l).reshape(ns_l, 1).astype(np.float32)])
-    xy_r = np.hstack([np.ones((ns_l,1)).astype(np.float32), \
-                  np.linspace(0,1, ns_l).reshape(ns_l, 1).astype(np.float32)])
+    ### Initialize sample points' coordinates, on the uniform grid unless a sampler is given
+    xy = sampler.interior(ns, [0., 0.], [1., 1.], key=0).astype(dtype)
+    xy_u = sampler.boundary(ns_u, [0., 0.], [1., 1.], axis=1, value=1., key=1).astype(dtype)
+    xy_b = sampler.boundary(ns_u, [0., 0.], [1., 1.], axis=1, value=0., key=2).astype(dtype)
+    xy_l = sampler.boundary(ns_l, [0., 0.], [1., 1.], axis=0, value=0., key=3).astype(dtype)
+    xy_r = sampler.boundary(ns_l, [0., 0.], [1., 1.], axis=0, value=1., key=4).astype(dtype)
     
     ### Create the PINN input list
     x_train = [ xy, xy_u, xy_b, xy_l, xy_r]
@@ -80,14 +83,14 @@ def Input_Info():
     mu = 0.3
     
     ### Define the traction boundary conditions
-    s_u_x = np.zeros((ns_u,1)).astype(np.float32)
-    s_u_y = np.zeros((ns_u,1)).astype(np.float32)
-    s_b_x = np.zeros((ns_u,1)).astype(np.float32)
-    s_b_y = np.zeros((ns_u,1)).astype(np.float32)
-    s_l_x = np.zeros((ns_l,1)).astype(np.float32)
-    s_l_y = np.zeros((ns_l,1)).astype(np.float32)
+    s_u_x = np.zeros((ns_u,1)).astype(dtype)
+    s_u_y = np.zeros((ns_u,1)).astype(dtype)
+    s_b_x = np.zeros((ns_u,1)).astype(dtype)
+    s_b_y = np.zeros((ns_u,1)).astype(dtype)
+    s_l_x = np.zeros((ns_l,1)).astype(dtype)
+    s_l_y = np.zeros((ns_l,1)).astype(dtype)
     s_r_x = np.cos(xy_r[..., 1, np.newaxis]/2*math.pi)
-    s_r_y = np.zeros((ns_l,1)).astype(np.float32)
+    s_r_y = np.zeros((ns_l,1)).astype(dtype)
 
     ### Create the PINN boundary condition list
     y_train = [ s_u_x, s_u_y, s_b_x, s_b_y, s_l_x, s_l_y, s_r_x, s_r_y ]
@@ -96,7 +99,13 @@ def Input_Info():
     n_input = 2
     n_output = 1
     layer = [np.array([ 20, 20, 20 ]), np.array([ 20, 20, 20 ])]
-    NN_info = [n_input, n_output, layer]
+    acti_fun = 'tanh'
+
+    ### Override the FNN settings, if required
+    if settings is not None:
+        layer = [ np.full(settings.get('depth', len(l)), settings.get('width', l[0])) for l in layer ]
+        acti_fun = settings.get('acti_fun', acti_fun)
+    NN_info = [n_input, n_output, layer, acti_fun]
     
     print('*************************************************')
     print('Problem Info.')
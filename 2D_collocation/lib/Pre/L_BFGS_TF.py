@@ -0,0 +1,198 @@
+import numpy as np
+import tensorflow as tf
+from lib.Pre.L_BFGS_B import L_BFGS_B
+
+class L_BFGS_TF(L_BFGS_B):
+    """
+    ====================================================================================================================
+
+    This is the class for the in-graph L-BFGS optimiser. It shares the physics-informed loss with the L-BFGS-B optimiser
+    (see L_BFGS_B.py), but the two-loop recursion, the backtracking line search and the convergence tests are all run
+    inside one compiled TensorFlow function, so that the function evaluations never return to Python. The convergence
+    tests follow the ones of the SciPy optimiser (factr, pgtol and maxfun). This class include 3 functions, including:
+        1. __init__()         : Initialise the parameters for the in-graph L-BFGS optimiser;
+        2. minimize()         : Minimise the physics-informed loss inside the compiled TensorFlow function;
+        3. fit()              : Execute training process.
+
+    ====================================================================================================================
+    """
+
+    def __init__(self, pinn, x_train, y_train, dx, factr=10, pgtol=1e-10, m=50, maxls=50, maxfun=40000, c1=1e-4):
+        """
+        ================================================================================================================
+
+        This function is to initialise the parameters used in the in-graph L-BFGS optimiser.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [pinn]      [Keras model]           : The Physics-informed neural network;
+        [x_train]   [list]                  : PINN input list, contains all the coordinates information;
+        [y_train]   [list]                  : PINN boundary condition list, contains the traction boundary condition;
+        [dx]        [float]                 : Sample points interval;
+        [factr]     [int]                   : Stop when the relative reduction of the loss is below factr * eps;
+        [pgtol]     [float]                 : Stop when the maximum absolute gradient is below pgtol;
+        [m]         [int]                   : Number of the stored correction pairs;
+        [maxls]     [int]                   : Maximum number of line search steps per iteration;
+        [maxfun]    [int]                   : Maximum number of function evaluations for training;
+        [c1]        [float]                 : The sufficient decrease (Armijo) parameter of the line search.
+
+        ================================================================================================================
+        """
+
+        super().__init__(pinn, x_train, y_train, dx, factr=factr, pgtol=pgtol, m=m, maxls=maxls, maxfun=maxfun)
+        self.c1 = c1
+
+    @tf.function
+    def minimize(self, x0):
+        """
+        ================================================================================================================
+
+        This function is to minimise the physics-informed loss inside the compiled TensorFlow function.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [x0]        [Keras tensor]          : The initial flat weights and biases (float64);
+        [x]         [Keras tensor]          : The current flat weights and biases;
+        [f]         [Keras tensor]          : The current physics-informed loss;
+        [g]         [Keras tensor]          : The current flat gradients;
+        [S]         [Keras tensor]          : The stored steps, from the oldest to the newest (zeros if not stored);
+        [Y]         [Keras tensor]          : The stored gradient changes, in the same order as S;
+        [rho]       [Keras tensor]          : The reciprocals of s.y of the stored pairs (zeros if not stored);
+        [d]         [Keras tensor]          : The search direction from the two-loop recursion;
+        [t]         [Keras tensor]          : The step length of the line search;
+        [nfev]      [Keras tensor]          : Number of function evaluations;
+        [nit]       [Keras tensor]          : Number of iterations;
+        [warnflag]  [Keras tensor]          : -1 while running; 0 if converged; 1 if maxfun is reached; 2 if the line
+                                              search fails;
+        [his_l1]    [TensorArray]           : History values of the l1 loss term;
+        [his_l2]    [TensorArray]           : History values of the l2 loss term.
+
+        ================================================================================================================
+        """
+
+        ### Initialise the correction pairs and evaluate the loss at the initial weights and biases
+        one = tf.constant(1., dtype=tf.float64)
+        eps = tf.constant(np.finfo(np.float64).eps, dtype=tf.float64)
+        S = tf.zeros([self.m, x0.shape[0]], dtype=tf.float64)
+        Y = tf.zeros([self.m, x0.shape[0]], dtype=tf.float64)
+        rho = tf.zeros([self.m], dtype=tf.float64)
+        x = x0
+        f, g, l1, l2 = self.flat_loss_grad(x, self.x_train, self.y_train)
+        his_l1 = tf.TensorArray(l1.dtype, size=0, dynamic_size=True).write(0, l1)
+        his_l2 = tf.TensorArray(l2.dtype, size=0, dynamic_size=True).write(0, l2)
+        nfev = tf.constant(1)
+        nit = tf.constant(0)
+        warnflag = tf.constant(-1)
+
+        while warnflag < 0:
+
+            ### Obtain the search direction by the two-loop recursion (the empty pairs have zero contributions)
+            q = g
+            alpha = tf.TensorArray(tf.float64, size=self.m)
+            for i in tf.range(self.m - 1, -1, -1):
+                a = rho[i] * tf.tensordot(S[i], q, 1)
+                q = q - a * Y[i]
+                alpha = alpha.write(i, a)
+            gamma = tf.math.divide_no_nan(tf.tensordot(S[-1], Y[-1], 1), tf.tensordot(Y[-1], Y[-1], 1))
+            r = tf.where(rho[-1] > 0., gamma, one) * q
+            for i in tf.range(self.m):
+                b = rho[i] * tf.tensordot(Y[i], r, 1)
+                r = r + (alpha.read(i) - b) * S[i]
+            d = -r
+            gd = tf.tensordot(g, d, 1)
+
+            ### Restart from the steepest descent direction if d is not a descent direction
+            if gd >= 0.:
+                d = -g
+                gd = -tf.tensordot(g, g, 1)
+                rho = tf.zeros_like(rho)
+
+            ### Search the step length by backtracking with the quadratic interpolation (Armijo condition)
+            t = tf.where(rho[-1] > 0., one, tf.minimum(one, one / tf.norm(g)))
+            x_new, f_new, g_new = x, f, g
+            accepted = tf.constant(False)
+            ls = tf.constant(0)
+            while not accepted and ls < self.maxls and nfev < self.maxfun:
+                x_new = x + t * d
+                f_new, g_new, l1, l2 = self.flat_loss_grad(x_new, self.x_train, self.y_train)
+                his_l1 = his_l1.write(nfev, l1)
+                his_l2 = his_l2.write(nfev, l2)
+                nfev = nfev + 1
+                ls = ls + 1
+
+                ### Print the loss terms every 10 function evaluations
+                if nfev % 10 == 0:
+                    tf.print('Iter:', nfev, '  L1 =', l1, '  L2 =', l2)
+
+                accepted = tf.math.is_finite(f_new) and f_new <= f + self.c1 * t * gd
+                t_q = -gd * t * t / (2. * (f_new - f - gd * t))
+                t_q = tf.where(tf.math.is_finite(t_q), tf.clip_by_value(t_q, 0.1 * t, 0.5 * t), 0.5 * t)
+                t = tf.where(accepted, t, t_q)
+
+            if accepted:
+                ### Store the new correction pair if it satisfies the curvature condition
+                s = x_new - x
+                y = g_new - g
+                sy = tf.tensordot(s, y, 1)
+                if sy > eps * tf.tensordot(y, y, 1):
+                    S = tf.concat([S[1:], s[tf.newaxis]], axis=0)
+                    Y = tf.concat([Y[1:], y[tf.newaxis]], axis=0)
+                    rho = tf.concat([rho[1:], [one / sy]], axis=0)
+
+                ### Move to the new weights and biases and apply the convergence tests
+                f_old = f
+                x, f, g = x_new, f_new, g_new
+                nit = nit + 1
+                if (f_old - f) / tf.reduce_max([tf.abs(f_old), tf.abs(f), one]) <= self.factr * eps:
+                    warnflag = tf.constant(0)
+                elif tf.reduce_max(tf.abs(g)) <= self.pgtol:
+                    warnflag = tf.constant(0)
+                elif nfev >= self.maxfun:
+                    warnflag = tf.constant(1)
+            elif nfev >= self.maxfun:
+                warnflag = tf.constant(1)
+            else:
+                warnflag = tf.constant(2)
+
+        return x, f, nfev, nit, warnflag, his_l1.stack(), his_l2.stack()
+
+    def fit(self):
+        """
+        ================================================================================================================
+
+        This function is to execute training process.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [ini_w]     [ndarray]               : The initial weights and biases;
+        [minimize]  [function]              : The compiled function that minimises the physics-informed loss;
+        [result]    [tuple]                 : The result in the same form as the one returned by the SciPy optimiser,
+                                              (weights and biases, final loss, {'funcalls', 'nit', 'warnflag'});
+        [his_l1]    [ndarray]               : History values of the l1 loss term;
+        [his_l2]    [ndarray]               : History values of the l2 loss term.
+
+        ================================================================================================================
+        """
+
+        ### Get initial weights and biases
+        ini_w = np.concatenate([ v.numpy().flatten() for v in self.variables ]).astype('float64')
+
+        ### Optimise the weights and biases via the in-graph L-BFGS optimiser
+        print('Optimizer: L-BFGS (In-graph TensorFlow implementation)')
+        print('Initializing ...\n')
+        x, f, nfev, nit, warnflag, his_l1, his_l2 = self.minimize(tf.constant(ini_w))
+
+        ### Set the accepted weights and biases back to the neural network, as the last evaluation may be a rejected
+        ### line search step
+        self.set_weights(x.numpy())
+        self.iter = int(nfev)
+
+        result = (x.numpy(), f.numpy(), {'funcalls': int(nfev), 'nit': int(nit), 'warnflag': int(warnflag)})
+
+        return result, [his_l1.numpy(), his_l2.numpy()]
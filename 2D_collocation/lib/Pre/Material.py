@@ -17,7 +17,8 @@ def Material(U_x, U_y, V_x, V_y, U_xx, U_xy, U_yy, V_xx, V_xy, V_yy, E, mu, p):
     [V_y]       [Keras tensor]          : First-order derivative of displacement u with respect to y direction;
     [V_xx]      [Keras tensor]          : Second-order derivative of displacement u with respect to x direction;
     [V_xy]      [Keras tensor]          : Second-order derivative of displacement u with respect to x and y directions;
-    [V_yy]      [Keras tensor]          : Second-order derivative of displacement u with respect to y direction;
+    [V_yy]      [Keras tensor]          : Second-order derivative of displacement u with respect to y direction
+                                          (the second-order derivatives are None if they are not required);
     [e1]        [Keras tensor]          : Normal strain for x direction;
     [e2]        [Keras tensor]          : Normal strain for y direction;
     [e12]       [Keras tensor]          : Shear strain;
@@ -59,9 +60,12 @@ def Material(U_x, U_y, V_x, V_y, U_xx, U_xy, U_yy, V_xx, V_xy, V_yy, E, mu, p):
     s2 = (2 * nu + la) * e2 + la * e1
     s12 = 2 * nu * e12
     
-    ### Calculate the residual from equilibrium equation
-    Gex = (2 * nu + la) * U_xx + nu * U_yy + (nu + la) * V_xy
-    Gey = (nu + la) * U_xy + (2 * nu + la) * V_yy + nu * V_xx
+    ### Calculate the residual from equilibrium equation (not available if the second-order derivatives are not provided)
+    if U_xx is None:
+        Gex, Gey = None, None
+    else:
+        Gex = (2 * nu + la) * U_xx + nu * U_yy + (nu + la) * V_xy
+        Gey = (nu + la) * U_xy + (2 * nu + la) * V_yy + nu * V_xx
     
     return e1, e2, e12, s1, s2, s12, Gex, Gey
     
\ No newline at end of file
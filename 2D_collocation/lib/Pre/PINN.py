@@ -2,8 +2,9 @@ import tensorflow as tf
 from lib.Pre.Material import Material
 from lib.Pre.Dif_op_x import Dif_x
 from lib.Pre.Dif_op_y import Dif_y
+from lib.Pre.Dif_plan import Dif_plan, Dif_terms
 
-def PINN(net_u, net_v, E, mu):
+def PINN(net_u, net_v, E, mu, sizes=None, taylor=False):
     """
     ====================================================================================================================
 
@@ -19,6 +20,12 @@ def PINN(net_u, net_v, E, mu):
     [xy_b]      [Array of float32]      : Coordinates of the sample points on the bottom boundary of the plate;
     [xy_l]      [Array of float32]      : Coordinates of the sample points on the left boundary of the plate;
     [xy_r]      [Array of float32]      : Coordinates of the sample points on the right boundary of the plate;
+    [xy_bc]     [Array of float32]      : Coordinates of the sample points on all the traction boundaries, stacked in
+                                          the order of upper, bottom, left and right (only if sizes is given);
+    [sizes]     [list of int]           : Number of sample points on the upper, bottom, left and right boundaries. If
+                                          given, the PINN takes the stacked inputs [xy, xy_bc] and evaluates all the
+                                          traction boundaries in one single pass; otherwise, it takes one input for
+                                          each point set;
 
     [s_u_x]     [Array of float32]      : x direction force boundary condition on the top boundary of the plate;
     [s_u_y]     [Array of float32]      : y direction force boundary condition on the top boundary of the plate;
@@ -31,45 +38,78 @@ def PINN(net_u, net_v, E, mu):
     [Gex]       [Keras tensor]          : Residual from the equilibrium equation for x direction;
     [Gey]       [Keras tensor]          : Residual from the equilibrium equation for y direction;
     [sigma_r]   [Keras tensor]          : Stress at the right tip of the rod;
+    [plan]      [dict]                  : The highest derivative order required by each point set;
     [E]         [float]                 : Young's module;
-    [mu]        [float]                 : Poisson ratio.
+    [mu]        [float]                 : Poisson ratio;
+    [taylor]    [bool]                  : Whether to obtain the differential terms by the Taylor-mode forward sweep.
 
     ====================================================================================================================
     """
 
-    ### declare PINN's inputs
+    ### declare PINN's input for the domain
     xy = tf.keras.layers.Input(shape=(2,))
-    xy_u = tf.keras.layers.Input(shape=(2,))
-    xy_b = tf.keras.layers.Input(shape=(2,))
-    xy_l = tf.keras.layers.Input(shape=(2,))
-    xy_r = tf.keras.layers.Input(shape=(2,))
     
-    ### initialize the differential operators
-    dif_x = Dif_x(net_u)
-    dif_y = Dif_y(net_v)
+    ### plan the derivative orders required by each point set from the Material outputs it contributes
+    plan = Dif_plan({'xy': ['Gex', 'Gey'], 'xy_u': ['s2', 's12'], 'xy_b': ['s2', 's12'],
+                     'xy_l': ['s1', 's12'], 'xy_r': ['s1', 's12']})
+
+    ### initialize the differential operators, one for each of the planned orders
+    dif_x = { o: Dif_x(net_u, order=o, taylor=taylor) for o in set(plan.values()) }
+    dif_y = { o: Dif_y(net_v, order=o, taylor=taylor) for o in set(plan.values()) }
     
     ### obtain partial derivatives of u with respect to x and y
-    U_x, U_y, U_xx, U_xy, U_yy = dif_x(xy)
-    V_x, V_y, V_xx, V_xy, V_yy = dif_y(xy)
-    U_u_x, U_u_y, U_u_xx, U_u_xy, U_u_yy = dif_x(xy_u)
-    V_u_x, V_u_y, V_u_xx, V_u_xy, V_u_yy = dif_y(xy_u)
-    U_b_x, U_b_y, U_b_xx, U_b_xy, U_b_yy = dif_x(xy_b)
-    V_b_x, V_b_y, V_b_xx, V_b_xy, V_b_yy = dif_y(xy_b)
-    U_l_x, U_l_y, U_l_xx, U_l_xy, U_l_yy = dif_x(xy_l)
-    V_l_x, V_l_y, V_l_xx, V_l_xy, V_l_yy = dif_y(xy_l) 
-    U_r_x, U_r_y, U_r_xx, U_r_xy, U_r_yy = dif_x(xy_r)
-    V_r_x, V_r_y, V_r_xx, V_r_xy, V_r_yy = dif_y(xy_r) 
-       
-    ### Obtain the residuals from stress boundary conditions
+    U_x, U_y, U_xx, U_xy, U_yy = Dif_terms(dif_x[plan['xy']](xy), 5)
+    V_x, V_y, V_xx, V_xy, V_yy = Dif_terms(dif_y[plan['xy']](xy), 5)
+
+    ### Obtain the residuals from the governing equation
     p = 'plain_stress'
     _, _, _, _, _, _, Gex, Gey = Material(U_x, U_y, V_x, V_y, U_xx, U_xy, U_yy, V_xx, V_xy, V_yy, E, mu, p)
-    _, _, _, _, s_u_y, s_u_x, _, _ = Material(U_u_x, U_u_y, V_u_x, V_u_y, U_u_xx, U_u_xy, U_u_yy, V_u_xx, V_u_xy, V_u_yy, E, mu, p)
-    _, _, _, _, s_b_y, s_b_x, _, _ = Material(U_b_x, U_b_y, V_b_x, V_b_y, U_b_xx, U_b_xy, U_b_yy, V_b_xx, V_b_xy, V_b_yy, E, mu, p)
-    _, _, _, s_l_x, _, s_l_y, _, _ = Material(U_l_x, U_l_y, V_l_x, V_l_y, U_l_xx, U_l_xy, U_l_yy, V_l_xx, V_l_xy, V_l_yy, E, mu, p)
-    _, _, _, s_r_x, _, s_r_y, _, _ = Material(U_r_x, U_r_y, V_r_x, V_r_y, U_r_xx, U_r_xy, U_r_yy, V_r_xx, V_r_xy, V_r_yy, E, mu, p)
+
+    if sizes is None:
+        ### declare PINN's inputs for each traction boundary
+        xy_u = tf.keras.layers.Input(shape=(2,))
+        xy_b = tf.keras.layers.Input(shape=(2,))
+        xy_l = tf.keras.layers.Input(shape=(2,))
+        xy_r = tf.keras.layers.Input(shape=(2,))
+        inputs = [xy, xy_u, xy_b, xy_l, xy_r]
+
+        ### obtain partial derivatives of u with respect to x and y on each traction boundary
+        U_u_x, U_u_y, U_u_xx, U_u_xy, U_u_yy = Dif_terms(dif_x[plan['xy_u']](xy_u), 5)
+        V_u_x, V_u_y, V_u_xx, V_u_xy, V_u_yy = Dif_terms(dif_y[plan['xy_u']](xy_u), 5)
+        U_b_x, U_b_y, U_b_xx, U_b_xy, U_b_yy = Dif_terms(dif_x[plan['xy_b']](xy_b), 5)
+        V_b_x, V_b_y, V_b_xx, V_b_xy, V_b_yy = Dif_terms(dif_y[plan['xy_b']](xy_b), 5)
+        U_l_x, U_l_y, U_l_xx, U_l_xy, U_l_yy = Dif_terms(dif_x[plan['xy_l']](xy_l), 5)
+        V_l_x, V_l_y, V_l_xx, V_l_xy, V_l_yy = Dif_terms(dif_y[plan['xy_l']](xy_l), 5)
+        U_r_x, U_r_y, U_r_xx, U_r_xy, U_r_yy = Dif_terms(dif_x[plan['xy_r']](xy_r), 5)
+        V_r_x, V_r_y, V_r_xx, V_r_xy, V_r_yy = Dif_terms(dif_y[plan['xy_r']](xy_r), 5)
+
+        ### Obtain the residuals from stress boundary conditions
+        _, _, _, _, s_u_y, s_u_x, _, _ = Material(U_u_x, U_u_y, V_u_x, V_u_y, U_u_xx, U_u_xy, U_u_yy, V_u_xx, V_u_xy, V_u_yy, E, mu, p)
+        _, _, _, _, s_b_y, s_b_x, _, _ = Material(U_b_x, U_b_y, V_b_x, V_b_y, U_b_xx, U_b_xy, U_b_yy, V_b_xx, V_b_xy, V_b_yy, E, mu, p)
+        _, _, _, s_l_x, _, s_l_y, _, _ = Material(U_l_x, U_l_y, V_l_x, V_l_y, U_l_xx, U_l_xy, U_l_yy, V_l_xx, V_l_xy, V_l_yy, E, mu, p)
+        _, _, _, s_r_x, _, s_r_y, _, _ = Material(U_r_x, U_r_y, V_r_x, V_r_y, U_r_xx, U_r_xy, U_r_yy, V_r_xx, V_r_xy, V_r_yy, E, mu, p)
+    else:
+        ### declare one stacked PINN's input for all the traction boundaries (upper, bottom, left and right)
+        xy_bc = tf.keras.layers.Input(shape=(2,))
+        inputs = [xy, xy_bc]
+
+        ### obtain partial derivatives of u with respect to x and y on all the traction boundaries in one pass
+        order = max([ plan[k] for k in ['xy_u', 'xy_b', 'xy_l', 'xy_r'] ])
+        U_bc_x, U_bc_y, U_bc_xx, U_bc_xy, U_bc_yy = Dif_terms(dif_x[order](xy_bc), 5)
+        V_bc_x, V_bc_y, V_bc_xx, V_bc_xy, V_bc_yy = Dif_terms(dif_y[order](xy_bc), 5)
+
+        ### Obtain the stresses on all the traction boundaries
+        _, _, _, s1, s2, s12, _, _ = Material(U_bc_x, U_bc_y, V_bc_x, V_bc_y, U_bc_xx, U_bc_xy, U_bc_yy, V_bc_xx, V_bc_xy, V_bc_yy, E, mu, p)
+
+        ### Split the stresses into each traction boundary by the precomputed segment sizes
+        _, _, s1_l, s1_r = tf.split(s1, sizes, axis=0)
+        s2_u, s2_b, _, _ = tf.split(s2, sizes, axis=0)
+        s12_u, s12_b, s12_l, s12_r = tf.split(s12, sizes, axis=0)
+        s_u_x, s_u_y, s_b_x, s_b_y = s12_u, s2_u, s12_b, s2_b
+        s_l_x, s_l_y, s_r_x, s_r_y = s1_l, s12_l, s1_r, s12_r
 
     ### build up the PINN
-    pinn = tf.keras.models.Model(inputs = [xy, xy_u, xy_b, xy_l, xy_r], \
+    pinn = tf.keras.models.Model(inputs = inputs, \
             outputs = [Gex, Gey, s_u_x, s_u_y, s_b_x, s_b_y, s_l_x, s_l_y, s_r_x, s_r_y])
 
     return pinn
\ No newline at end of file
@@ -0,0 +1,227 @@
+import numpy as np
+import tensorflow as tf
+from lib.Pre.Loss import Collocation_Terms
+
+class Weighting:
+    """
+    ====================================================================================================================
+
+    This is the class for the adaptive weighting of the terms of the collocation loss, one weight per term (see
+    Collocation_Terms() in Loss.py), so that the terms whose scales differ by orders of magnitude are balanced. The
+    weights are updated every 'every' evaluations, outside the inner loop of the optimiser: the L-BFGS-B optimiser is
+    restarted on the reweighted loss (see L_BFGS_B.fit()), and the Adam optimiser takes the new weights at its next
+    chunk of steps. Three schemes are available:
+        'grad_norm' : The weight of each term is inversely proportional to the norm of its gradients with respect to
+                      the weights and biases, so that all the terms pull on the FNNs equally;
+        'ntk'       : The weight of each term is inversely proportional to the trace of its block of the neural tangent
+                      kernel, i.e., the squared Frobenius norm of the Jacobian of its residuals, which is estimated by
+                      Hutchinson's method from 'probes' random sign vectors, so that all the terms converge at similar
+                      rates;
+        'attention' : The weights are learnable soft-attention weights, n * softmax(s), whose logits s are updated by
+                      one step of gradient ascent on the weighted loss, so that the terms that stay large gain
+                      attention.
+    The weights are smoothed by an exponential moving average ('grad_norm' and 'ntk'), clipped to the bounds, and
+    normalised to a mean of 1, so that the scale of the loss stays comparable to the unweighted one. Each update is
+    printed, and appended to a CSV file with the unweighted loss terms if a path is given. One weighting may be shared
+    by the stages of an optimiser schedule, which then continue with the same weights. It requires the full-batch loss,
+    so it is not applied to the chunked or parallel evaluations. This class include 5 functions, including:
+        1. __init__()         : Initialise the settings of the weighting;
+        2. attach()           : Attach the weights of the loss terms to an optimiser;
+        3. statistics()       : Obtain the loss terms and the statistics of the scheme;
+        4. update()           : Update the weights of the loss terms;
+        5. step()             : Update the weights if 'every' evaluations have passed since the last update.
+
+    ====================================================================================================================
+    """
+
+    def __init__(self, scheme='grad_norm', every=500, alpha=0.9, lr=1., probes=4, bounds=(1e-3, 1e3), path=None):
+        """
+        ================================================================================================================
+
+        This function is to initialise the settings of the weighting.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [scheme]    [str]                   : The weighting scheme ('grad_norm', 'ntk' or 'attention');
+        [every]     [int]                   : Number of evaluations between two updates of the weights;
+        [alpha]     [float]                 : The factor of the moving average of the weights ('grad_norm' and 'ntk');
+        [lr]        [float]                 : The step length of the gradient ascent of the logits ('attention');
+        [probes]    [int]                   : Number of random sign vectors of the trace estimator ('ntk');
+        [bounds]    [tuple]                 : The lower and upper bounds of the weights before the normalisation;
+        [path]      [str]                   : The path of the CSV file of the weights (None to print them only);
+        [weights]   [tf.Variable]           : The weights of the loss terms, shared by the attached optimisers;
+        [logits]    [ndarray]               : The logits of the soft-attention weights;
+        [last]      [int]                   : The evaluation of the last update (None before the first one);
+        [log]       [list]                  : The evaluation, the loss terms and the weights of each update.
+
+        ================================================================================================================
+        """
+
+        if scheme not in ('grad_norm', 'ntk', 'attention'):
+            raise ValueError('Unknown weighting scheme: ' + str(scheme) + '.')
+
+        self.scheme = scheme
+        self.every = every
+        self.alpha = alpha
+        self.lr = lr
+        self.probes = probes
+        self.bounds = bounds
+        self.path = path
+        self.weights = None
+        self.logits = None
+        self.last = None
+        self.log = []
+
+    def attach(self, opt):
+        """
+        ================================================================================================================
+
+        This function is to attach the weights of the loss terms to an optimiser (called by L_BFGS_B.__init__()). The
+        weights are created at the first call, with one unit weight per loss term, and shared by the later calls.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [opt]       [class]                 : The optimiser;
+        [n_terms]   [int]                   : Number of the loss terms.
+
+        ================================================================================================================
+        """
+
+        if opt.chunk_size is not None:
+            raise ValueError('The adaptive weighting requires the full-batch loss (chunk_size=None).')
+
+        self.pinn = opt.pinn
+        self.variables = opt.variables
+        if self.weights is None:
+            terms, _ = Collocation_Terms(opt.pinn(opt.x_train), opt.y_train)
+            n_terms = len(terms)
+            self.weights = tf.Variable(tf.ones(n_terms, dtype=opt.dtype), trainable=False)
+            if self.path is not None:
+                with open(self.path, 'w') as f:
+                    f.write(','.join(['iter'] + [ 'l%d' % i for i in range(n_terms) ] +
+                                     [ 'w%d' % i for i in range(n_terms) ]) + '\n')
+        opt.term_weights = self.weights
+
+        return None
+
+    @tf.function
+    def statistics(self, x, y):
+        """
+        ================================================================================================================
+
+        This function is to obtain the loss terms, and the statistic of each term used by the scheme: the norm of its
+        gradients ('grad_norm'), the estimated trace of its block of the neural tangent kernel ('ntk'), or the loss
+        term itself ('attention').
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [x]         [list]                  : PINN input list, contains all the coordinates information;
+        [y]         [list]                  : PINN boundary condition list, contains the traction boundary condition;
+        [terms]     [list]                  : The residuals of each loss term;
+        [l]         [list]                  : The loss terms;
+        [v_r]       [list]                  : The products of the residuals with the random sign vectors ('ntk');
+        [stats]     [list]                  : The statistic of each loss term.
+
+        ================================================================================================================
+        """
+
+        zero = tf.UnconnectedGradients.ZERO
+        with tf.GradientTape(persistent=True) as g:
+            y_p = self.pinn(x)
+            terms, _ = Collocation_Terms(y_p, y)
+            l = [ tf.reduce_sum(tf.square(t)) for t in terms ]
+            if self.scheme == 'ntk':
+                ### ||J^T v||^2 with a random sign vector v is an unbiased estimate of ||J||_F^2 = Tr(K)
+                v_r = [ [ tf.reduce_sum(tf.sign(tf.random.uniform(tf.shape(t), -1., 1., dtype=t.dtype)) * t)
+                          for _ in range(self.probes) ] for t in terms ]
+
+        if self.scheme == 'grad_norm':
+            stats = [ tf.linalg.global_norm(g.gradient(l_i, self.variables, unconnected_gradients=zero)) for l_i in l ]
+        elif self.scheme == 'ntk':
+            stats = [ tf.add_n([ tf.square(tf.linalg.global_norm(g.gradient(p, self.variables,
+                      unconnected_gradients=zero))) for p in v_r_i ]) / self.probes for v_r_i in v_r ]
+        else:
+            stats = l
+        del g
+
+        return tf.stack(l), tf.stack([ tf.cast(s, l[0].dtype) for s in stats ])
+
+    def update(self, opt):
+        """
+        ================================================================================================================
+
+        This function is to update the weights of the loss terms at the current weights and biases of the optimiser.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [opt]       [class]                 : The optimiser;
+        [l]         [ndarray]               : The unweighted loss terms;
+        [stats]     [ndarray]               : The statistic of each loss term;
+        [w]         [ndarray]               : The weights of the loss terms.
+
+        ================================================================================================================
+        """
+
+        l, stats = self.statistics(opt.x_train, opt.y_train)
+        l, stats = l.numpy().astype('float64'), stats.numpy().astype('float64')
+        w = self.weights.numpy().astype('float64')
+
+        if self.scheme == 'attention':
+            ### One step of gradient ascent of the weighted loss on the logits, scaled by the mean weighted term:
+            ### d(sum w_j l_j) / ds_i = w_i (l_i - mean(w l)) for w = n * softmax(s)
+            if self.logits is None:
+                self.logits = np.log(w)
+            mean = max(np.mean(w * l), np.finfo(np.float64).tiny)
+            self.logits = self.logits + self.lr * w * (l - mean) / mean
+            w = np.exp(self.logits - np.max(self.logits))
+            w = len(w) * w / np.sum(w)
+        else:
+            ### Inversely proportional to the statistic of each term (the terms without gradients keep their weights)
+            valid = stats > 0.
+            if np.any(valid):
+                target = np.where(valid, np.mean(stats[valid]) / np.where(valid, stats, 1.), w)
+                w = self.alpha * w + (1. - self.alpha) * target
+
+        ### Clip and normalise the weights to a mean of 1
+        w = np.clip(w, *self.bounds)
+        w = w / np.mean(w)
+        if self.scheme == 'attention':
+            self.logits = np.log(w)
+        self.weights.assign(w.astype(self.weights.dtype.as_numpy_dtype))
+
+        ### The cached evaluations of the L-BFGS-B optimiser belong to the previous weights
+        opt.cache.clear()
+        self.last = opt.iter
+
+        ### Log the evolution of the weights
+        row = np.concatenate([[opt.iter], l, w])
+        self.log.append(row)
+        print('Weights of the loss terms at iter %d: %s' % (opt.iter, np.array2string(w, precision=3)))
+        if self.path is not None:
+            with open(self.path, 'a') as f:
+                np.savetxt(f, row[np.newaxis], delimiter=',', fmt='%.9g')
+
+        return None
+
+    def step(self, opt):
+        """
+        ================================================================================================================
+
+        This function is to update the weights if 'every' evaluations have passed since the last update (called by the
+        Adam optimiser between the chunks of steps).
+
+        ================================================================================================================
+        """
+
+        if self.last is None or opt.iter - self.last >= self.every:
+            self.update(opt)
+
+        return None
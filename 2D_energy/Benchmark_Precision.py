@@ -0,0 +1,102 @@
+import tensorflow as tf
+tf.compat.v1.logging.set_verbosity(tf.compat.v1.logging.ERROR)
+import os
+os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
+import time
+import numpy as np
+from lib.Pre.Input_Info import Input_Info
+from lib.Pre.L_BFGS_B import L_BFGS_B
+from lib.Pre_Process import Build
+"""
+========================================================================================================================
+
+    This code is to benchmark the precision policies (see lib/Pre/Precision.py) on the 2D plate (energy-based loss)
+    problem, by the time taken by the L-BFGS-B optimiser to reach a target loss from the same random seed.
+
+    Three policies are run one after another:
+        1. float32        : The original setup, whose best loss is taken as the target;
+        2. float64        : The inputs, the weights, the derivatives and the loss in float64;
+        3. mixed_bfloat16 : The hidden layers in bfloat16, the rest in float32.
+
+    For each policy, the number of evaluations, the final and the best losses, the average time per evaluation and
+    the time to reach the target are printed (the time includes the tracing of the compiled functions).
+
+    Run this code in the '2D_energy' folder:
+        python Benchmark_Precision.py
+
+========================================================================================================================
+"""
+
+class Timed_L_BFGS_B(L_BFGS_B):
+    """
+    ====================================================================================================================
+
+    This is the class for the L-BFGS-B optimiser that records the wall-clock time and the loss of every evaluation.
+
+    ====================================================================================================================
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.his_time = []
+        self.his_f = []
+
+    def pi_loss(self, weights):
+        loss, grads = super().pi_loss(weights)
+        self.his_time.append(time.time())
+        self.his_f.append(loss)
+        return loss, grads
+
+def Run(precision, maxfun):
+    """
+    ====================================================================================================================
+
+    Run function is to train the PINN under one precision policy, and return the history of the evaluations.
+
+    --------------------------------------------------------------------------------------------------------------------
+
+    Name        Type                    Info.
+
+    [precision] [str]                   : The precision policy;
+    [maxfun]    [int]                   : Maximum number of evaluations;
+    [t]         [ndarray]               : The wall-clock time of each evaluation from the start of the training;
+    [f]         [ndarray]               : The loss of each evaluation.
+
+    ====================================================================================================================
+    """
+
+    ### Build up the problem and the PINN from the same random seed
+    tf.keras.backend.clear_session()
+    tf.random.set_seed(0)
+    ns, ns_u, ns_l, x_train, y_train, E, mu, dx, NN_info = Input_Info(precision)
+    pinn = Build(NN_info, E, mu)[-1]
+
+    ### Train the PINN
+    opt = Timed_L_BFGS_B(pinn, x_train, y_train, dx, maxfun=maxfun)
+    time_start = time.time()
+    opt.fit()
+    t = np.array(opt.his_time) - time_start
+    f = np.array(opt.his_f)
+
+    return t, f
+
+if __name__ == '__main__':
+
+    maxfun = 5000
+    policies = ['float32', 'float64', 'mixed_bfloat16']
+    runs = { p: Run(p, maxfun) for p in policies }
+
+    ### The target is the best loss reached by the original float32 setup
+    target = np.min(runs['float32'][1])
+
+    print('*************************************************')
+    print('Precision benchmark, target loss %.6g' % target)
+    print('*************************************************\n')
+    print('%-16s %12s %14s %14s %12s %14s' % ('Policy', 'Evaluations', 'Final loss', 'Best loss', 'Time/eval',
+        'Time to target'))
+    for p in policies:
+        t, f = runs[p]
+        hit = np.nonzero(f <= target)[0]
+        t_target = '%12.2f s' % t[hit[0]] if len(hit) > 0 else '%14s' % 'not reached'
+        print('%-16s %12d %14.6g %14.6g %10.4f s %s' % (p, len(f), f[-1], np.min(f), t[-1] / len(f), t_target))
+    print('\n*************************************************\n')
@@ -0,0 +1,249 @@
+import tensorflow as tf
+tf.compat.v1.logging.set_verbosity(tf.compat.v1.logging.ERROR)
+import os
+os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
+import multiprocessing
+import queue
+import sys
+import time
+import numpy as np
+from lib.Pre_Process import Pre_Process
+from lib.Train import Train
+from lib.Pre.Budget import Budget
+"""
+========================================================================================================================
+
+    This code is to train the PINN of the 2D plate (energy-based loss) problem from several random seeds at once, and
+    keep the best of them, as the training of a PINN may stall at a poor local minimum depending on its
+    initialisation.
+
+    Each seed is trained by the optimiser schedule of Pre_Process() (without checkpoints) in its own worker process,
+    pinned to its own set of cores, with the threads of TensorFlow limited to these cores. When there are more seeds
+    than sets of cores, the remaining seeds start as soon as a set of cores is free. The workers stream the best loss
+    of their runs to the main process, which prints them and stops the runs that are clearly losing: after min_evals
+    evaluations, a run is stopped when its best loss is worse than the best loss of the leading run at the same number
+    of evaluations by more than margin times the absolute value of the latter.
+
+    At the end, the runs are listed, and the weights and biases of the best run (by its final loss), with its seed and
+    its history of the loss terms, are saved to 'Multi_Start.npz'. They are set back to a new PINN by:
+        net_u, net_v, pinn, opt = Pre_Process(checkpoint_path=None)
+        with np.load('Multi_Start.npz') as f:
+            pinn.set_weights([ f['w%d' % i] for i in range(int(f['n_weights'])) ])
+
+    Run this code in the '2D_energy' folder:
+        python Multi_Start.py
+
+========================================================================================================================
+"""
+
+class Stream(Budget):
+    """
+    ====================================================================================================================
+
+    This is the class for the budget of one run, which also streams the best loss of the run to the main process every
+    'report' evaluations, and stops the run when the main process requests it.
+
+    ====================================================================================================================
+    """
+
+    def __init__(self, seed, messages, stop, report=50, **kwargs):
+        super().__init__(**kwargs)
+        self.seed = seed
+        self.messages = messages
+        self.stop = stop
+        self.report = report
+        self.best = np.inf
+
+    def criterion(self, loss, l1, l2):
+        self.best = min(self.best, loss)
+        if self.n % self.report == 0:
+            self.messages.put(('report', self.seed, self.n, self.best))
+        if self.stop.is_set():
+            return 'multi-start (clearly losing run)'
+        return super().criterion(loss, l1, l2)
+
+def Worker(seed, cores, messages, stop, report, budget_kwargs):
+    """
+    ====================================================================================================================
+
+    Worker function is run in a worker process, to train the PINN from one random seed on the given cores, and hand
+    the result of the run to the main process.
+
+    --------------------------------------------------------------------------------------------------------------------
+
+    Name        Type                    Info.
+
+    [seed]      [int]                   : The random seed of the run;
+    [cores]     [list]                  : The cores that the run is pinned to;
+    [messages]  [Queue]                 : The queue of the messages to the main process;
+    [stop]      [Event]                 : The event set by the main process to stop the run;
+    [report]    [int]                   : Number of evaluations between two reports of the best loss;
+    [budget_kwargs] [dict]              : The budgets of the run (see Budget.py);
+    [weights]   [list]                  : The trained weights and biases of the PINN.
+
+    ====================================================================================================================
+    """
+
+    ### Pin the run to its cores, and limit the threads of TensorFlow to them (before TensorFlow is initialised)
+    if hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, cores)
+    tf.config.threading.set_intra_op_parallelism_threads(len(cores))
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+    ### The progress of the run is printed by the main process only
+    sys.stdout = open(os.devnull, 'w')
+
+    ### Build up the problem and the PINN from the seed, and train the PINN
+    tf.random.set_seed(seed)
+    np.random.seed(seed)
+    nets = Pre_Process(checkpoint_path=None)
+    pinn, opt = nets[-2], nets[-1]
+    budget = Stream(seed, messages, stop, report, **budget_kwargs)
+    t, l, it, his_loss = Train(opt, budget=budget)
+    weights = pinn.get_weights()
+
+    messages.put(('done', seed, float(l), int(it), t, weights, his_loss, stop.is_set()))
+
+    return None
+
+def Best_At(curve, n):
+    """
+    ====================================================================================================================
+
+    Best_At function is to return the best loss of a run at the given number of evaluations (inf if the run has not
+    reported it yet).
+
+    --------------------------------------------------------------------------------------------------------------------
+
+    Name        Type                    Info.
+
+    [curve]     [list]                  : The reports of the run, (number of evaluations, best loss);
+    [n]         [int]                   : The number of evaluations.
+
+    ====================================================================================================================
+    """
+
+    best = [ b for m, b in curve if m <= n ]
+
+    return best[-1] if best else np.inf
+
+def Multi_Start(seeds, cores_per_run=1, margin=9., min_evals=500, report=50, path='Multi_Start.npz', **budget_kwargs):
+    """
+    ====================================================================================================================
+
+    Multi_Start function is to train the PINN from the given seeds in parallel worker processes, stop the clearly
+    losing runs, and save the best run.
+
+    --------------------------------------------------------------------------------------------------------------------
+
+    Name        Type                    Info.
+
+    [seeds]     [list]                  : The random seeds of the runs;
+    [cores_per_run] [int]               : Number of cores of each run;
+    [margin]    [float]                 : The run is stopped when its best loss is worse than the best loss of the
+                                          leading run by more than margin times the absolute value of the latter;
+    [min_evals] [int]                   : Number of evaluations before a run may be stopped;
+    [report]    [int]                   : Number of evaluations between two reports of the best loss;
+    [path]      [str]                   : The path of the file of the best run (.npz);
+    [budget_kwargs] [dict]              : The budgets of each run, e.g., max_time and window (see Budget.py);
+    [slots]     [list]                  : The free disjoint sets of cores;
+    [curves]    [dict]                  : The reports of each run, (number of evaluations, best loss);
+    [results]   [dict]                  : The results of the finished runs, (loss, iterations, time, weights, history,
+                                          stopped);
+    [best]      [int]                   : The seed of the best run.
+
+    ====================================================================================================================
+    """
+
+    ### Split the available cores into disjoint sets, one per concurrent run
+    if hasattr(os, 'sched_getaffinity'):
+        cores = sorted(os.sched_getaffinity(0))
+    else:
+        cores = list(range(os.cpu_count()))
+    cores_per_run = max(1, min(cores_per_run, len(cores)))
+    slots = [ cores[i:i + cores_per_run] for i in range(0, len(cores) - cores_per_run + 1, cores_per_run) ]
+
+    ### The workers are spawned, as TensorFlow does not support forking
+    ctx = multiprocessing.get_context('spawn')
+    messages = ctx.Queue()
+    pending = list(seeds)
+    running = {}
+    curves = { seed: [] for seed in pending }
+    results = {}
+    time_start = time.time()
+
+    while pending or running:
+
+        ### Start the pending runs on the free sets of cores
+        while pending and slots:
+            seed, slot = pending.pop(0), slots.pop(0)
+            stop = ctx.Event()
+            process = ctx.Process(target=Worker, args=(seed, slot, messages, stop, report, budget_kwargs))
+            process.start()
+            running[seed] = (process, slot, stop)
+            print('Run %d started on cores %s' % (seed, slot))
+
+        try:
+            message = messages.get(timeout=1.)
+        except queue.Empty:
+            message = None
+
+        if message is not None and message[0] == 'report':
+            _, seed, n, best = message
+            curves[seed].append((n, best))
+            print('Run %d: %d evaluations, best loss = %.6g' % (seed, n, best))
+
+            ### Stop the run if it is clearly losing against the leading run at the same number of evaluations
+            lead = min([ Best_At(c, n) for s, c in curves.items() if s != seed ], default=np.inf)
+            if seed in running and n >= min_evals and np.isfinite(lead) and best > lead + margin * abs(lead):
+                if not running[seed][2].is_set():
+                    running[seed][2].set()
+                    print('Run %d is stopped (best loss %.6g against %.6g)' % (seed, best, lead))
+
+        elif message is not None and message[0] == 'done':
+            _, seed, l, it, t, weights, his_loss, stopped = message
+            results[seed] = (l, it, t, weights, his_loss, stopped)
+            process, slot, _ = running.pop(seed)
+            process.join()
+            slots.append(slot)
+            print('Run %d finished: loss = %.6g, %d iterations, %.1f s' % (seed, l, it, t))
+
+        ### Free the cores of the runs that failed
+        for seed, (process, slot, _) in list(running.items()):
+            if not process.is_alive() and process.exitcode != 0:
+                running.pop(seed)
+                slots.append(slot)
+                print('Run %d failed with exit code %s' % (seed, process.exitcode))
+
+    ### Select the best run by its final loss, and save it
+    finished = [ s for s in results if np.isfinite(results[s][0]) ]
+    if not finished:
+        print('No run finished.')
+        return None
+    best = min(finished, key=lambda s: results[s][0])
+    l, it, t, weights, his_loss, stopped = results[best]
+    np.savez(path, seed=best, loss=l, n_weights=len(weights), his_l1=his_loss[0], his_l2=his_loss[1],
+             **{ 'w%d' % i: w for i, w in enumerate(weights) })
+
+    print('\n*************************************************')
+    print('Multi-start, %d runs in %.1f s' % (len(curves), time.time() - time_start))
+    print('*************************************************\n')
+    print('%-8s %14s %12s %12s %10s' % ('Seed', 'Final loss', 'Iterations', 'Time', 'Status'))
+    for seed in curves:
+        if seed in results:
+            l_s, it_s, t_s, _, _, stopped_s = results[seed]
+            status = 'best' if seed == best else ('stopped' if stopped_s else 'finished')
+            print('%-8d %14.6g %12d %10.1f s %10s' % (seed, l_s, it_s, t_s, status))
+        else:
+            print('%-8d %14s %12s %12s %10s' % (seed, '-', '-', '-', 'failed'))
+    print('\nThe best run (seed %d) is saved to %s' % (best, path))
+    print('\n*************************************************\n')
+
+    return best
+
+if __name__ == '__main__':
+
+    ### 8 seeds, 4 cores per run, each run within 2 hours and stopped on a plateau of 2000 evaluations (the energy-
+    ### based loss is negative and bounded below by the exact energy, so the margin is much narrower than for the
+    ### collocation loss)
+    Multi_Start(seeds=range(8), cores_per_run=4, margin=0.05, min_evals=2000, max_time=7200., window=2000)
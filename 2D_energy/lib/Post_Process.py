@@ -38,7 +38,7 @@ def Post_Process(net_u, net_v, pinn, his_loss):
     
     u = net_u.predict(xy) * xy[..., 0, np.newaxis]
     v = net_v.predict(xy) * xy[..., 1, np.newaxis]
-    temp = pinn.predict([ xy for i in range(0,5) ])
+    temp = pinn.predict([ xy for i in range(0,2) ])
     s11 = temp[3]
     s22 = temp[4]
     s12 = temp[5]
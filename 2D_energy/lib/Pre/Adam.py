@@ -0,0 +1,314 @@
+import numpy as np
+import tensorflow as tf
+from lib.Pre.L_BFGS_B import L_BFGS_B
+
+class Adam(L_BFGS_B):
+    """
+    ====================================================================================================================
+
+    This is the class for the Adam optimiser. It shares the physics-informed loss with the L-BFGS-B optimiser (see
+    L_BFGS_B.py), and runs a number of Adam steps inside one compiled TensorFlow function per call, so that Python is
+    only visited once every steps_per_execution steps. It is mainly used as a cheap first-order warm-up before the
+    L-BFGS-B optimiser (see Schedule.py). If batch_size is given, each step is evaluated on a mini-batch drawn from
+    all the point sets in proportion to their sizes by a prefetched tf.data pipeline, instead of the full batch.
+    This class include 7 functions, including:
+        1. __init__()         : Initialise the parameters for the Adam optimiser;
+        2. sampler()          : Build up the tf.data pipeline of the mini-batches;
+        3. train_steps()      : Execute a number of Adam steps inside the compiled TensorFlow function;
+        4. state()            : Return the state of the optimiser for the checkpoints;
+        5. restore()          : Restore the state of the optimiser from a checkpoint;
+        6. history()          : Return the history values of the loss terms;
+        7. fit()              : Execute training process.
+
+    ====================================================================================================================
+    """
+
+    def __init__(self, pinn, x_train, y_train, dx, epochs=1000, lr=1e-3, beta_1=0.9, beta_2=0.999, epsilon=1e-7,
+                 steps_per_execution=100, batch_size=None, y_set=None,
+                 resampler=None):
+        """
+        ================================================================================================================
+
+        This function is to initialise the parameters used in the Adam optimiser.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [pinn]      [Keras model]           : The Physics-informed neural network;
+        [x_train]   [list]                  : PINN input list, contains all the coordinates information;
+        [y_train]   [list]                  : PINN boundary condition list, contains the traction boundary condition;
+        [dx]        [float]                 : Sample points interval;
+        [epochs]    [int]                   : Number of Adam steps for training;
+        [lr]        [float]                 : The learning rate;
+        [beta_1]    [float]                 : The exponential decay rate for the first moment estimates;
+        [beta_2]    [float]                 : The exponential decay rate for the second moment estimates;
+        [epsilon]   [float]                 : The small constant for numerical stability;
+        [steps_per_execution] [int]         : Number of Adam steps executed per call of the compiled function;
+        [batch_size][int]                   : Number of sample points per mini-batch (None for the full batch);
+        [y_set]     [list]                  : Index of the point set in x_train paired with each array in y_train
+                                              (None, if the array is not sampled point by point);
+        [resampler] [Sampler]               : The sampler that regenerates the domain points between the chunks of steps
+                                              (None to keep them fixed, see Sampler.py);
+        [iterator]  [iterator]              : The iterator over the mini-batches (None for the full batch);
+        [m_t]       [list]                  : The first moment estimates of the weights and biases;
+        [v_t]       [list]                  : The second moment estimates of the weights and biases;
+        [step]      [tf.Variable]           : Number of the executed Adam steps;
+        [his_l1]    [list]                  : History values of the l1 loss term, one array per chunk of steps;
+        [his_l2]    [list]                  : History values of the l2 loss term, one array per chunk of steps.
+
+        ================================================================================================================
+        """
+
+        if isinstance(dx, (list, tuple)) and (batch_size is not None or resampler is not None):
+            raise ValueError('The quadrature weights require the fixed full batch (batch_size=None, resampler=None).')
+
+        super().__init__(pinn, x_train, y_train, dx)
+        self.epochs = epochs
+        self.lr = lr
+        self.beta_1 = beta_1
+        self.beta_2 = beta_2
+        self.epsilon = epsilon
+        self.steps_per_execution = steps_per_execution
+        self.iterator = None if batch_size is None else iter(self.sampler(batch_size, y_set))
+        self.resampler = resampler
+        self.m_t = [ tf.Variable(tf.zeros_like(v), trainable=False) for v in self.variables ]
+        self.v_t = [ tf.Variable(tf.zeros_like(v), trainable=False) for v in self.variables ]
+        self.step = tf.Variable(0., trainable=False, dtype=self.dtype)
+        self.his_l1 = [np.zeros(0)]
+        self.his_l2 = [np.zeros(0)]
+
+        ### Hold the domain points in a variable, so that the compiled Adam steps take the regenerated ones
+        if resampler is not None:
+            if batch_size is not None:
+                raise ValueError('The regeneration of the domain points requires the full batch (batch_size=None).')
+            self.x_train[0] = tf.Variable(self.x_train[0], trainable=False)
+
+    def sampler(self, batch_size, y_set):
+        """
+        ================================================================================================================
+
+        This function is to build up the tf.data pipeline of the mini-batches. The sample points of each point set are
+        drawn uniformly at random (with replacement) in proportion to the size of the set, with at least one point per
+        set, and the paired boundary conditions are gathered with the same indices. The mini-batches are generated and
+        prefetched on the background threads of tf.data.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [batch_size][int]                   : Number of sample points per mini-batch;
+        [y_set]     [list]                  : Index of the point set in x_train paired with each array in y_train;
+        [n_b]       [list of int]           : Number of sample points drawn from each point set;
+        [dataset]   [tf.data.Dataset]       : The endless dataset of the mini-batches (x, y).
+
+        ================================================================================================================
+        """
+
+        ### Distribute the mini-batch over the point sets in proportion to their sizes
+        n = [ int(x.shape[0]) for x in self.x_train ]
+
+        ### Check that each sampled array is paired with a point set of the same number of points (no array is sampled
+        ### if y_set is not given)
+        y_set = y_set if y_set is not None else [None] * len(self.y_train)
+        if len(y_set) != len(self.y_train):
+            raise ValueError('y_set must give one entry per array in y_train, got %d for %d.'
+                             % (len(y_set), len(self.y_train)))
+        for k, (y, s) in enumerate(zip(self.y_train, y_set)):
+            shape = tuple(getattr(y, 'shape', ()))
+            if s is not None and (len(shape) < 1 or shape[0] != n[s]):
+                raise ValueError('y_train[%d] with the shape %s cannot be sampled with the %d points of x_train[%d] '
+                                 '(use None in y_set for the arrays which are not given point by point).'
+                                 % (k, shape, n[s], s))
+        n_b = [ max(1, int(round(batch_size * n_i / sum(n)))) for n_i in n ]
+
+        def sample(_):
+            ids = [ tf.random.uniform([b], maxval=n_i, dtype=tf.int32) for b, n_i in zip(n_b, n) ]
+            x = tuple(tf.gather(x, i) for x, i in zip(self.x_train, ids))
+            y = tuple(y if s is None else tf.gather(y, ids[s]) for y, s in zip(self.y_train, y_set))
+            return x, y
+
+        dataset = tf.data.Dataset.from_tensors(0).repeat()
+        dataset = dataset.map(sample, num_parallel_calls=tf.data.AUTOTUNE).prefetch(tf.data.AUTOTUNE)
+
+        return dataset
+
+    @tf.function
+    def train_steps(self, n):
+        """
+        ================================================================================================================
+
+        This function is to execute a number of Adam steps inside the compiled TensorFlow function.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [n]         [Keras tensor]          : Number of Adam steps to be executed;
+        [x]         [list]                  : PINN input list of the full batch or the mini-batch;
+        [y]         [list]                  : PINN boundary condition list of the full batch or the mini-batch;
+        [loss]      [Keras tensor]          : Current value of the physics-informed loss;
+        [grads]     [Keras tensor]          : The gradients of the physics-informed loss with respect to weights and
+                                              biases;
+        [lr_t]      [Keras tensor]          : The bias-corrected learning rate;
+        [his_l1]    [TensorArray]           : History values of the l1 loss term;
+        [his_l2]    [TensorArray]           : History values of the l2 loss term.
+
+        ================================================================================================================
+        """
+
+        his_l1 = tf.TensorArray(self.dtype, size=n)
+        his_l2 = tf.TensorArray(self.dtype, size=n)
+        loss = tf.constant(0., dtype=self.dtype)
+        for i in tf.range(n):
+
+            ### Draw the next mini-batch, if required
+            if self.iterator is None:
+                x, y = self.x_train, self.y_train
+            else:
+                x, y = self.iterator.get_next()
+                x, y = list(x), list(y)
+
+            ### Calculate the physics-informed loss and its gradients with respect to weights and biases
+            loss, grads, l1, l2 = self.loss_grad(x, y)
+            his_l1 = his_l1.write(i, l1)
+            his_l2 = his_l2.write(i, l2)
+
+            ### Update the weights and biases with the bias-corrected moment estimates
+            self.step.assign_add(1.)
+            lr_t = self.lr * tf.sqrt(1. - self.beta_2 ** self.step) / (1. - self.beta_1 ** self.step)
+            for v, g, m_t, v_t in zip(self.variables, grads, self.m_t, self.v_t):
+                m_t.assign(self.beta_1 * m_t + (1. - self.beta_1) * g)
+                v_t.assign(self.beta_2 * v_t + (1. - self.beta_2) * tf.square(g))
+                v.assign_sub(lr_t * m_t / (tf.sqrt(v_t) + self.epsilon))
+
+        return loss, his_l1.stack(), his_l2.stack()
+
+    def state(self):
+        """
+        ================================================================================================================
+
+        This function is to return the state of the optimiser for the checkpoints (see Checkpoint.py), including the
+        moment estimates, so that the resumed Adam steps continue exactly.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [m_t]       [ndarray]               : The flat first moment estimates;
+        [v_t]       [ndarray]               : The flat second moment estimates;
+        [step]      [float]                 : Number of the executed Adam steps;
+        [adam_l1]   [ndarray]               : History values of the l1 loss term;
+        [adam_l2]   [ndarray]               : History values of the l2 loss term.
+
+        ================================================================================================================
+        """
+
+        state = super().state()
+        state['m_t'] = np.concatenate([ m.numpy().flatten() for m in self.m_t ])
+        state['v_t'] = np.concatenate([ v.numpy().flatten() for v in self.v_t ])
+        state['step'] = self.step.numpy()
+        state['adam_l1'] = np.concatenate(self.his_l1)
+        state['adam_l2'] = np.concatenate(self.his_l2)
+
+        return state
+
+    def restore(self, state):
+        """
+        ================================================================================================================
+
+        This function is to restore the state of the optimiser from a checkpoint (the weights and biases are restored
+        by set_weights()).
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [state]     [dict]                  : The state of the training loaded from the checkpoint.
+
+        ================================================================================================================
+        """
+
+        super().restore(state)
+        if 'm_t' in state:
+            split_ids = np.cumsum([0] + self.sizes)
+            for i, (m, v) in enumerate(zip(self.m_t, self.v_t)):
+                m.assign(state['m_t'][split_ids[i]:split_ids[i + 1]].reshape(self.shapes[i]))
+                v.assign(state['v_t'][split_ids[i]:split_ids[i + 1]].reshape(self.shapes[i]))
+            self.step.assign(state['step'])
+            self.his_l1 = [state['adam_l1']]
+            self.his_l2 = [state['adam_l2']]
+
+        return None
+
+    def history(self):
+        """
+        ================================================================================================================
+
+        This function is to return the history values of the loss terms, from the chunks of steps executed so far.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [his_l1]    [ndarray]               : History values of the l1 loss term;
+        [his_l2]    [ndarray]               : History values of the l2 loss term.
+
+        ================================================================================================================
+        """
+
+        return [np.concatenate(self.his_l1), np.concatenate(self.his_l2)]
+
+    def fit(self):
+        """
+        ================================================================================================================
+
+        This function is to execute training process.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [epochs]    [int]                   : Number of Adam steps for training;
+        [steps_per_execution] [int]         : Number of Adam steps executed per call of the compiled function;
+        [result]    [tuple]                 : The result in the same form as the one returned by the SciPy optimiser,
+                                              (weights and biases, final loss, {'funcalls', 'nit', 'warnflag'});
+        [his_l1]    [ndarray]               : History values of the l1 loss term;
+        [his_l2]    [ndarray]               : History values of the l2 loss term.
+
+        ================================================================================================================
+        """
+
+        print('Optimizer: Adam (In-graph TensorFlow implementation)')
+        print('Initializing ...\n')
+
+        ### Execute the Adam steps in chunks of steps_per_execution steps
+        loss = np.nan
+        while self.iter < self.epochs:
+
+            ### Regenerate the domain points between the chunks, if due
+            if self.resampler is not None:
+                self.resampler.step(self)
+
+            n = min(self.steps_per_execution, self.epochs - self.iter)
+            loss, l1, l2 = self.train_steps(tf.constant(n))
+            self.his_l1.append(l1.numpy())
+            self.his_l2.append(l2.numpy())
+            self.iter = self.iter + n
+
+            ### Print the loss terms after each chunk
+            print('Iter: %d   L1 = %.4g   L2 = %.4g' % (self.iter, self.his_l1[-1][-1], self.his_l2[-1][-1]))
+
+            ### Hand the state to the checkpoint after each chunk, which is saved if due
+            if self.checkpoint is not None:
+                self.checkpoint.step(self)
+
+            ### Check the budgets of the training after each chunk, which stop it if any is met
+            if self.budget is not None:
+                self.budget.check(self, loss, self.his_l1[-1][-1], self.his_l2[-1][-1])
+
+        ### Get the final weights and biases
+        weights = np.concatenate([ v.numpy().flatten() for v in self.variables ])
+        result = (weights, float(loss), {'funcalls': self.iter, 'nit': self.iter, 'warnflag': 0})
+
+        return result, self.history()
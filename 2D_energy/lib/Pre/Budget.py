@@ -0,0 +1,174 @@
+import time
+import numpy as np
+
+class Stop(Exception):
+    """
+    ====================================================================================================================
+
+    This is the exception raised by the budget to stop the training, which carries the criterion that is met and the
+    result of the stopped optimiser, in the same form as the one returned by the SciPy optimiser.
+
+    ====================================================================================================================
+    """
+
+    def __init__(self, criterion, result):
+        super().__init__(criterion)
+        self.criterion = criterion
+        self.result = result
+
+class Budget:
+    """
+    ====================================================================================================================
+
+    This is the class for the budgets of the training, beyond the stopping rules of the optimisers (factr, pgtol and
+    maxfun). The optimisers hand every evaluation to the budget (every chunk of steps for the Adam optimiser), which
+    stops the training as soon as any of the following criteria is met:
+        'time'       : The wall-clock time since the start of the training reaches max_time;
+        'evaluations': The number of the checked evaluations reaches max_evals (e.g., the budget of a trial in
+                       Hyperband.py);
+        'loss'       : The physics-informed loss reaches target_loss;
+        'plateau'    : Neither the l1 nor the l2 loss term changes by more than rtol (relative) over the last window
+                       evaluations, which also applies to the energy-based loss whose terms grow during training;
+        'validation' : The error given by the validation function (e.g., the relative L2 error against the analytic
+                       or the FEA solution, see Validation.py), evaluated every 'every' evaluations, reaches
+                       target_error.
+    The training is stopped by raising Stop, which is caught by the optimiser schedule (see Schedule.py), so that the
+    history up to the stop is kept and the criterion is reported by Train(). The in-graph L-BFGS optimiser is not
+    checked, as its evaluations never return to Python. This class include 4 functions, including:
+        1. __init__()         : Initialise the budgets;
+        2. start()            : Start the wall-clock time of the training;
+        3. criterion()        : Return the criterion met by one evaluation (overridden to add the criteria);
+        4. check()            : Check the budgets with one evaluation, and stop the training if any is met.
+
+    ====================================================================================================================
+    """
+
+    def __init__(self, max_time=None, target_loss=None, window=None, rtol=1e-4, validation=None, target_error=None,
+                 every=100, max_evals=None):
+        """
+        ================================================================================================================
+
+        This function is to initialise the budgets. The criteria given as None are not applied.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [max_time]  [float]                 : The wall-clock budget of the training, in seconds;
+        [target_loss] [float]               : The target of the physics-informed loss;
+        [window]    [int]                   : Number of evaluations without a change of the loss terms for a plateau;
+        [rtol]      [float]                 : The relative change of the loss terms below which they are unchanged;
+        [validation][function]              : The function that returns the validation error of the current PINN;
+        [target_error] [float]              : The target of the validation error;
+        [every]     [int]                   : Number of evaluations between two validations;
+        [max_evals] [int]                   : The budget of the checked evaluations (a chunk of steps of the Adam
+                                              optimiser counts as one);
+        [n]         [int]                   : Number of the checked evaluations;
+        [ref]       [tuple]                 : The loss terms at the last change;
+        [n_ref]     [int]                   : The evaluation of the last change;
+        [error]     [float]                 : The last validation error.
+
+        ================================================================================================================
+        """
+
+        self.max_time = max_time
+        self.target_loss = target_loss
+        self.window = window
+        self.rtol = rtol
+        self.validation = validation if target_error is not None else None
+        self.target_error = target_error
+        self.every = every
+        self.max_evals = max_evals
+        self.n = 0
+        self.ref = None
+        self.n_ref = 0
+        self.error = np.nan
+        self.time_start = time.time()
+
+    def start(self):
+        """
+        ================================================================================================================
+
+        This function is to start the wall-clock time of the training (called by Train()).
+
+        ================================================================================================================
+        """
+
+        self.time_start = time.time()
+
+        return None
+
+    def criterion(self, loss, l1, l2):
+        """
+        ================================================================================================================
+
+        This function is to return the criterion met by one evaluation, which is overridden to add the criteria (e.g.,
+        in Multi_Start.py).
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [loss]      [float]                 : The physics-informed loss;
+        [l1]        [float]                 : The l1 loss term;
+        [l2]        [float]                 : The l2 loss term;
+        [criterion] [str]                   : The criterion that is met (None if there is none).
+
+        ================================================================================================================
+        """
+
+        ### Follow the loss terms for the plateau, from the evaluation where either of them last changed
+        if self.ref is None or any(abs(l - r) > self.rtol * abs(r) for l, r in zip((l1, l2), self.ref)):
+            self.ref = (l1, l2)
+            self.n_ref = self.n
+
+        criterion = None
+        if self.max_time is not None and time.time() - self.time_start >= self.max_time:
+            criterion = 'time (%.0f s)' % self.max_time
+        elif self.max_evals is not None and self.n >= self.max_evals:
+            criterion = 'evaluations (%d)' % self.max_evals
+        elif self.target_loss is not None and loss <= self.target_loss:
+            criterion = 'loss (%.4g <= %.4g)' % (loss, self.target_loss)
+        elif self.window is not None and self.n - self.n_ref >= self.window:
+            criterion = 'plateau (%d evaluations without a relative change of %.1g)' % (self.window, self.rtol)
+        elif self.validation is not None and self.n % self.every == 0:
+            self.error = self.validation()
+            print('Validation error = %.4g' % self.error)
+            if self.error <= self.target_error:
+                criterion = 'validation (%.4g <= %.4g)' % (self.error, self.target_error)
+
+        return criterion
+
+    def check(self, opt, loss, l1, l2, weights=None):
+        """
+        ================================================================================================================
+
+        This function is to check the budgets with one evaluation, and stop the training if any is met.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [opt]       [class]                 : The optimiser;
+        [loss]      [float]                 : The physics-informed loss;
+        [l1]        [float]                 : The l1 loss term;
+        [l2]        [float]                 : The l2 loss term;
+        [weights]   [ndarray]               : The current flat weights and biases (None to read them from the PINN);
+        [criterion] [str]                   : The criterion that is met (None if there is none);
+        [info]      [dict]                  : The information of the stopped optimiser, {'funcalls', 'warnflag',
+                                              'stop'}, with the weights and biases and the loss in the result.
+
+        ================================================================================================================
+        """
+
+        self.n = self.n + 1
+        loss, l1, l2 = float(loss), float(l1), float(l2)
+        criterion = self.criterion(loss, l1, l2)
+        if criterion is None:
+            return None
+
+        ### Stop the training with the current weights and biases
+        if weights is None:
+            weights = np.concatenate([ v.numpy().flatten() for v in opt.variables ])
+        info = {'funcalls': int(opt.iter), 'warnflag': 3, 'stop': criterion}
+        raise Stop(criterion, (np.array(weights, dtype='float64'), loss, info))
@@ -0,0 +1,187 @@
+import concurrent.futures
+import os
+import signal
+import sys
+import time
+import numpy as np
+
+class Checkpoint:
+    """
+    ====================================================================================================================
+
+    This is the class for the checkpoints of the training. The optimisers hand their state to the checkpoint at every
+    evaluation (see step()), which is saved every interval seconds, at the start of every stage of the optimiser
+    schedule (see Schedule.py), and when SIGTERM or SIGINT is received, after which the training stops. The state is
+    copied on the training thread, and written by a background thread to a temporary file that then replaces the
+    checkpoint file, so that the optimiser is not stalled by the disk and a preempted job never leaves a half-written
+    checkpoint. The state contains the stage of the schedule, the weights and biases, the number of evaluations, the
+    history of the loss terms, and the state of the optimiser (e.g., the curvature pairs of the L-BFGS optimiser with
+    the parallel line search, or the moment estimates of the Adam optimiser). The training is resumed from the latest
+    checkpoint by 'python Main.py resume'. This class include 6 functions, including:
+        1. __init__()         : Initialise the checkpoint and install the signal handlers;
+        2. handler()          : Request a checkpoint when SIGTERM or SIGINT is received;
+        3. write()            : Write the state to the checkpoint file atomically (run by the background thread);
+        4. step()             : Save the state of the optimiser if a checkpoint is due;
+        5. wait()             : Wait for the pending write to finish;
+        6. load()             : Load the state from the latest checkpoint.
+
+    ====================================================================================================================
+    """
+
+    def __init__(self, path='Checkpoint.npz', interval=600.):
+        """
+        ================================================================================================================
+
+        This function is to initialise the checkpoint, and install the handlers of SIGTERM and SIGINT (it must be
+        called from the main thread).
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [path]      [str]                   : The path of the checkpoint file (.npz);
+        [interval]  [float]                 : The wall time between two periodic checkpoints, in seconds;
+        [context]   [dict]                  : The state of the optimiser schedule, set by Schedule.fit() at the start of
+                                              each stage (stage, funcalls, his_l1 and his_l2 of the previous stages);
+        [signum]    [int]                   : The signal received (None if no signal is received);
+        [pool]      [ThreadPoolExecutor]    : The background thread that writes the checkpoints;
+        [future]    [Future]                : The pending write (None if there is none).
+
+        ================================================================================================================
+        """
+
+        self.path = path
+        self.interval = interval
+        self.context = {}
+        self.signum = None
+        self.time_saved = time.time()
+        self.pool = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self.future = None
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, self.handler)
+
+    def handler(self, signum, frame):
+        """
+        ================================================================================================================
+
+        This function is to request a checkpoint when SIGTERM or SIGINT is received. The checkpoint is saved at the
+        next evaluation of the loss, as the weights and biases may be in the middle of an update now. A second signal
+        stops the training at once.
+
+        ================================================================================================================
+        """
+
+        if self.signum is not None:
+            raise KeyboardInterrupt
+        self.signum = signum
+        print('\nSignal %d received, saving the checkpoint at the next evaluation ...' % signum)
+
+        return None
+
+    def write(self, state):
+        """
+        ================================================================================================================
+
+        This function is to write the state to the checkpoint file atomically: the state is written and flushed to a
+        temporary file first, which then replaces the checkpoint file in one step.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [state]     [dict]                  : The state of the training, as NumPy arrays or scalars.
+
+        ================================================================================================================
+        """
+
+        path_tmp = self.path + '.tmp'
+        with open(path_tmp, 'wb') as f:
+            np.savez(f, **state)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(path_tmp, self.path)
+
+        return None
+
+    def step(self, opt, weights=None, force=False):
+        """
+        ================================================================================================================
+
+        This function is to save the state of the optimiser if a checkpoint is due, i.e., if the interval has passed
+        since the last checkpoint, if a signal is received, or if forced. After a signal, the training stops once the
+        checkpoint is written.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [opt]       [class]                 : The optimiser, which gives its state by opt.state();
+        [weights]   [ndarray]               : The current flat weights and biases (None to read them from the PINN);
+        [force]     [bool]                  : Whether the checkpoint is saved regardless of the interval;
+        [state]     [dict]                  : The state of the training, copied before it is handed to the background
+                                              thread.
+
+        ================================================================================================================
+        """
+
+        if not force and self.signum is None and time.time() - self.time_saved < self.interval:
+            return None
+
+        ### Copy the state on the training thread, as the optimiser goes on updating it
+        state = {'stage': 0, 'funcalls': 0, 'his_l1': np.zeros(0), 'his_l2': np.zeros(0)}
+        state.update(self.context)
+        if weights is None:
+            weights = np.concatenate([ v.numpy().flatten() for v in opt.variables ])
+        state['weights'] = np.array(weights, dtype='float64')
+        state.update(opt.state())
+
+        ### Hand the state to the background thread, after the previous write is finished
+        self.wait()
+        self.future = self.pool.submit(self.write, state)
+        self.time_saved = time.time()
+
+        ### Stop the training after a signal, once the checkpoint and the history are written
+        if self.signum is not None:
+            self.wait()
+            opt.telemetry.close()
+            sys.exit('Training stopped by signal %d. Resume it by: python Main.py resume' % self.signum)
+
+        return None
+
+    def wait(self):
+        """
+        ================================================================================================================
+
+        This function is to wait for the pending write to finish, and raise its error if it fails.
+
+        ================================================================================================================
+        """
+
+        if self.future is not None:
+            self.future.result()
+            self.future = None
+
+        return None
+
+    def load(self):
+        """
+        ================================================================================================================
+
+        This function is to load the state from the latest checkpoint.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [state]     [dict]                  : The state of the training (None if there is no checkpoint).
+
+        ================================================================================================================
+        """
+
+        if not os.path.exists(self.path):
+            return None
+
+        with np.load(self.path) as f:
+            state = { k: f[k] for k in f.files }
+
+        return state
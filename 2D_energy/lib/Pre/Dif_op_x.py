@@ -1,4 +1,5 @@
 import tensorflow as tf
+from lib.Pre.Taylor import Taylor, Taylor_terms
 
 class Dif_x(tf.keras.layers.Layer):
     """
@@ -13,7 +14,7 @@ class Dif_x(tf.keras.layers.Layer):
     ====================================================================================================================
     """
 
-    def __init__(self, fnn, **kwargs):
+    def __init__(self, fnn, order=2, taylor=False, **kwargs):
         """
         ================================================================================================================
 
@@ -23,12 +24,20 @@ class Dif_x(tf.keras.layers.Layer):
 
         Name        Type                    Info.
 
-        [fnn]       [Keras model]           : The Feedforward Neural Network.
+        [fnn]       [Keras model]           : The Feedforward Neural Network;
+        [order]     [int]                   : The highest order of the derivatives to be calculated (1 or 2);
+        [taylor]    [bool]                  : Whether to obtain the differential terms by the Taylor-mode forward
+                                              sweep (see Taylor.py) instead of the nested GradientTape functions.
 
         ================================================================================================================
         """
         self.fnn = fnn
-        super().__init__(**kwargs)
+        self.order = order
+        self.taylor = Taylor(fnn, 0, order) if taylor else None
+
+        ### Keep the coordinates, the derivatives and the loss in the floating-point type of the inputs, as the layer
+        ### would otherwise follow the mixed precision policy and cast the coordinates to bfloat16 (see Precision.py)
+        super().__init__(dtype=kwargs.pop('dtype', tf.keras.backend.floatx()), **kwargs)
     
     @tf.function
     def call(self, xy):
@@ -53,9 +62,28 @@ class Dif_x(tf.keras.layers.Layer):
         ================================================================================================================
         """
 
+        ### Obtain the differential terms by the Taylor-mode forward sweep, if required
+        if self.taylor is not None:
+            _, dU, ddU = self.taylor(xy)
+            terms = Taylor_terms(dU, ddU)
+
+            return terms
+
         ### Divide the coordinate array into x and y components
         x, y = (xy[..., i, tf.newaxis] for i in range(xy.shape[-1]))
 
+        ### Obtain the first-order derivatives only, if the second-order derivatives are not required
+        if self.order == 1:
+            with tf.GradientTape(persistent=True) as g:
+                g.watch(x)
+                g.watch(y)
+                U = self.fnn(tf.concat([x, y], axis=-1)) * x
+            U_x = g.gradient(U, x)
+            U_y = g.gradient(U, y)
+            del g
+
+            return U_x, U_y
+
         ### Apply the GradientTape function
         with tf.GradientTape(persistent=True) as gg:
             gg.watch(x)
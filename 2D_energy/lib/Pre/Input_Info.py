@@ -1,7 +1,10 @@
 import numpy as np
 import math
+from lib.Pre.Precision import Precision
+from lib.Pre.Sampler import Sampler
+from lib.Pre.Quadrature import Quadrature
 
-def Input_Info():
+def Input_Info(precision='float32', settings=None, sampler=None, quadrature=None):
     """
     ====================================================================================================================
 
@@ -15,8 +18,17 @@ def Input_Info():
 
     Name        Type                    Info.
 
+    [precision] [str]                   : The precision policy (see Precision.py);
+    [settings]  [dict]                  : The FNN settings that override the ones defined below, {'width', 'depth',
+                                          'acti_fun'} (e.g., in the trials of Hyperband.py);
+    [sampler]   [Sampler]               : The sampler of the point sets (None for the uniform grid, see Sampler.py);
+    [quadrature][tuple]                 : Number of cells along each axis and number of Gauss-Legendre points per
+                                          axis in each cell, (n_cells, order), for the energy-based loss (None for the
+                                          sample points of the sampler or the grid, see Quadrature.py);
+    [dtype]     [str]                   : The floating-point type of the point sets and the boundary conditions;
     [ns]        [int]                   : Total number of sample points;
-    [dx]        [float]                 : Sample points interval;
+    [dx]        [float or list]         : Sample points interval, or the quadrature weights of the domain points and of
+                                          the right boundary points;
     [xy]        [Array of float32]      : Coordinates of all the sample points;
     [xy_u]      [Array of float32]      : Coordinates of the sample points on the upper boundary of the plate;
     [xy_b]      [Array of float32]      : Coordinates of the sample points on the bottom boundary of the plate;
@@ -48,46 +60,59 @@ def Input_Info():
 
     ====================================================================================================================
     """
+
+    ### Set the precision policy
+    dtype = Precision(precision)
     
     ### Define the number of sample points
     ns_u = 51
     ns_l = 51
     ns = ns_u*ns_l
+    if sampler is not None and quadrature is not None:
+        raise ValueError('The sample points are either drawn by the sampler or placed by the quadrature.')
+    sampler = sampler if sampler is not None else Sampler('grid')
     
-    ### Define the sample points' interval
-    dx = 1./(ns_u-1)
+    ### Define the sample points' interval (for the points which are not on the grid, dx * dx is the area per domain
+    ### point and dx the length per boundary point, as the energy-based loss weights the points by them)
+    dx = 1./(ns_u-1) if sampler.method == 'grid' else 1./ns_u
     
-    ### Initialize sample points' coordinates
-    xy = np.zeros((ns, 2)).astype(np.float32)
-    for i in range(0,ns_u):
-        for j in range(0,ns_l):
-            xy[i*ns_l+j, 0] = i * dx
-            xy[i*ns_l+j, 1] = j * dx
-    xy_u = np.hstack([np.linspace(0,1, ns_u).reshape(ns_u, 1).astype(np.float32), \
-                      np.ones((ns_u,1)).astype(np.float32)])
-    xy_b = np.hstack([np.linspace(0,1, ns_u).reshape(ns_u, 1).astype(np.float32), \
-                      np.zeros((ns_u,1)).astype(np.float32)])
-    xy_l = np.hstack([np.zeros((ns_l,1)).astype(np.float32), \
-                  np.linspace(0,1, ns_l).reshape(ns_l, 1).astype(np.float32)])
-    xy_r = np.hstack([np.ones((ns_l,1)).astype(np.float32), \
-                  np.linspace(0,1, ns_l).reshape(ns_l, 1).astype(np.float32)])
+    ### Initialize sample points' coordinates, on the uniform grid unless a sampler is given
+    xy = sampler.interior(ns, [0., 0.], [1., 1.], key=0).astype(dtype)
+    xy_u = sampler.boundary(ns_u, [0., 0.], [1., 1.], axis=1, value=1., key=1).astype(dtype)
+    xy_b = sampler.boundary(ns_u, [0., 0.], [1., 1.], axis=1, value=0., key=2).astype(dtype)
+    xy_l = sampler.boundary(ns_l, [0., 0.], [1., 1.], axis=0, value=0., key=3).astype(dtype)
+    xy_r = sampler.boundary(ns_l, [0., 0.], [1., 1.], axis=0, value=1., key=4).astype(dtype)
+
+    ### Or, place the sample points at the Gauss-Legendre points of n_cells x n_cells cells and of n_cells segments of
+    ### each boundary, whose quadrature weights replace the sample points' interval in the energy-based loss
+    if quadrature is not None:
+        n_cells, order = quadrature
+        xy, w = Quadrature([n_cells, n_cells], order, [0., 0.], [1., 1.])
+        t, w_t = Quadrature([n_cells], order, [0.], [1.])
+        ns, ns_u, ns_l = len(xy), len(t), len(t)
+        xy = xy.astype(dtype)
+        xy_u = np.hstack([t, np.ones_like(t)]).astype(dtype)
+        xy_b = np.hstack([t, np.zeros_like(t)]).astype(dtype)
+        xy_l = np.hstack([np.zeros_like(t), t]).astype(dtype)
+        xy_r = np.hstack([np.ones_like(t), t]).astype(dtype)
+        dx = [w.astype(dtype), w_t.astype(dtype)]
     
-    ### Create the PINN input list
-    x_train = [ xy, xy_u, xy_b, xy_l, xy_r]
+    ### Create the PINN input list (only the domain and the right boundary contribute to the energy-based loss)
+    x_train = [ xy, xy_r]
     
     ### Define the material properties
     E = 7.
     mu = 0.3
     
     ### Define the traction boundary conditions
-    s_u_x = np.zeros((ns_u,1)).astype(np.float32)
-    s_u_y = np.zeros((ns_u,1)).astype(np.float32)
-    s_b_x = np.zeros((ns_u,1)).astype(np.float32)
-    s_b_y = np.zeros((ns_u,1)).astype(np.float32)
-    s_l_x = np.zeros((ns_l,1)).astype(np.float32)
-    s_l_y = np.zeros((ns_l,1)).astype(np.float32)
+    s_u_x = np.zeros((ns_u,1)).astype(dtype)
+    s_u_y = np.zeros((ns_u,1)).astype(dtype)
+    s_b_x = np.zeros((ns_u,1)).astype(dtype)
+    s_b_y = np.zeros((ns_u,1)).astype(dtype)
+    s_l_x = np.zeros((ns_l,1)).astype(dtype)
+    s_l_y = np.zeros((ns_l,1)).astype(dtype)
     s_r_x = np.cos(xy_r[..., 1, np.newaxis]/2*math.pi)
-    s_r_y = np.zeros((ns_l,1)).astype(np.float32)
+    s_r_y = np.zeros((ns_l,1)).astype(dtype)
 
     ### Create the PINN boundary condition list
     y_train = [ s_u_x, s_u_y, s_b_x, s_b_y, s_l_x, s_l_y, s_r_x, s_r_y ]
@@ -96,7 +121,13 @@ def Input_Info():
     n_input = 2
     n_output = 1
     layer = [np.array([ 20, 20, 20 ]), np.array([ 20, 20, 20 ])]
-    NN_info = [n_input, n_output, layer]
+    acti_fun = 'tanh'
+
+    ### Override the FNN settings, if required
+    if settings is not None:
+        layer = [ np.full(settings.get('depth', len(l)), settings.get('width', l[0])) for l in layer ]
+        acti_fun = settings.get('acti_fun', acti_fun)
+    NN_info = [n_input, n_output, layer, acti_fun]
     
     print('*************************************************')
     print('Problem Info.')
@@ -12,7 +12,8 @@ def Energy_Loss(y_p, y, dx):
 
       [y_p]       [list]                  : Outputs from the PINN;
       [y]         [list]                  : The ground truth data;
-      [dx]        [float]                 : Sample points interval for x-axis;
+      [dx]        [float or list]         : Sample points interval for x-axis, or the quadrature weights of the domain
+                                            points and of the right boundary points (see Quadrature.py);
       [dy]        [float                  : Sample points interval for y-axis;
       [l1]        [Keras tensor]          : The internal potential energy;
       [l2]        [Keras tensor]          : The potential energy of the external traction force;
@@ -20,10 +21,17 @@ def Energy_Loss(y_p, y, dx):
 
       ====================================================================================================================
       """
-    ### Internal potential energy
-    l1 = 0.5 * dx * dx * tf.reduce_sum((y_p[0] * y_p[3])+(y_p[1] * y_p[4])+(y_p[2] * y_p[5]))
-    ### Potential energy of the external force
-    l2 = tf.reduce_sum(y_p[6] * y[6]) * dx
+    if isinstance(dx, (list, tuple)):
+        ### Internal potential energy and potential energy of the external force, as the weighted sums of the
+        ### quadrature
+        w, w_r = dx
+        l1 = 0.5 * tf.reduce_sum(w * ((y_p[0] * y_p[3])+(y_p[1] * y_p[4])+(y_p[2] * y_p[5])))
+        l2 = tf.reduce_sum(w_r * y_p[6] * y[6])
+    else:
+        ### Internal potential energy
+        l1 = 0.5 * dx * dx * tf.reduce_sum((y_p[0] * y_p[3])+(y_p[1] * y_p[4])+(y_p[2] * y_p[5]))
+        ### Potential energy of the external force
+        l2 = tf.reduce_sum(y_p[6] * y[6]) * dx
 
     ### Final loss
     loss = l1 - l2
@@ -0,0 +1,226 @@
+import numpy as np
+import tensorflow as tf
+from lib.Pre.L_BFGS_B import L_BFGS_B
+
+class Newton_CG(L_BFGS_B):
+    """
+    ====================================================================================================================
+
+    This is the class for the Hessian-free (truncated) Newton-CG optimiser with a trust region. It shares the physics-
+    informed loss with the L-BFGS-B optimiser (see L_BFGS_B.py), and applies to the energy-based loss as well, which is
+    not a sum of squares. The Newton step is solved inexactly by the conjugate gradient method of Steihaug within the
+    trust region, where the Hessian is never formed: each CG step takes one exact Hessian-vector product, obtained by
+    pushing a tangent through the gradients of the loss (forward-over-reverse automatic differentiation) in one
+    compiled TensorFlow function. The fit() function returns the result in the same form as the L-BFGS-B optimiser.
+    This class include 4 functions, including:
+        1. __init__()         : Initialise the parameters for the Newton-CG optimiser;
+        2. hvp()              : Obtain the Hessian-vector product of the physics-informed loss;
+        3. steihaug()         : Solve the trust-region subproblem by the truncated conjugate gradient method;
+        4. fit()              : Execute training process.
+
+    ====================================================================================================================
+    """
+
+    def __init__(self, pinn, x_train, y_train, dx, maxit=1000, maxcg=50, radius=1., max_radius=1e3, eta=0.15,
+                 factr=10, pgtol=1e-10, maxfun=40000):
+        """
+        ================================================================================================================
+
+        This function is to initialise the parameters used in the Newton-CG optimiser.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [pinn]      [Keras model]           : The Physics-informed neural network;
+        [x_train]   [list]                  : PINN input list, contains all the coordinates information;
+        [y_train]   [list]                  : PINN boundary condition list, contains the traction boundary condition;
+        [dx]        [float]                 : Sample points interval;
+        [maxit]     [int]                   : Maximum number of Newton iterations for training;
+        [maxcg]     [int]                   : Maximum number of CG steps (Hessian-vector products) per iteration;
+        [radius]    [float]                 : The initial radius of the trust region;
+        [max_radius][float]                 : The maximum radius of the trust region;
+        [eta]       [float]                 : Accept the step when the actual reduction is above eta times the predicted
+                                              one;
+        [factr]     [int]                   : Stop when the relative reduction of the loss is below factr * eps;
+        [pgtol]     [float]                 : Stop when the maximum absolute gradient is below pgtol;
+        [maxfun]    [int]                   : Maximum number of function evaluations for training;
+        [nhev]      [int]                   : Number of Hessian-vector products.
+
+        ================================================================================================================
+        """
+
+        super().__init__(pinn, x_train, y_train, dx, factr=factr, pgtol=pgtol, maxfun=maxfun)
+        self.maxit = maxit
+        self.maxcg = maxcg
+        self.radius = radius
+        self.max_radius = max_radius
+        self.eta = eta
+        self.nhev = 0
+
+    @tf.function
+    def hvp(self, v):
+        """
+        ================================================================================================================
+
+        This function is to obtain the exact Hessian-vector product of the physics-informed loss with respect to the
+        weights and biases, at the weights and biases currently held by the PINN.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [v]         [Keras tensor]          : The flat vector (float64);
+        [tangents]  [list]                  : The vector split and reshaped as the trainable variables;
+        [grads]     [Keras tensor]          : The gradients of the physics-informed loss, recorded by the forward
+                                              accumulator;
+        [Hv]        [Keras tensor]          : The flat Hessian-vector product (float64).
+
+        ================================================================================================================
+        """
+
+        tangents = [ tf.reshape(tf.cast(t, w.dtype), w.shape) for w, t in zip(self.variables, tf.split(v, self.sizes)) ]
+        with tf.autodiff.ForwardAccumulator(self.variables, tangents) as acc:
+            _, grads, _, _ = self.loss_grad(self.x_train, self.y_train)
+        Hv = acc.jvp(grads, unconnected_gradients=tf.UnconnectedGradients.ZERO)
+        Hv = tf.concat([ tf.reshape(h, [-1]) for h in Hv ], axis=0)
+
+        return tf.cast(Hv, tf.float64)
+
+    def steihaug(self, g, radius):
+        """
+        ================================================================================================================
+
+        This function is to solve the trust-region subproblem, min g.p + 0.5 p.H p subject to ||p|| <= radius, by the
+        truncated conjugate gradient method of Steihaug. The CG steps stop at the boundary of the trust region, along a
+        direction of negative curvature, or when the residual is below min(0.5, sqrt(||g||)) ||g||.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [g]         [ndarray]               : The current flat gradients;
+        [radius]    [float]                 : The radius of the trust region;
+        [p]         [ndarray]               : The step of the weights and biases;
+        [Hp]        [ndarray]               : The Hessian-vector product of the step, for the predicted reduction;
+        [r]         [ndarray]               : The residual of the Newton equations, r = g + H p;
+        [d]         [ndarray]               : The conjugate direction;
+        [boundary]  [bool]                  : Whether the step reaches the boundary of the trust region.
+
+        ================================================================================================================
+        """
+
+        def to_boundary(p, d):
+            ### The positive step length tau with ||p + tau d|| = radius
+            a, b, c = np.dot(d, d), 2. * np.dot(p, d), np.dot(p, p) - radius ** 2
+            return (-b + np.sqrt(b * b - 4. * a * c)) / (2. * a)
+
+        p = np.zeros_like(g)
+        Hp = np.zeros_like(g)
+        r = g.copy()
+        d = -r
+        tol = min(0.5, np.sqrt(np.linalg.norm(g))) * np.linalg.norm(g)
+        for _ in range(self.maxcg):
+            Hd = self.hvp(tf.constant(d)).numpy()
+            self.nhev = self.nhev + 1
+            dHd = np.dot(d, Hd)
+
+            ### Go to the boundary along a direction of negative curvature
+            if dHd <= 0.:
+                tau = to_boundary(p, d)
+                return p + tau * d, Hp + tau * Hd, True
+
+            ### Stop at the boundary if the CG step leaves the trust region
+            alpha = np.dot(r, r) / dHd
+            if np.linalg.norm(p + alpha * d) >= radius:
+                tau = to_boundary(p, d)
+                return p + tau * d, Hp + tau * Hd, True
+
+            p, Hp = p + alpha * d, Hp + alpha * Hd
+            r_new = r + alpha * Hd
+            if np.linalg.norm(r_new) < tol:
+                break
+            d = -r_new + np.dot(r_new, r_new) / np.dot(r, r) * d
+            r = r_new
+
+        return p, Hp, False
+
+    def fit(self):
+        """
+        ================================================================================================================
+
+        This function is to execute training process.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [x]         [ndarray]               : The current flat weights and biases;
+        [f]         [float]                 : The current physics-informed loss;
+        [g]         [ndarray]               : The current flat gradients;
+        [radius]    [float]                 : The radius of the trust region;
+        [p]         [ndarray]               : The step of the weights and biases;
+        [predicted] [float]                 : The reduction of the loss predicted by the quadratic model;
+        [rho]       [float]                 : The ratio between the actual and the predicted reductions of the loss;
+        [nit]       [int]                   : Number of Newton iterations;
+        [warnflag]  [int]                   : -1 while running; 0 if converged; 1 if maxit or maxfun is reached; 2 if
+                                              the trust region collapses;
+        [result]    [tuple]                 : The result in the same form as the one returned by the SciPy optimiser,
+                                              (weights and biases, final loss, {'funcalls', 'nit', 'nhev', 'warnflag'});
+        [his_l1]    [ndarray]               : History values of the l1 loss term;
+        [his_l2]    [ndarray]               : History values of the l2 loss term.
+
+        ================================================================================================================
+        """
+
+        print('Optimizer: Newton-CG (Hessian-free, trust region)')
+        print('Initializing ...\n')
+
+        ### Get initial weights and biases, and evaluate the loss and the gradients
+        x = np.concatenate([ v.numpy().flatten() for v in self.variables ]).astype('float64')
+        f, g = self.pi_loss(x)
+        eps = np.finfo(np.float64).eps
+        radius = self.radius
+        nit = 0
+        warnflag = -1
+
+        while warnflag < 0:
+
+            ### Solve the trust-region subproblem at the current weights and biases (held by the PINN)
+            p, Hp, boundary = self.steihaug(g, radius)
+            predicted = -(np.dot(g, p) + 0.5 * np.dot(p, Hp))
+
+            ### Evaluate the trial weights and biases, and compare the actual reduction with the predicted one
+            f_new, g_new = self.pi_loss(x + p)
+            rho = (f - f_new) / predicted if predicted > 0. and np.isfinite(f_new) else -1.
+
+            ### Update the radius of the trust region
+            if rho < 0.25:
+                radius = 0.25 * radius
+            elif rho > 0.75 and boundary:
+                radius = min(2. * radius, self.max_radius)
+
+            if rho > self.eta:
+                ### Accept the step and apply the convergence tests
+                f_old = f
+                x, f, g = x + p, f_new, g_new
+                nit = nit + 1
+                if (f_old - f) / max(abs(f_old), abs(f), 1.) <= self.factr * eps:
+                    warnflag = 0
+                elif np.max(np.abs(g)) <= self.pgtol:
+                    warnflag = 0
+            else:
+                ### Reject the step and move the PINN back to the current weights and biases
+                self.set_weights(x)
+
+            if warnflag < 0 and (nit >= self.maxit or self.iter >= self.maxfun):
+                warnflag = 1
+            elif warnflag < 0 and radius < 1e-12:
+                warnflag = 2
+
+        ### Set the accepted weights and biases back to the neural network
+        self.set_weights(x)
+
+        result = (x, f, {'funcalls': int(self.iter), 'nit': nit, 'nhev': self.nhev, 'warnflag': warnflag})
+
+        return result, self.history()
@@ -2,8 +2,9 @@ import tensorflow as tf
 from lib.Pre.Material import Material
 from lib.Pre.Dif_op_x import Dif_x
 from lib.Pre.Dif_op_y import Dif_y
+from lib.Pre.Dif_plan import Dif_plan, Dif_terms
 
-def PINN(net_u, net_v, E, mu):
+def PINN(net_u, net_v, E, mu, taylor=False):
     """
     ====================================================================================================================
 
@@ -15,9 +16,6 @@ def PINN(net_u, net_v, E, mu):
 
     [net_u]     [keras model]           : The trained FNN for displacement u;
     [xy]        [Array of float32]      : Coordinates of all the sample points;
-    [xy_u]      [Array of float32]      : Coordinates of the sample points on the upper boundary of the plate;
-    [xy_b]      [Array of float32]      : Coordinates of the sample points on the bottom boundary of the plate;
-    [xy_l]      [Array of float32]      : Coordinates of the sample points on the left boundary of the plate;
     [xy_r]      [Array of float32]      : Coordinates of the sample points on the right boundary of the plate;
     [u_r]       [Keras tensor]          : Displacement at the right tip of the rod;
     [e1]        [Keras tensor]          : Normal strain for x direction;
@@ -29,36 +27,39 @@ def PINN(net_u, net_v, E, mu):
     [Gex]       [Keras tensor]          : Residual from the equilibrium equation for x direction;
     [Gey]       [Keras tensor]          : Residual from the equilibrium equation for y direction;
     [sigma_r]   [Keras tensor]          : Stress at the right tip of the rod;
+    [plan]      [dict]                  : The highest derivative order required by each point set;
     [E]         [float]                 : Young's module;
-    [mu]        [float]                 : Poisson ratio.
+    [mu]        [float]                 : Poisson ratio;
+    [taylor]    [bool]                  : Whether to obtain the differential terms by the Taylor-mode forward sweep.
 
     ====================================================================================================================
     """
 
     ### declare PINN's inputs
+    ### (only the domain and the right boundary contribute to the energy-based loss)
     xy = tf.keras.layers.Input(shape=(2,))
-    xy_u = tf.keras.layers.Input(shape=(2,))
-    xy_b = tf.keras.layers.Input(shape=(2,))
-    xy_l = tf.keras.layers.Input(shape=(2,))
     xy_r = tf.keras.layers.Input(shape=(2,))
     
-    ### initialize the differential operators
-    dif_x = Dif_x(net_u)
-    dif_y = Dif_y(net_v)
+    ### plan the derivative orders required by each point set from the Material outputs it contributes
+    plan = Dif_plan({'xy': ['e1', 'e2', 'e12', 's1', 's2', 's12']})
+
+    ### initialize the differential operators, one for each of the planned orders
+    dif_x = { o: Dif_x(net_u, order=o, taylor=taylor) for o in set(plan.values()) }
+    dif_y = { o: Dif_y(net_v, order=o, taylor=taylor) for o in set(plan.values()) }
 
     ###obtain the displacment at the right tip of the rod
     u_r = net_u(xy_r)*xy_r[...,0,tf.newaxis]
     
     ### obtain partial derivatives of u with respect to x and y
-    U_x, U_y, U_xx, U_xy, U_yy = dif_x(xy)
-    V_x, V_y, V_xx, V_xy, V_yy = dif_y(xy)
+    U_x, U_y, U_xx, U_xy, U_yy = Dif_terms(dif_x[plan['xy']](xy), 5)
+    V_x, V_y, V_xx, V_xy, V_yy = Dif_terms(dif_y[plan['xy']](xy), 5)
        
     ### Obtain the residuals from the governing equation and stress boundary conditions
     p = 'plain_stress'
     e1, e2, e12, s1, s2, s12, _, _ = Material(U_x, U_y, V_x, V_y, U_xx, U_xy, U_yy, V_xx, V_xy, V_yy, E, mu, p)
 
     ### build up the PINN
-    pinn = tf.keras.models.Model(inputs = [xy, xy_u, xy_b, xy_l, xy_r], \
+    pinn = tf.keras.models.Model(inputs = [xy, xy_r], \
             outputs = [e1, e2, e12, s1, s2, s12, u_r])
 
     return pinn
\ No newline at end of file
@@ -2,8 +2,48 @@ from lib.Pre.Input_Info import Input_Info
 from lib.Pre.FNN import FNN
 from lib.Pre.PINN import PINN
 from lib.Pre.L_BFGS_B import L_BFGS_B
+from lib.Pre.L_BFGS_TF import L_BFGS_TF
+from lib.Pre.Adam import Adam
+from lib.Pre.Schedule import Schedule
+from lib.Pre.Parallel import Parallel
+from lib.Pre.L_BFGS_PLS import L_BFGS_PLS
+from lib.Pre.Newton_CG import Newton_CG
+from lib.Pre.Telemetry import CSV_Sink
+from lib.Pre.Checkpoint import Checkpoint
+from lib.Pre.Sampler import Sampler
 
-def Pre_Process():
+def Build(NN_info, E, mu):
+    """
+    ====================================================================================================================
+
+    Build function is to build up the FNNs and the PINN. It is kept at the module level, so that the worker processes
+    of the data-parallel optimiser (see Parallel.py) can build up their own copies of the PINN.
+
+    --------------------------------------------------------------------------------------------------------------------
+
+    Name        Type                    Info.
+
+    [NN_info]   [list]                  : Neural Network information list, contains the settings for the FNN;
+    [E]         [float]                 : Young's module;
+    [mu]        [float]                 : Poisson ratio;
+    [net_u]     [Keras model]           : The built FNN for displacement u;
+    [net_v]     [Keras model]           : The built FNN for displacement v;
+    [pinn]      [Keras model]           : The built PINN.
+
+    ====================================================================================================================
+    """
+
+    ### Initialize the Feedforward Neural Networks
+    net_u = FNN(n_input = NN_info[0], n_output = NN_info[1], layers = NN_info[2][0], acti_fun = NN_info[3])
+    net_v = FNN(n_input = NN_info[0], n_output = NN_info[1], layers = NN_info[2][1], acti_fun = NN_info[3])
+
+    ### Initialize the Physics-informed Neural Network
+    pinn = PINN(net_u, net_v, E, mu)
+
+    return net_u, net_v, pinn
+
+def Pre_Process(precision='float32', checkpoint_path=None, settings=None, sampler=None,
+                quadrature=None):
     """
     ====================================================================================================================
 
@@ -11,12 +51,23 @@ def Pre_Process():
         1. Load the problem information;
         2. Build up the FNN;
         3. Build up the PINN;
-        4. Initialize the L-BFGS-B optimiser.
+        4. Initialize the optimiser schedule.
 
     --------------------------------------------------------------------------------------------------------------------
 
     Name        Type                    Info.
 
+    [precision] [str]                   : The precision policy (see Precision.py);
+    [checkpoint_path] [str]             : The path of the checkpoint file (None to train without checkpoints, as in the
+                                          plain runs of Main.py and the runs of Multi_Start.py), with which the
+                                          refinement is done by L_BFGS_PLS to checkpoint its correction pairs;
+    [settings]  [dict]                  : The settings of the FNNs and the optimisers that override the defaults,
+                                          {'width', 'depth', 'acti_fun', 'm', 'maxls', 'lr'} (e.g., in the trials of
+                                          Hyperband.py);
+    [sampler]   [Sampler]               : The sampler of the point sets (None for the uniform grid, see Sampler.py);
+    [quadrature][tuple]                 : Number of cells along each axis and number of Gauss-Legendre points per
+                                          axis in each cell, (n_cells, order), for the energy-based loss (None for the
+                                          sample points of the sampler or the grid, see Quadrature.py);
     [ns]        [int]                   : Total number of sample points;
     [ns_u]      [int]                   : Number of sample points on top boundary of the beam;
     [ns_l]      [int]                   : Number of sample points on left boundary of the beam;
@@ -29,22 +80,68 @@ def Pre_Process():
     [net_u]     [Keras model]           : The built FNN for displacement u;
     [net_v]     [Keras model]           : The built FNN for displacement v;
     [pinn]      [Keras model]           : The built PINN;
-    [l_bfgs_b]  [class]                 : The initialised L-BFGS-B optimiser.
+    [opt]       [class]                 : The initialised optimiser schedule.
 
     ====================================================================================================================
     """
     
     ### Input information
-    ns, ns_u, ns_l, x_train, y_train, E, mu, dx, NN_info = Input_Info()
+    ns, ns_u, ns_l, x_train, y_train, E, mu, dx, NN_info = Input_Info(precision, settings, sampler, quadrature)
     
-    ### Initialize the Feedforward Neural Networks
-    net_u = FNN(n_input = NN_info[0], n_output = NN_info[1], layers = NN_info[2][0])
-    net_v = FNN(n_input = NN_info[0], n_output = NN_info[1], layers = NN_info[2][1])
+    ### Initialize the Feedforward Neural Networks and the Physics-informed Neural Network
+    net_u, net_v, pinn = Build(NN_info, E, mu)
     
-    ### Initialize the Physics-informed Neural Network
-    pinn = PINN(net_u, net_v, E, mu)
-    
-    ### Initialize the L-BFGS-B optimizer
-    l_bfgs_b = L_BFGS_B(pinn, x_train, y_train, dx)
+    ### The settings of the optimisers that override the defaults, if any
+    settings = settings if settings is not None else {}
+    lbfgs = { k: settings[k] for k in ('m', 'maxls') if k in settings }
+    adam = { k: settings[k] for k in ('lr',) if k in settings }
+
+    ### Initialize the optimizer schedule: the compiled Adam steps to leave the random initialisation cheaply,
+    ### followed by the L-BFGS-B optimizer for refinement
+    ### If a checkpoint file is given, the training is checkpointed every 10 minutes and when SIGTERM or SIGINT is
+    ### received, and is resumed from the latest checkpoint by 'python Main.py resume'
+    ### The refinement is then done by the L-BFGS optimizer with the parallel line search, whose correction pairs are
+    ### saved in the checkpoints, so that the resumed refinement keeps its curvature information (the SciPy L-BFGS-B
+    ### optimizer cannot be warm-started from them)
+    if checkpoint_path is not None:
+        refine = L_BFGS_PLS(pinn, x_train, y_train, dx, Build, (NN_info, E, mu), n_candidates=4, **lbfgs)
+    else:
+        refine = L_BFGS_B(pinn, x_train, y_train, dx, **lbfgs)
+    opt = Schedule([Adam(pinn, x_train, y_train, dx, epochs=1000, **adam), refine],
+                   checkpoint=Checkpoint(checkpoint_path, interval=600.) if checkpoint_path is not None else None)
+
+    ### Or, refine with the in-graph L-BFGS optimizer, which runs the whole training inside TensorFlow
+    # opt = Schedule([Adam(pinn, x_train, y_train, dx, epochs=1000), L_BFGS_TF(pinn, x_train, y_train, dx)])
     
-    return net_u, net_v, pinn, l_bfgs_b
\ No newline at end of file
+    ### Or, train by the mini-batches drawn from all the point sets, for the point clouds too large for the full batch
+    # opt = Schedule([Adam(pinn, x_train, y_train, dx, epochs=10000, batch_size=512,
+    #     y_set=[None, None, None, None, None, None, 1, None])])
+
+    ### Or, evaluate the loss and the gradients of the L-BFGS-B optimizer on the shards of the domain points in parallel
+    ### worker processes
+    # opt = Schedule([Parallel(pinn, x_train, y_train, dx, Build, (NN_info, E, mu), n_workers=8)])
+
+    ### Or, refine with the L-BFGS optimizer whose line search evaluates several step lengths at once on the replicas
+    ### of the PINN
+    # opt = Schedule([Adam(pinn, x_train, y_train, dx, epochs=1000),
+    #     L_BFGS_PLS(pinn, x_train, y_train, dx, Build, (NN_info, E, mu), n_candidates=4)])
+
+    ### Or, refine with the Hessian-free Newton-CG optimizer, which also applies to the energy-based loss
+    # opt = Schedule([Adam(pinn, x_train, y_train, dx, epochs=1000), Newton_CG(pinn, x_train, y_train, dx, maxit=500)])
+
+    ### Or, also write the history of the L-BFGS-B optimizer (iteration, loss terms, norm of the gradients and wall
+    ### time) to a CSV file by a background thread, e.g., to follow a long training
+    # opt = Schedule([L_BFGS_B(pinn, x_train, y_train, dx, sinks=[CSV_Sink('History.csv')])])
+
+    ### Or, draw the point sets from the scrambled Sobol' sequence instead of the grid (Pre_Process(sampler=
+    ### Sampler('sobol', seed=0))), which integrates the energy more accurately with the same number of points, and
+    ### regenerate the domain points of the Adam optimizer every 500 steps
+    # opt = Schedule([Adam(pinn, x_train, y_train, dx, epochs=1000, resampler=Sampler('sobol', seed=0, every=500)),
+    #     L_BFGS_B(pinn, x_train, y_train, dx)])
+
+    ### Or, place the sample points at the Gauss-Legendre points of 8 x 8 cells with 4 x 4 points each (Pre_Process(
+    ### quadrature=(8, 4))), 1024 domain points instead of the 2601 of the grid, whose quadrature weights integrate the
+    ### energy exactly for the polynomials up to the degree 7 along each axis on each cell
+    # opt = Schedule([L_BFGS_B(pinn, x_train, y_train, dx)])
+
+    return net_u, net_v, pinn, opt
\ No newline at end of file
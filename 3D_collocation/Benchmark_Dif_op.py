@@ -0,0 +1,172 @@
+import tensorflow as tf
+tf.compat.v1.logging.set_verbosity(tf.compat.v1.logging.ERROR)
+import os
+os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
+import time
+import numpy as np
+import scipy.io
+from lib.Pre.FNN import FNN
+from lib.Pre.Dif_op_x import Dif_x
+from lib.Pre.Dif_op_y import Dif_y
+from lib.Pre.Dif_op_z import Dif_z
+from lib.Pre.Dif_op_xyz import Dif_xyz
+"""
+========================================================================================================================
+
+    This code is to benchmark the fused differential operator (Dif_xyz) and its Taylor-mode forward sweep (Dif_xyz with
+    taylor=True) against the three separate differential operators (Dif_x, Dif_y and Dif_z) on the 9261 sample points
+    stored in 'Coord.mat'.
+
+    Two cases are timed for each operator:
+        1. Derivatives      : Evaluate all the first- and second-order derivatives of u, v and w;
+        2. Derivatives+grad : Evaluate the derivatives and the gradients of their squared sum with respect to the
+                              weights and biases, which is what each L-BFGS-B iteration does.
+
+    The maximum absolute differences from the separate operators are also printed to check the fused operators, and,
+    on a GPU, the peak memory of each operator in both cases.
+
+    Run this code in the '3D_collocation' folder:
+        python Benchmark_Dif_op.py
+
+========================================================================================================================
+"""
+
+def Timing(fun, x, n_rep):
+    """
+    ====================================================================================================================
+
+    Timing function is to return the average wall-clock time of a compiled function (the tracing call is excluded).
+
+    --------------------------------------------------------------------------------------------------------------------
+
+    Name        Type                    Info.
+
+    [fun]       [tf.function]           : The function to be timed;
+    [x]         [Tensor]                : The coordinate array;
+    [n_rep]     [int]                   : Number of the repeated calls;
+    [t]         [float]                 : Average wall-clock time per call.
+
+    ====================================================================================================================
+    """
+
+    fun(x)
+    time_start = time.time()
+    for i in range(n_rep):
+        out = fun(x)
+    [o.numpy() for o in tf.nest.flatten(out)]
+    t = (time.time() - time_start) / n_rep
+
+    return t
+
+def Peak_memory(fun, x):
+    """
+    ====================================================================================================================
+
+    Peak_memory function is to return the peak memory allocated on the first GPU by one call of a compiled function
+    (the tracing call is excluded).
+
+    --------------------------------------------------------------------------------------------------------------------
+
+    Name        Type                    Info.
+
+    [fun]       [tf.function]           : The function to be measured;
+    [x]         [Tensor]                : The coordinate array;
+    [peak]      [float]                 : The peak memory in MB (None without a GPU, as TensorFlow does not track the
+                                          memory allocated on the CPU).
+
+    ====================================================================================================================
+    """
+
+    if not tf.config.list_logical_devices('GPU'):
+        return None
+
+    fun(x)
+    tf.config.experimental.reset_memory_stats('GPU:0')
+    [o.numpy() for o in tf.nest.flatten(fun(x))]
+    peak = tf.config.experimental.get_memory_info('GPU:0')['peak'] / 2. ** 20
+
+    return peak
+
+if __name__ == '__main__':
+
+    ### Load the sample points
+    C = scipy.io.loadmat('Coord.mat')
+    x = tf.constant(C['xy'], dtype=tf.float32)
+    n_rep = 20
+
+    ### Initialize the FNNs with the same settings as 'Input_Info'
+    net_u = FNN(n_input=3, n_output=1, layers=np.array([20, 20, 20, 20]))
+    net_v = FNN(n_input=3, n_output=1, layers=np.array([20, 20, 20, 20]))
+    net_w = FNN(n_input=3, n_output=1, layers=np.array([20, 20, 20, 20]))
+    weights = net_u.trainable_variables + net_v.trainable_variables + net_w.trainable_variables
+
+    ### Initialize the differential operators
+    dif_x = Dif_x(net_u)
+    dif_y = Dif_y(net_v)
+    dif_z = Dif_z(net_w)
+    dif = Dif_xyz(net_u, net_v, net_w)
+    dif_t = Dif_xyz(net_u, net_v, net_w, taylor=True)
+
+    @tf.function
+    def Separate(x):
+        return dif_x(x) + dif_y(x) + dif_z(x)
+
+    @tf.function
+    def Fused(x):
+        d = dif(x)
+        return d[0:3] + d[9:15] + d[3:6] + d[15:21] + d[6:9] + d[21:27]
+
+    @tf.function
+    def Taylor(x):
+        d = dif_t(x)
+        return d[0:3] + d[9:15] + d[3:6] + d[15:21] + d[6:9] + d[21:27]
+
+    @tf.function
+    def Separate_grad(x):
+        with tf.GradientTape() as g:
+            loss = tf.add_n([tf.reduce_sum(tf.square(d)) for d in Separate(x)])
+        return g.gradient(loss, weights)
+
+    @tf.function
+    def Fused_grad(x):
+        with tf.GradientTape() as g:
+            loss = tf.add_n([tf.reduce_sum(tf.square(d)) for d in Fused(x)])
+        return g.gradient(loss, weights)
+
+    @tf.function
+    def Taylor_grad(x):
+        with tf.GradientTape() as g:
+            loss = tf.add_n([tf.reduce_sum(tf.square(d)) for d in Taylor(x)])
+        return g.gradient(loss, weights)
+
+    ### Check the consistency between the separate and the fused operators
+    err = max([np.max(np.abs(a.numpy() - b.numpy())) for a, b in zip(Separate(x), Fused(x))])
+    err_grad = max([np.max(np.abs(a.numpy() - b.numpy())) for a, b in zip(Separate_grad(x), Fused_grad(x))])
+    err_t = max([np.max(np.abs(a.numpy() - b.numpy())) for a, b in zip(Separate(x), Taylor(x))])
+    err_t_grad = max([np.max(np.abs(a.numpy() - b.numpy())) for a, b in zip(Separate_grad(x), Taylor_grad(x))])
+
+    ### Time the three operators
+    t_sep = Timing(Separate, x, n_rep)
+    t_fus = Timing(Fused, x, n_rep)
+    t_sep_grad = Timing(Separate_grad, x, n_rep)
+    t_fus_grad = Timing(Fused_grad, x, n_rep)
+    t_tay = Timing(Taylor, x, n_rep)
+    t_tay_grad = Timing(Taylor_grad, x, n_rep)
+
+    print('*************************************************')
+    print('Differential operator benchmark,', x.shape[0], 'sample points')
+    print('*************************************************\n')
+    print('Max. difference of derivatives is', err, '(Dif_xyz),', err_t, '(Taylor)')
+    print('Max. difference of gradients is', err_grad, '(Dif_xyz),', err_t_grad, '(Taylor)\n')
+    print('%-20s %12s %12s %12s %10s %10s' % ('Case', 'Dif_x/y/z', 'Dif_xyz', 'Taylor', 'Speed-up', 'Speed-up'))
+    print('%-20s %10.4f s %10.4f s %10.4f s %9.2fx %9.2fx' % ('Derivatives', t_sep, t_fus, t_tay,
+        t_sep / t_fus, t_sep / t_tay))
+    print('%-20s %10.4f s %10.4f s %10.4f s %9.2fx %9.2fx' % ('Derivatives+grad', t_sep_grad, t_fus_grad, t_tay_grad,
+        t_sep_grad / t_fus_grad, t_sep_grad / t_tay_grad))
+
+    ### Measure the peak memory of the three operators, on a GPU only
+    mem = [ Peak_memory(f, x) for f in (Separate, Fused, Taylor, Separate_grad, Fused_grad, Taylor_grad) ]
+    mem = [ '%9.1f MB' % m if m is not None else '%12s' % 'n/a' for m in mem ]
+    print('\n%-20s %s %s %s' % ('Peak memory', *mem[:3]))
+    print('%-20s %s %s %s' % ('Peak memory+grad', *mem[3:]))
+    print('\n*************************************************\n')
@@ -0,0 +1,92 @@
+import tensorflow as tf
+tf.compat.v1.logging.set_verbosity(tf.compat.v1.logging.ERROR)
+import os
+os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
+import numpy as np
+from lib.Pre.Input_Info import Input_Info
+from lib.Pre.Stack import Stack
+from lib.Pre.L_BFGS_B import L_BFGS_B
+from lib.Pre.Weighting import Weighting
+from lib.Pre_Process import Build
+"""
+========================================================================================================================
+
+    This code is to benchmark the adaptive weighting of the loss terms (see lib/Pre/Weighting.py) on the 3D stretching
+    cube problem, whose 18 loss terms differ in scale by orders of magnitude, by the number of evaluations taken by the
+    L-BFGS-B optimiser to reach a target loss from the same random seed.
+
+    Four runs are made one after another:
+        1. None        : The unit weights of the original code, whose best loss is taken as the target;
+        2. grad_norm   : The gradient-norm balancing;
+        3. ntk         : The NTK-trace balancing;
+        4. attention   : The learnable soft-attention weights.
+
+    The losses are compared unweighted. For each run, the number of evaluations, the final and the best losses, and
+    the number of evaluations and the time to reach the target are printed. The evolution of the weights of each
+    scheme is written to 'Weights_<scheme>.csv'.
+
+    Run this code in the '3D_collocation' folder:
+        python Benchmark_Weighting.py
+
+========================================================================================================================
+"""
+
+def Run(scheme, maxfun, every):
+    """
+    ====================================================================================================================
+
+    Run function is to train the stacked PINN (as used for training in 'Pre_Process') with one weighting scheme, and
+    return the history of the evaluations.
+
+    --------------------------------------------------------------------------------------------------------------------
+
+    Name        Type                    Info.
+
+    [scheme]    [str]                   : The weighting scheme (None for the unit weights);
+    [maxfun]    [int]                   : Maximum number of evaluations;
+    [every]     [int]                   : Number of evaluations between two updates of the weights;
+    [t]         [ndarray]               : The wall-clock time of each evaluation from the start of the training;
+    [f]         [ndarray]               : The unweighted loss of each evaluation.
+
+    ====================================================================================================================
+    """
+
+    ### Build up the problem and the PINN from the same random seed
+    tf.keras.backend.clear_session()
+    tf.random.set_seed(0)
+    ns, x_train, y_train, E, mu, dx, NN_info = Input_Info()
+    x_train, sizes = Stack(x_train, [[0], [1, 2, 3, 4, 5, 6]])
+    pinn = Build(NN_info, E, mu, sizes[1])[-1]
+
+    ### Train the PINN, and take the unweighted loss terms and the wall-clock time from the history
+    weighting = None if scheme is None else Weighting(scheme, every=every, path='Weights_%s.csv' % scheme)
+    opt = L_BFGS_B(pinn, x_train, y_train, dx, maxfun=maxfun, weighting=weighting)
+    opt.fit()
+    n = opt.telemetry.n
+    t = opt.telemetry.buffer[:n, 4]
+    f = opt.telemetry.buffer[:n, 1] + opt.telemetry.buffer[:n, 2]
+
+    return t, f
+
+if __name__ == '__main__':
+
+    maxfun = 5000
+    every = 500
+    schemes = [None, 'grad_norm', 'ntk', 'attention']
+    runs = { s: Run(s, maxfun, every) for s in schemes }
+
+    ### The target is the best loss reached with the unit weights
+    target = np.min(runs[None][1])
+
+    print('*************************************************')
+    print('Weighting benchmark, target loss %.6g' % target)
+    print('*************************************************\n')
+    print('%-12s %12s %14s %14s %16s %14s' % ('Scheme', 'Evaluations', 'Final loss', 'Best loss', 'Evals to target',
+        'Time to target'))
+    for s in schemes:
+        t, f = runs[s]
+        hit = np.nonzero(f <= target)[0]
+        n_target = '%16d' % (hit[0] + 1) if len(hit) > 0 else '%16s' % 'not reached'
+        t_target = '%12.2f s' % t[hit[0]] if len(hit) > 0 else '%14s' % 'not reached'
+        print('%-12s %12d %14.6g %14.6g %s %s' % (str(s), len(f), f[-1], np.min(f), n_target, t_target))
+    print('\n*************************************************\n')
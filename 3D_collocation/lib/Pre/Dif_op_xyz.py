@@ -0,0 +1,148 @@
+import tensorflow as tf
+from lib.Pre.Taylor import Taylor, Taylor_terms
+
+class Dif_xyz(tf.keras.layers.Layer):
+    """
+    ====================================================================================================================
+
+    This is the class for calculating the differential terms of all the three displacement fields (u, v and w) with
+    respect to the FNN's input in one single pass. Instead of running a nested GradientTape pair for each FNN, we adopt
+    the forward-over-reverse automatic differentiation: the first-order derivatives are obtained by one GradientTape
+    sweep and the Hessian rows are pushed forward by the ForwardAccumulator provided by the TensorFlow library. The
+    coordinate array is tiled three times, so that each tile carries one of the unit tangents (x, y and z) and all the
+    Hessian rows are obtained in one forward sweep. The tiling triples the forward and the reverse work on each point
+    set, so that on the stretching cube this operator is slower than the separate ones (0.47x for the derivatives and
+    0.83x with the gradients of the weights and biases, see Benchmark_Dif_op.py), and it is only used by the PINN if
+    asked for (PINN(..., fused=True)).
+    This class include 2 functions, including:
+        1. __init__()         : Initialise the parameters for differential operator;
+        2. call()             : Calculate the differential terms.
+
+    ====================================================================================================================
+    """
+
+    def __init__(self, fnn_u, fnn_v, fnn_w, order=2, taylor=False, **kwargs):
+        """
+        ================================================================================================================
+
+        This function is to initialise for differential operator.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [fnn_u]     [Keras model]           : The Feedforward Neural Network for displacement u;
+        [fnn_v]     [Keras model]           : The Feedforward Neural Network for displacement v;
+        [fnn_w]     [Keras model]           : The Feedforward Neural Network for displacement w;
+        [order]     [int]                   : The highest order of the derivatives to be calculated (1 or 2);
+        [taylor]    [bool]                  : Whether to obtain the differential terms by the Taylor-mode forward
+                                              sweep (see Taylor.py) instead of the forward-over-reverse
+                                              differentiation.
+
+        ================================================================================================================
+        """
+        self.fnn_u = fnn_u
+        self.fnn_v = fnn_v
+        self.fnn_w = fnn_w
+        self.order = order
+        self.taylor = [ Taylor(fnn, i, order) for i, fnn in enumerate([fnn_u, fnn_v, fnn_w]) ] if taylor else None
+
+        ### Keep the coordinates, the derivatives and the loss in the floating-point type of the inputs, as the layer
+        ### would otherwise follow the mixed precision policy and cast the coordinates to bfloat16 (see Precision.py)
+        super().__init__(dtype=kwargs.pop('dtype', tf.keras.backend.floatx()), **kwargs)
+
+    @tf.function
+    def call(self, xyz):
+        """
+        ================================================================================================================
+
+        This function is to calculate the differential terms.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [xyz]       [Keras tensor]          : The coordinate array;
+        [n]         [Keras tensor]          : Number of the sample points;
+        [X]         [Keras tensor]          : The coordinate array tiled three times;
+        [T]         [Keras tensor]          : The unit tangents (x, y and z) for each tile of the coordinate array;
+        [U]         [Keras tensor]          : The displacement predictions in x direction;
+        [V]         [Keras tensor]          : The displacement predictions in y direction;
+        [W]         [Keras tensor]          : The displacement predictions in z direction;
+        [dU]        [Keras tensor]          : The gradients of u with respect to the coordinates;
+        [ddU]       [Keras tensor]          : The Hessian rows of u, i.e., the directional derivatives of dU;
+        [U_x]       [Keras tensor]          : The first-order derivative of the u with respect to the x;
+        [U_xy]      [Keras tensor]          : The second-order derivative of the u with respect to the xy;
+        ...         ...                     : (The same naming rule for all the other terms of u, v and w.)
+
+        The first-order derivatives of u, v and w are returned first, followed by their second-order derivatives, so
+        that the first-order operator (order = 1) simply returns the leading 9 terms.
+
+        ================================================================================================================
+        """
+
+        ### Obtain the differential terms by the Taylor-mode forward sweep, if required
+        if self.taylor is not None:
+            T_u, T_v, T_w = (Taylor_terms(*t(xyz)[1:]) for t in self.taylor)
+
+            return T_u[:3] + T_v[:3] + T_w[:3] + T_u[3:] + T_v[3:] + T_w[3:]
+
+        ### Obtain the first-order derivatives only, if the second-order derivatives are not required
+        if self.order == 1:
+            with tf.GradientTape(persistent=True) as g:
+                g.watch(xyz)
+                U = self.fnn_u(xyz) * xyz[..., 0, tf.newaxis]
+                V = self.fnn_v(xyz) * xyz[..., 1, tf.newaxis]
+                W = self.fnn_w(xyz) * xyz[..., 2, tf.newaxis]
+            dU = g.gradient(U, xyz)
+            dV = g.gradient(V, xyz)
+            dW = g.gradient(W, xyz)
+            del g
+
+            return tuple(d[..., i, tf.newaxis] for d in (dU, dV, dW) for i in range(3))
+
+        ### Tile the coordinate array and assign one unit tangent to each tile
+        n = tf.shape(xyz)[0]
+        X = tf.tile(xyz, [3, 1])
+        T = tf.repeat(tf.eye(3, dtype=xyz.dtype), n, axis=0)
+
+        ### Apply the ForwardAccumulator over the GradientTape function
+        with tf.autodiff.ForwardAccumulator(primals=X, tangents=T) as acc:
+            with tf.GradientTape(persistent=True) as g:
+                g.watch(X)
+
+                ### Calculate the displacement outputs by times the coordinates to naturally satisfy the displacement
+                ### boundary conditions
+                U = self.fnn_u(X) * X[..., 0, tf.newaxis]
+                V = self.fnn_v(X) * X[..., 1, tf.newaxis]
+                W = self.fnn_w(X) * X[..., 2, tf.newaxis]
+
+            ### Obtain the first-order derivatives of the outputs with respect to the input
+            dU = g.gradient(U, X)
+            dV = g.gradient(V, X)
+            dW = g.gradient(W, X)
+            del g
+
+        ### Obtain the second-order derivatives of the outputs with respect to the input
+        ddU = tf.split(acc.jvp(dU), 3, axis=0)
+        ddV = tf.split(acc.jvp(dV), 3, axis=0)
+        ddW = tf.split(acc.jvp(dW), 3, axis=0)
+
+        ### Pick up the first-order derivatives from the first tile
+        dU, dV, dW = dU[:n], dV[:n], dW[:n]
+
+        U_x, U_y, U_z = (dU[..., i, tf.newaxis] for i in range(3))
+        V_x, V_y, V_z = (dV[..., i, tf.newaxis] for i in range(3))
+        W_x, W_y, W_z = (dW[..., i, tf.newaxis] for i in range(3))
+
+        U_xx, U_xy, U_xz = (ddU[0][..., i, tf.newaxis] for i in range(3))
+        U_yy, U_yz, U_zz = ddU[1][..., 1, tf.newaxis], ddU[1][..., 2, tf.newaxis], ddU[2][..., 2, tf.newaxis]
+        V_xx, V_xy, V_xz = (ddV[0][..., i, tf.newaxis] for i in range(3))
+        V_yy, V_yz, V_zz = ddV[1][..., 1, tf.newaxis], ddV[1][..., 2, tf.newaxis], ddV[2][..., 2, tf.newaxis]
+        W_xx, W_xy, W_xz = (ddW[0][..., i, tf.newaxis] for i in range(3))
+        W_yy, W_yz, W_zz = ddW[1][..., 1, tf.newaxis], ddW[1][..., 2, tf.newaxis], ddW[2][..., 2, tf.newaxis]
+
+        return (U_x, U_y, U_z, V_x, V_y, V_z, W_x, W_y, W_z,
+                U_xx, U_xy, U_xz, U_yy, U_yz, U_zz,
+                V_xx, V_xy, V_xz, V_yy, V_yz, V_zz,
+                W_xx, W_xy, W_xz, W_yy, W_yz, W_zz)
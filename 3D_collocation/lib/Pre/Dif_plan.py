@@ -0,0 +1,78 @@
+def Dif_plan(outputs):
+    """
+    ====================================================================================================================
+
+    This function is to plan the highest derivative order required by each point set, based on the outputs of the
+    Material function that the point set actually contributes to the PINN. Point sets which only need the strain or
+    stress (e.g., the traction boundaries) are then sent through a cheaper first-order differential operator.
+
+    --------------------------------------------------------------------------------------------------------------------
+
+    Name        Type                    Info.
+
+    [outputs]   [dict]                  : The names of the used Material outputs for each point set;
+    [order]     [dict]                  : The derivative order required by each output of the Material function;
+    [plan]      [dict]                  : The highest derivative order required by each point set.
+
+    ====================================================================================================================
+    """
+
+    ### Define the derivative order required by each output of the Material function
+    order = {'e1': 1, 'e2': 1, 'e3': 1, 'e12': 1, 'e23': 1, 'e13': 1,
+             's1': 1, 's2': 1, 's3': 1, 's12': 1, 's23': 1, 's13': 1,
+             'Gex': 2, 'Gey': 2, 'Gez': 2}
+
+    ### Take the highest order over the used outputs of each point set
+    plan = { k: max([ order[o] for o in v ]) for k, v in outputs.items() }
+
+    return plan
+
+def Dif_terms(terms, n):
+    """
+    ====================================================================================================================
+
+    This function is to pad the terms returned by a differential operator with None, so that the first-order and the
+    second-order differential operators can be unpacked in the same way.
+
+    --------------------------------------------------------------------------------------------------------------------
+
+    Name        Type                    Info.
+
+    [terms]     [tuple]                 : The terms returned by the differential operator (or the single term);
+    [n]         [int]                   : Number of the terms returned by the second-order differential operator.
+
+    ====================================================================================================================
+    """
+
+    ### Wrap the single term returned by the first-order differential operator
+    if not isinstance(terms, (tuple, list)):
+        terms = (terms,)
+
+    return tuple(terms) + (None,) * (n - len(terms))
+
+def Dif_merge(dif_x, dif_y, dif_z):
+    """
+    ====================================================================================================================
+
+    This function is to merge the separate differential operators of u, v and w (Dif_x, Dif_y and Dif_z) into one
+    operator, whose terms are ordered as those of the fused differential operator (see Dif_op_xyz.py): the first-order
+    derivatives of u, v and w first, followed by their second-order derivatives.
+
+    --------------------------------------------------------------------------------------------------------------------
+
+    Name        Type                    Info.
+
+    [dif_x]     [Keras layer]           : The differential operator of u;
+    [dif_y]     [Keras layer]           : The differential operator of v;
+    [dif_z]     [Keras layer]           : The differential operator of w;
+    [dif]       [function]              : The merged differential operator.
+
+    ====================================================================================================================
+    """
+
+    def dif(x):
+        T_u, T_v, T_w = (Dif_terms(op(x), 9) for op in (dif_x, dif_y, dif_z))
+
+        return T_u[:3] + T_v[:3] + T_w[:3] + T_u[3:] + T_v[3:] + T_w[3:]
+
+    return dif
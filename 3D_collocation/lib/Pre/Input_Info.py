@@ -1,8 +1,10 @@
 import numpy as np
 import math
 import scipy.io
+from lib.Pre.Precision import Precision
+from lib.Pre.Sampler import Sampler
 
-def Input_Info():
+def Input_Info(precision='float32', settings=None, sampler=None):
     """
     ====================================================================================================================
 
@@ -16,6 +18,12 @@ def Input_Info():
 
     Name        Type                    Info.
 
+    [precision] [str]                   : The precision policy (see Precision.py);
+    [settings]  [dict]                  : The FNN settings that override the ones defined below, {'width', 'depth',
+                                          'acti_fun'} (e.g., in the trials of Hyperband.py);
+    [sampler]   [Sampler]               : The sampler of the point sets (None for the points of Coord.mat, see
+                                          Sampler.py);
+    [dtype]     [str]                   : The floating-point type of the point sets and the boundary conditions;
     [ns]        [int]                   : Total number of sample points;
     [dx]        [float]                 : Sample points interval;
     [x]         [Array of float32]      : Coordinates of all the sample points;
@@ -43,20 +51,31 @@ def Input_Info():
 
     ====================================================================================================================
     """
+
+    ### Set the precision policy
+    dtype = Precision(precision)
     
     # sample points' interval
     dx = 1./20
     
     ### initialize sample points' coordinates
     C = scipy.io.loadmat('Coord.mat')
-    x = C['xy']
-    x1u = C['x1u']
-    x1b = C['x1b']
-    x2u = C['x2u']
-    x2b = C['x2b']
-    x3u = C['x3u']
-    x3b = C['x3b']
+    x = C['xy'].astype(dtype)
+    x1u = C['x1u'].astype(dtype)
+    x1b = C['x1b'].astype(dtype)
+    x2u = C['x2u'].astype(dtype)
+    x2b = C['x2b'].astype(dtype)
+    x3u = C['x3u'].astype(dtype)
+    x3b = C['x3b'].astype(dtype)
     ns = C['n'][0, 0]
+
+    ### Or, regenerate the point sets with the same numbers of points by the given sampler, in the bounding box of the
+    ### sample points and on its faces
+    if sampler is not None:
+        lower, upper = np.min(x, axis=0), np.max(x, axis=0)
+        x = sampler.interior(len(x), lower, upper, key=0).astype(dtype)
+        x1u, x1b, x2u, x2b, x3u, x3b = [ sampler.boundary(len(f), lower, upper, axis=i // 2, value=f[0, i // 2],
+            key=i + 1).astype(dtype) for i, f in enumerate([x1u, x1b, x2u, x2b, x3u, x3b]) ]
     
     ### Create the PINN input list
     x_train = [x, x1u, x1b, x2u, x2b, x3u, x3b]
@@ -75,7 +94,13 @@ def Input_Info():
     n_input = 3
     n_output = 1
     layer = [np.array([20,20,20,20]), np.array([20,20,20,20]), np.array([20,20,20,20])]
-    NN_info = [n_input, n_output, layer]
+    acti_fun = 'tanh'
+
+    ### Override the FNN settings, if required
+    if settings is not None:
+        layer = [ np.full(settings.get('depth', len(l)), settings.get('width', l[0])) for l in layer ]
+        acti_fun = settings.get('acti_fun', acti_fun)
+    NN_info = [n_input, n_output, layer, acti_fun]
     
     print('*************************************************')
     print('Problem Info.')
@@ -0,0 +1,290 @@
+import numpy as np
+import tensorflow as tf
+from lib.Pre.L_BFGS_B import L_BFGS_B
+from lib.Pre.Loss import Collocation_Loss, Collocation_Residual, Collocation_Terms
+
+class LM(L_BFGS_B):
+    """
+    ====================================================================================================================
+
+    This is the class for the Levenberg-Marquardt optimiser. The collocation loss is a sum of squared residuals,
+    loss = r^T r (see Collocation_Residual() in Loss.py), so that with the Jacobian J of the residuals with respect to
+    the weights and biases, each iteration solves the damped normal equations in float64,
+        (J^T J + lambda I) delta = -J^T r,
+    and the damping lambda is adapted by the ratio between the actual and the predicted reductions of the loss (the
+    update of Nielsen). The Jacobian is never formed for all the residuals at once: it is obtained chunk by chunk of the
+    domain points by GradientTape.jacobian, and only J^T J and J^T r are accumulated over the chunks, so that the peak
+    memory depends on the chunk size and on the number of weights and biases rather than on the number of points.
+    This class include 6 functions, including:
+        1. __init__()         : Initialise the parameters for the Levenberg-Marquardt optimiser;
+        2. residual()         : Calculate the residuals and the loss terms;
+        3. normal_chunk()     : Calculate the contributions of one chunk to J^T J, J^T r and the loss terms;
+        4. normal_equations() : Accumulate J^T J, J^T r and the loss terms over all the chunks;
+        5. record()           : Record the loss terms of one evaluation;
+        6. fit()              : Execute training process.
+
+    ====================================================================================================================
+    """
+
+    def __init__(self, pinn, x_train, y_train, dx, maxit=500, tau=1e-3, ftol=1e-12, pgtol=1e-10, pfor=True,
+                 chunk_size=256):
+        """
+        ================================================================================================================
+
+        This function is to initialise the parameters used in the Levenberg-Marquardt optimiser.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [pinn]      [Keras model]           : The Physics-informed neural network;
+        [x_train]   [list]                  : PINN input list, contains all the coordinates information;
+        [y_train]   [list]                  : PINN boundary condition list, contains the traction boundary condition;
+        [dx]        [float]                 : Sample points interval;
+        [maxit]     [int]                   : Maximum number of iterations for training;
+        [tau]       [float]                 : The initial damping relative to the largest diagonal entry of J^T J;
+        [ftol]      [float]                 : Stop when the relative reduction of the loss is below ftol;
+        [pgtol]     [float]                 : Stop when the maximum absolute gradient is below pgtol;
+        [pfor]      [bool]                  : Whether the Jacobian is vectorised (True) or looped over the residuals
+                                              (False, slower but with less memory);
+        [chunk_size][int]                   : Number of domain points whose rows of the Jacobian are obtained at once.
+
+        ================================================================================================================
+        """
+
+        super().__init__(pinn, x_train, y_train, dx, pgtol=pgtol)
+        self.maxit = maxit
+        self.tau = tau
+        self.ftol = ftol
+        self.pfor = pfor
+        self.lm_chunk_size = chunk_size
+
+    @tf.function
+    def residual(self):
+        """
+        ================================================================================================================
+
+        This function is to calculate the residuals and the loss terms at the current weights and biases.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [y_p]       [list]                  : List of predictions from the PINN;
+        [r]         [Keras tensor]          : The flat residual vector;
+        [l1]        [Keras tensor]          : The l1 loss term;
+        [l2]        [Keras tensor]          : The l2 loss term.
+
+        ================================================================================================================
+        """
+
+        y_p = self.pinn(self.x_train)
+        r = Collocation_Residual(y_p, self.y_train)
+        _, l1, l2 = Collocation_Loss(y_p, self.y_train)
+
+        return tf.cast(r, tf.float64), l1, l2
+
+    @tf.function
+    def normal_chunk(self, x, y, w, bc):
+        """
+        ================================================================================================================
+
+        This function is to calculate the contributions of one chunk of the domain points to J^T J, J^T r and the loss
+        terms. The residuals of the equilibrium equation are weighted by sqrt(w), so that they are scaled as on all the
+        domain points (see L_BFGS_B.chunk_loss_grad()), and the residuals of the traction boundaries are only included
+        in the first chunk, so that the sums over all the chunks are exactly those of the full residual vector.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [x]         [list]                  : PINN input list, with one chunk of the domain points;
+        [y]         [list]                  : PINN boundary condition list, contains the traction boundary condition;
+        [w]         [Keras tensor]          : The weight of the domain term of the chunk (n_c / n for the mean
+                                              reduction, 1 for the sum reduction);
+        [bc]        [bool]                  : Whether the residuals of the traction boundaries are included;
+        [terms]     [list]                  : The residuals of each output of the chunk (see Collocation_Terms());
+        [r]         [Keras tensor]          : The flat residual vector of the chunk, with the shape of (n_r,);
+        [J]         [Keras tensor]          : The Jacobian of r, with the shape of (n_r, n_w) (float64);
+        [A]         [Keras tensor]          : The contribution to J^T J;
+        [g]         [Keras tensor]          : The contribution to J^T r;
+        [l1]        [Keras tensor]          : The contribution to the l1 loss term;
+        [l2]        [Keras tensor]          : The contribution to the l2 loss term.
+
+        ================================================================================================================
+        """
+
+        with tf.GradientTape() as tape:
+            terms, n_eq = Collocation_Terms(self.pinn(x), y)
+            terms = [ t * tf.sqrt(tf.cast(w, t.dtype)) for t in terms[:n_eq] ] + (terms[n_eq:] if bc else [])
+            r = tf.concat([ tf.reshape(t, [-1]) for t in terms ], axis=0)
+
+        ### Obtain the Jacobian of the residuals of the chunk for all the trainable variables, and flatten it to one
+        ### matrix
+        J = tape.jacobian(r, self.variables, experimental_use_pfor=self.pfor)
+        J = tf.cast(tf.concat([ tf.reshape(j, [tf.shape(r)[0], -1]) for j in J ], axis=1), tf.float64)
+        r = tf.cast(r, tf.float64)
+
+        l1 = tf.add_n([ tf.reduce_sum(tf.square(t)) for t in terms[:n_eq] ])
+        l2 = tf.add_n([ tf.reduce_sum(tf.square(t)) for t in terms[n_eq:] ]) if bc else tf.zeros_like(l1)
+
+        return tf.matmul(J, J, transpose_a=True), tf.linalg.matvec(J, r, transpose_a=True), l1, l2
+
+    def normal_equations(self):
+        """
+        ================================================================================================================
+
+        This function is to accumulate J^T J, J^T r and the loss terms at the current weights and biases over all the
+        chunks of the domain points.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [n]         [int]                   : Number of domain points;
+        [x_c]       [Keras tensor]          : One chunk of the domain points;
+        [A]         [ndarray]               : The Gauss-Newton matrix J^T J;
+        [g]         [ndarray]               : The half gradients J^T r;
+        [l1]        [Keras tensor]          : The l1 loss term;
+        [l2]        [Keras tensor]          : The l2 loss term.
+
+        ================================================================================================================
+        """
+
+        n = int(self.x_train[0].shape[0])
+        A, g, l1, l2 = 0., 0., 0., 0.
+        for start in range(0, n, self.lm_chunk_size):
+            x_c = self.x_train[0][start:start + self.lm_chunk_size]
+            w = tf.constant(int(x_c.shape[0]) / n if self.reduction == 'mean' else 1., dtype=self.dtype)
+            A_c, g_c, l1_c, l2_c = self.normal_chunk([x_c] + list(self.x_train[1:]), self.y_train, w, start == 0)
+            A, g = A + A_c.numpy(), g + g_c.numpy()
+            l1, l2 = l1 + l1_c, l2 + l2_c
+
+        return A, g, l1, l2
+
+    def record(self, l1, l2):
+        """
+        ================================================================================================================
+
+        This function is to record the loss terms of one evaluation.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [l1]        [Keras tensor]          : The l1 loss term;
+        [l2]        [Keras tensor]          : The l2 loss term;
+        [iter]      [int]                   : Number of evaluations;
+        [telemetry] [Telemetry]             : The preallocated history of the evaluations (the norm of the gradients
+                                              is not evaluated for the trial steps, and is left as NaN).
+
+        ================================================================================================================
+        """
+
+        self.iter = self.iter + 1
+        self.telemetry.record(self.iter, l1, l2)
+
+        ### Hand the state to the checkpoint, which is saved if due
+        if self.checkpoint is not None:
+            self.checkpoint.step(self)
+
+        ### Check the budgets of the training, which stop it if any is met
+        if self.budget is not None:
+            self.budget.check(self, l1 + l2, l1, l2)
+
+        return None
+
+    def fit(self):
+        """
+        ================================================================================================================
+
+        This function is to execute training process.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [x]         [ndarray]               : The current flat weights and biases;
+        [f]         [float]                 : The current physics-informed loss, f = r^T r;
+        [A]         [ndarray]               : The Gauss-Newton matrix J^T J;
+        [g]         [ndarray]               : The half gradients J^T r;
+        [lam]       [float]                 : The damping;
+        [nu]        [float]                 : The growth factor of the damping after a rejected step;
+        [delta]     [ndarray]               : The step of the weights and biases;
+        [rho]       [float]                 : The ratio between the actual and the predicted reductions of the loss;
+        [nit]       [int]                   : Number of iterations;
+        [warnflag]  [int]                   : -1 while running; 0 if converged; 1 if maxit is reached; 2 if the damping
+                                              blows up;
+        [result]    [tuple]                 : The result in the same form as the one returned by the SciPy optimiser,
+                                              (weights and biases, final loss, {'funcalls', 'nit', 'warnflag'});
+        [his_l1]    [ndarray]               : History values of the l1 loss term;
+        [his_l2]    [ndarray]               : History values of the l2 loss term.
+
+        ================================================================================================================
+        """
+
+        print('Optimizer: Levenberg-Marquardt (Damped Gauss-Newton on the collocation residuals)')
+        print('Initializing ...\n')
+
+        ### Get initial weights and biases, and accumulate the normal equations
+        x = np.concatenate([ v.numpy().flatten() for v in self.variables ]).astype('float64')
+        A, g, l1, l2 = self.normal_equations()
+        self.record(l1, l2)
+        f = float(l1 + l2)
+        lam = self.tau * np.max(np.diag(A))
+        nu = 2.
+        nit = 0
+        warnflag = -1
+
+        while warnflag < 0:
+
+            ### Solve the damped normal equations in float64
+            try:
+                delta = np.linalg.solve(A + lam * np.eye(len(x)), -g)
+            except np.linalg.LinAlgError:
+                delta = None
+
+            ### Evaluate the loss at the trial weights and biases, and compare it with the reduction predicted by the
+            ### linearised residuals, ||r + J delta||^2 = f + 2 g.delta + delta^T A delta
+            rho = -1.
+            if delta is not None:
+                self.set_weights(x + delta)
+                r_new, l1, l2 = self.residual()
+                self.record(l1, l2)
+                r_new = r_new.numpy()
+                f_new = np.dot(r_new, r_new)
+                predicted = -(2. * np.dot(g, delta) + np.dot(delta, A @ delta))
+                rho = (f - f_new) / predicted if predicted > 0. else -1.
+
+            if rho > 0.:
+                ### Accept the step, relax the damping, and linearise the residuals again (the loss and the loss terms
+                ### at the accepted weights and biases are those of the trial step)
+                x = x + delta
+                A, g = self.normal_equations()[:2]
+                f_old, f = f, f_new
+                lam = lam * max(1. / 3., 1. - (2. * rho - 1.) ** 3)
+                nu = 2.
+                nit = nit + 1
+
+                ### Print the loss terms every 10 iterations
+                if nit % 10 == 0:
+                    print('Iter: %d   L1 = %.4g   L2 = %.4g   Lambda = %.3g' % (nit, l1.numpy(), l2.numpy(), lam))
+
+                if (f_old - f) / max(f_old, f, 1.) <= self.ftol or np.max(np.abs(2. * g)) <= self.pgtol:
+                    warnflag = 0
+                elif nit >= self.maxit:
+                    warnflag = 1
+            else:
+                ### Reject the step, and increase the damping
+                lam = lam * nu
+                nu = 2. * nu
+                if not np.isfinite(lam) or lam > 1e16:
+                    warnflag = 2
+
+        ### Set the accepted weights and biases back to the neural network, as the last evaluation may be a rejected
+        ### step
+        self.set_weights(x)
+
+        result = (x, f, {'funcalls': int(self.iter), 'nit': nit, 'warnflag': warnflag})
+
+        return result, self.history()
@@ -1,24 +1,35 @@
+import collections
 import scipy.optimize
 import numpy as np
 import tensorflow as tf
-from lib.Pre.Loss import Collocation_Loss
+from lib.Pre.Telemetry import Telemetry
+from lib.Pre.Loss import Collocation_Loss, Collocation_Terms
 
 class L_BFGS_B:
     """
         ====================================================================================================================
 
         This is the class for the L-BFGS-B optimiser. We adopt core algorithm of the L-BFGS-B algorithm is provided by the
-        Scipy library. This class include 5 functions, including:
+        Scipy library. This class include 13 functions, including:
             1. __init__()         : Initialise the parameters for the L-BFGS-B optimiser;
             2. pi_loss()          : Calculate the physics-informed loss;
             3. loss_grad()        : Obtain the gradients of the physics-informed loss with respect to the weighs and biases;
-            4. set_weights()      : Set the modified weights and biases back to the neural network structure;
-            5. fit()              : Execute training process.
+            4. weighted_loss()    : Apply the collocation loss with the adaptive weights of the loss terms, if any;
+            5. flat_loss_grad()   : Assign the flat weights and biases and obtain the loss and the flat gradients;
+            6. chunk_loss_grad()  : Obtain the loss and the flat gradients on one chunk of the domain points;
+            7. accumulate_loss_grad() : Accumulate the loss and the flat gradients over all the chunks;
+            8. cached_loss_grad() : Look up or calculate the loss and the flat gradients in the cache;
+            9. set_weights()      : Set the modified weights and biases back to the neural network structure;
+            10. state()           : Return the state of the optimiser for the checkpoints;
+            11. restore()         : Restore the state of the optimiser from a checkpoint;
+            12. history()         : Return the history values of the loss terms;
+            13. fit()             : Execute training process.
 
         ====================================================================================================================
     """
 
-    def __init__(self, pinn, x_train, y_train, dx, factr=10, pgtol=1e-10, m=50, maxls=50, maxfun=40000):
+    def __init__(self, pinn, x_train, y_train, dx, factr=10, pgtol=1e-10, m=50, maxls=50, maxfun=40000,
+                 chunk_size=None, cache_size=8, sinks=None, weighting=None):
         """
         ================================================================================================================
 
@@ -37,27 +48,77 @@ class L_BFGS_B:
         [m]         [int]                   : The optimiser option. Please refer to SciPy;
         [maxls]     [int]                   : The optimiser option. Please refer to SciPy;
         [maxfun]    [int]                   : Maximum number of iterations for training;
+        [chunk_size][int]                   : Number of domain points evaluated at once (None for the whole domain).
+                                              The domain points (x_train[0]) may also be given as the path of a .npy
+                                              file, which is then memory-mapped and read chunk by chunk;
+        [dtype]     [str]                   : The floating-point type of the inputs and the loss (see Precision.py);
+        [reduction] [str]                   : How the loss reduces the domain residuals ('mean' or 'sum'), which sets
+                                              the weights of the chunks;
+        [cache_size][int]                   : Number of the evaluations kept in the least-recently-used cache (0 to
+                                              disable the cache);
+        [variables] [list]                  : The trainable variables (weights and biases) of the PINN;
+        [shapes]    [list]                  : The shapes of neural network's weights and biases;
+        [sizes]     [list of int]           : The numbers of entries of neural network's weights and biases;
         [iter]      [int]                   : Number of training iterations;
-        [his_l1]    [list of float32]       : History values of the l1 loss term;
-        [his_l2]    [list of float32]       : History values of the l1 loss term.
+        [sinks]     [list]                  : The sinks that receive the history of the evaluations (e.g., CSV_Sink,
+                                              see Telemetry.py), which are written by a background thread (None to
+                                              keep the history in memory only);
+        [telemetry] [Telemetry]             : The preallocated history of the evaluations;
+        [checkpoint][Checkpoint]            : The checkpoint of the training, set by the optimiser schedule (None if
+                                              the training is not checkpointed, see Checkpoint.py);
+        [budget]    [Budget]                : The budgets of the training, set by the optimiser schedule (None if there
+                                              is no budget, see Budget.py);
+        [weighting] [Weighting]             : The adaptive weighting of the loss terms (None for the unit weights, see
+                                              Weighting.py);
+        [term_weights] [tf.Variable]        : The weights of the loss terms, set by the weighting (None for the unit
+                                              weights);
+        [refinement][RAR]                   : The adaptive refinement of the domain points, set by the refinement
+                                              (None if the domain points are fixed, see RAR.py).
 
         ================================================================================================================
         """
 
-        ### Initialise the parameters
+        ### Load the point sets from the memory-mapped .npy files, if their paths are given
+        x_train = [ np.load(x, mmap_mode='r') if isinstance(x, str) else x for x in x_train ]
+
+        ### Initialise the parameters (in the chunked mode, the domain points stay in the host memory or the memory-
+        ### mapped file, and are only converted to tensors chunk by chunk)
         self.pinn = pinn
-        self.x_train = [ tf.constant(x, dtype=tf.float32) for x in x_train ]
-        self.y_train = [ tf.constant(y, dtype=tf.float32) for y in y_train ]
+        self.dtype = tf.keras.backend.floatx()
+        self.chunk_size = chunk_size
+        self.reduction = 'sum'
+        if chunk_size is None:
+            self.x_train = [ tf.constant(x, dtype=self.dtype) for x in x_train ]
+        else:
+            self.x_train = [ x_train[0] ] + [ tf.constant(x, dtype=self.dtype) for x in x_train[1:] ]
+        self.y_train = [ tf.constant(y, dtype=self.dtype) for y in y_train ]
         self.dx = dx
         self.factr = factr
         self.pgtol = pgtol
         self.m = m
         self.maxls = maxls
         self.maxfun = maxfun
+        self.cache_size = cache_size
+        self.cache = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        ### Obtain the trainable variables, their shapes and sizes once, so that the flat weights and biases from the
+        ### optimiser can be assigned inside the compiled function without querying the PINN at every call
+        self.variables = self.pinn.trainable_variables
+        self.shapes = [ v.shape for v in self.variables ]
+        self.sizes = [ int(np.prod(shape)) for shape in self.shapes ]
+
         self.metrics = ['loss']
         self.iter = 0
-        self.his_loss_ge = []
-        self.his_loss_bc = []
+        self.telemetry = Telemetry(capacity=maxfun, sinks=sinks)
+        self.checkpoint = None
+        self.budget = None
+        self.term_weights = None
+        self.refinement = None
+        self.weighting = weighting
+        if weighting is not None:
+            weighting.attach(self)
 
     def pi_loss(self, weights):
         """
@@ -69,7 +130,7 @@ class L_BFGS_B:
 
         Name        Type                    Info.
 
-        [weights]   [list]                  : The weights and biases;
+        [weights]   [ndarray]               : The flat weights and biases;
         [pinn]      [Keras tensor]          : The Physics-informed neural network;
         [x_train]   [list]                  : PINN input list, contains all the coordinates information;
         [y_train]   [list]                  : PINN boundary condition list, contains the traction boundary condition;
@@ -78,32 +139,34 @@ class L_BFGS_B:
         [l2]        [Keras tensor]          : The l2 loss term;
         [grads]     [Keras tensor]          : The gradients of the physics-informed loss with respect to weights and
                                               biases;
-        [iter]      [int]                   : Number of training iterations.
+        [iter]      [int]                   : Number of training iterations;
+        [telemetry] [Telemetry]             : The preallocated history of the evaluations.
 
         ================================================================================================================
         """
 
-        ### Update the weights and biases to the FNN
-        self.set_weights(weights)
-
-        ### Calculate the physics-informed loss and its gradients with respect to weights and biases
-        loss, grads, l1, l2 = self.loss_grad(self.x_train, self.y_train)
+        ### Update the weights and biases to the FNN, and calculate the physics-informed loss and its gradients with
+        ### respect to weights and biases (or look them up in the cache)
+        loss, grads, l1, l2 = self.cached_loss_grad(weights)
 
         ### Count number of the training iteration
         self.iter = self.iter + 1
 
+        ### Record the loss terms and the norm of the gradients in the preallocated history
+        l1, l2 = self.telemetry.record(self.iter, l1, l2, np.linalg.norm(grads))
+
         ### Print the loss terms every 10 training iterations
         if self.iter % 10 == 0:
             print('Iter: %d   L1 = %.4g   L2 = %.4g'
-                  % (self.iter, l1.numpy(), l2.numpy()))
+                  % (self.iter, l1, l2))
 
-        ### Convert loss and grads from Keras tensor to ndarray
-        loss = loss.numpy().astype('float64')
-        grads = np.concatenate([g.numpy().flatten() for g in grads]).astype('float64')
+        ### Hand the state to the checkpoint, which is saved if due
+        if self.checkpoint is not None:
+            self.checkpoint.step(self, weights)
 
-        ### Save the current loss term in different np.array
-        self.his_loss_ge.append(l1)
-        self.his_loss_bc.append(l2)
+        ### Check the budgets of the training, which stop it if any is met
+        if self.budget is not None:
+            self.budget.check(self, loss, l1, l2, weights)
 
         return loss, grads
 
@@ -137,8 +200,8 @@ class L_BFGS_B:
             ### Predict outputs from the current PINN
             y_p = self.pinn(x)
 
-            ### Apply the collocation loss function
-            loss, l1, l2 = Collocation_Loss(y_p, y)
+            ### Apply the collocation loss function (with the adaptive weights of the loss terms, if any)
+            loss, l1, l2 = self.weighted_loss(y_p, y)
 
         ### Obtain the gradients through automatic differentiation
         ### (GradientTape function provided by the TensorFlow)
@@ -146,6 +209,217 @@ class L_BFGS_B:
 
         return loss, grads, l1, l2
 
+    def weighted_loss(self, y_p, y):
+        """
+        ================================================================================================================
+
+        This function is to apply the collocation loss function, with the adaptive weights of the loss terms if they
+        are set (see Weighting.py). The weights only enter the loss minimised by the optimiser, while the l1 and l2
+        loss terms stay unweighted, so that the histories with and without the weighting compare directly.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [y_p]       [list]                  : List of predictions from the PINN;
+        [y]         [list]                  : PINN boundary condition list, contains the traction boundary condition;
+        [terms]     [list]                  : The residuals of each loss term (see Collocation_Terms() in Loss.py);
+        [n_eq]      [int]                   : Number of the terms from the equilibrium equation;
+        [l]         [Keras tensor]          : The loss terms;
+        [loss]      [Keras tensor]          : The weighted physics-informed loss;
+        [l1]        [Keras tensor]          : The l1 loss term;
+        [l2]        [Keras tensor]          : The l2 loss term.
+
+        ================================================================================================================
+        """
+
+        if self.term_weights is None:
+            return Collocation_Loss(y_p, y)
+
+        terms, n_eq = Collocation_Terms(y_p, y)
+        l = tf.stack([ tf.reduce_sum(tf.square(t)) for t in terms ])
+        loss = tf.reduce_sum(tf.cast(self.term_weights, l.dtype) * l)
+
+        return loss, tf.reduce_sum(l[:n_eq]), tf.reduce_sum(l[n_eq:])
+
+    @tf.function
+    def flat_loss_grad(self, weights, x_train, y_train):
+        """
+        ================================================================================================================
+
+        This function is to assign the flat weights and biases to the trainable variables, and obtain the physics-
+        informed loss and its flat gradients in one compiled call.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [weights]   [Keras tensor]          : The flat weights and biases (float64) from the optimiser;
+        [variables] [list]                  : The trainable variables (weights and biases) of the PINN;
+        [sizes]     [list of int]           : The numbers of entries of neural network's weights and biases;
+        [x_train]   [list]                  : PINN input list, contains all the coordinates information;
+        [y_train]   [list]                  : PINN boundary condition list, contains the traction boundary condition;
+        [loss]      [Keras tensor]          : Current value of the physics-informed loss (float64);
+        [grads]     [Keras tensor]          : The flat gradients of the physics-informed loss with respect to weights
+                                              and biases (float64);
+        [l1]        [Keras tensor]          : The l1 loss term;
+        [l2]        [Keras tensor]          : The l2 loss term.
+
+        ================================================================================================================
+        """
+
+        ### Assign the flat weights and biases to the trainable variables
+        for v, w in zip(self.variables, tf.split(weights, self.sizes)):
+            v.assign(tf.reshape(tf.cast(w, v.dtype), v.shape))
+
+        ### Calculate the physics-informed loss and its gradients with respect to weights and biases
+        loss, grads, l1, l2 = self.loss_grad(x_train, y_train)
+
+        ### Flatten the gradients into one contiguous float64 vector
+        grads = tf.concat([ tf.reshape(g, [-1]) for g in grads ], axis=0)
+
+        return tf.cast(loss, tf.float64), tf.cast(grads, tf.float64), l1, l2
+
+    @tf.function
+    def chunk_loss_grad(self, x, y, w, bc):
+        """
+        ================================================================================================================
+
+        This function is to obtain the physics-informed loss and its flat gradients on one chunk of the domain points.
+        The domain term is weighted by the share of the chunk, and the boundary term is only counted on the first
+        chunk, so that the sums over all the chunks are exactly the full-batch loss and gradients.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [x]         [list]                  : PINN input list, with one chunk of the domain points;
+        [y]         [list]                  : PINN boundary condition list, contains the traction boundary condition;
+        [w]         [Keras tensor]          : The weight of the domain term of the chunk;
+        [bc]        [Keras tensor]          : 1 for the first chunk, otherwise 0;
+        [loss]      [Keras tensor]          : The contribution of the chunk to the physics-informed loss (float64);
+        [grads]     [Keras tensor]          : The contribution of the chunk to the flat gradients (float64);
+        [l1]        [Keras tensor]          : The contribution of the chunk to the l1 loss term;
+        [l2]        [Keras tensor]          : The contribution of the chunk to the l2 loss term.
+
+        ================================================================================================================
+        """
+
+        with tf.GradientTape() as g:
+
+            ### Predict outputs from the current PINN
+            y_p = self.pinn(x)
+
+            ### Apply the loss function, and weight the domain and the boundary terms of the chunk
+            loss, l1, l2 = Collocation_Loss(y_p, y)
+            loss = w * l1 + bc * (loss - l1)
+
+        ### Obtain the flat gradients through automatic differentiation
+        grads = g.gradient(loss, self.variables)
+        grads = tf.concat([ tf.reshape(g, [-1]) for g in grads ], axis=0)
+
+        return tf.cast(loss, tf.float64), tf.cast(grads, tf.float64), w * l1, bc * l2
+
+    def accumulate_loss_grad(self, weights):
+        """
+        ================================================================================================================
+
+        This function is to accumulate the physics-informed loss and its flat gradients over all the chunks of the
+        domain points, so that the peak memory depends on the chunk size rather than on the number of points.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [weights]   [ndarray]               : The flat weights and biases;
+        [chunk_size][int]                   : Number of domain points evaluated at once;
+        [n]         [int]                   : Number of domain points;
+        [x_c]       [Keras tensor]          : One chunk of the domain points;
+        [w]         [float]                 : The weight of the domain term of the chunk (n_c / n for the mean
+                                              reduction, 1 for the sum reduction);
+        [loss]      [Keras tensor]          : Current value of the physics-informed loss (float64);
+        [grads]     [Keras tensor]          : The flat gradients of the physics-informed loss (float64);
+        [l1]        [Keras tensor]          : The l1 loss term;
+        [l2]        [Keras tensor]          : The l2 loss term.
+
+        ================================================================================================================
+        """
+
+        ### Update the weights and biases to the FNN
+        self.set_weights(weights)
+
+        ### Accumulate the loss terms and the gradients chunk by chunk
+        n = len(self.x_train[0])
+        loss, grads, l1, l2 = 0., 0., 0., 0.
+        for start in range(0, n, self.chunk_size):
+            x_c = tf.constant(self.x_train[0][start:start + self.chunk_size], dtype=self.dtype)
+            w = x_c.shape[0] / n if self.reduction == 'mean' else 1.
+            bc = 1. if start == 0 else 0.
+            loss_c, grads_c, l1_c, l2_c = self.chunk_loss_grad([x_c] + self.x_train[1:], self.y_train,
+                tf.constant(w, dtype=self.dtype), tf.constant(bc, dtype=self.dtype))
+            loss, grads, l1, l2 = loss + loss_c, grads + grads_c, l1 + l1_c, l2 + l2_c
+
+        return loss, grads, l1, l2
+
+    def cached_loss_grad(self, weights):
+        """
+        ================================================================================================================
+
+        This function is to look up the physics-informed loss and its flat gradients at the weights and biases in the
+        least-recently-used cache, and only calculate them on a miss. The SciPy optimiser may revisit the weights and
+        biases it has already evaluated (e.g., when the line search steps back), and so may the diagnostics at the
+        current iterate. The cache is keyed by the hash of the raw bytes of the float64 weights and biases, and the
+        stored weights and biases are compared on a hit to rule out hash collisions.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [weights]   [ndarray]               : The flat weights and biases (float64);
+        [key]       [int]                   : The hash of the weights and biases;
+        [cache]     [OrderedDict]           : The cached (weights, loss, grads, l1, l2), from the least to the most
+                                              recently used;
+        [hits]      [int]                   : Number of the evaluations returned from the cache;
+        [misses]    [int]                   : Number of the evaluations calculated by the PINN;
+        [loss]      [ndarray]               : Current value of the physics-informed loss (float64);
+        [grads]     [ndarray]               : The flat gradients of the physics-informed loss (float64);
+        [l1]        [Keras tensor]          : The l1 loss term;
+        [l2]        [Keras tensor]          : The l2 loss term.
+
+        ================================================================================================================
+        """
+
+        weights = np.asarray(weights, dtype=np.float64)
+        key = hash(weights.tobytes())
+        entry = self.cache.get(key)
+        if entry is not None and np.array_equal(entry[0], weights):
+            ### Return the stored values, and still move the PINN to the weights and biases, as the SciPy optimiser
+            ### expects the PINN to hold the last evaluated ones
+            self.hits = self.hits + 1
+            self.cache.move_to_end(key)
+            self.set_weights(weights)
+            return entry[1:]
+
+        ### Update the weights and biases to the FNN, and calculate the physics-informed loss and its gradients with
+        ### respect to weights and biases
+        self.misses = self.misses + 1
+        if self.chunk_size is None:
+            loss, grads, l1, l2 = self.flat_loss_grad(weights, self.x_train, self.y_train)
+        else:
+            loss, grads, l1, l2 = self.accumulate_loss_grad(weights)
+
+        ### Convert loss and grads from Keras tensor to ndarray (already in float64 and flattened)
+        loss = loss.numpy()
+        grads = grads.numpy()
+
+        ### Store the values, and drop the least recently used ones beyond the cache size
+        if self.cache_size > 0:
+            self.cache[key] = (weights.copy(), loss, grads, l1, l2)
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+
+        return loss, grads, l1, l2
+
     def set_weights(self, flat_weights):
         """
         ================================================================================================================
@@ -163,21 +437,94 @@ class L_BFGS_B:
         ================================================================================================================
         """
 
-        ### Obtain the shapes of neural network's weights and biases
-        shapes = [ w.shape for w in self.pinn.get_weights() ]
-
-        ### Compute splitting indices
-        split_ids = np.cumsum([ np.prod(shape) for shape in [0] + shapes ])
+        ### Compute splitting indices from the shapes and sizes obtained at initialisation
+        shapes = self.shapes
+        split_ids = np.cumsum([0] + self.sizes)
 
         ### Reshape the modified weights and biases to fit the neural network structure
         weights = [ flat_weights[from_id:to_id].reshape(shape)
             for from_id, to_id, shape in zip(split_ids[:-1], split_ids[1:], shapes) ]
 
-        ### Set weights and biases to the neural network
-        self.pinn.set_weights(weights)
+        ### Set weights and biases to the trainable variables of the neural network
+        for v, w in zip(self.variables, weights):
+            v.assign(w)
 
         return None
 
+    def state(self):
+        """
+        ================================================================================================================
+
+        This function is to return the state of the optimiser for the checkpoints (see Checkpoint.py).
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [iter]      [int]                   : Number of training iterations;
+        [telemetry] [ndarray]               : The rows of the history recorded so far;
+        [term_weights] [ndarray]            : The weights of the loss terms, if the weighting is applied;
+        [x_domain]  [ndarray]               : The current domain points, if they are refined (see RAR.points()).
+
+        ================================================================================================================
+        """
+
+        state = {'iter': self.iter, 'telemetry': self.telemetry.buffer[:self.telemetry.n].copy()}
+        if self.term_weights is not None:
+            state['term_weights'] = self.term_weights.numpy()
+        if self.refinement is not None:
+            state.update(self.refinement.points())
+
+        return state
+
+    def restore(self, state):
+        """
+        ================================================================================================================
+
+        This function is to restore the state of the optimiser from a checkpoint (the weights and biases are restored
+        by set_weights()). The curvature pairs of the SciPy optimiser are internal to it and cannot be restored, so
+        that the L-BFGS-B optimiser restarts from the restored weights and biases with the remaining evaluations.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [state]     [dict]                  : The state of the training loaded from the checkpoint.
+
+        ================================================================================================================
+        """
+
+        if 'telemetry' in state:
+            self.iter = state['iter'].item()
+            self.telemetry.restore(state['telemetry'])
+        if self.term_weights is not None and 'term_weights' in state:
+            self.term_weights.assign(state['term_weights'])
+        if self.refinement is not None and 'x_domain' in state:
+            self.refinement.assign(state)
+
+        return None
+
+    def history(self):
+        """
+        ================================================================================================================
+
+        This function is to hand the remaining history to the sinks, and return the history values of the loss terms
+        (also used by the optimiser schedule when the training is stopped by the budget, see Budget.py).
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [his_l1]    [ndarray]               : History values of the l1 loss term;
+        [his_l2]    [ndarray]               : History values of the l2 loss term.
+
+        ================================================================================================================
+        """
+
+        self.telemetry.close()
+
+        return self.telemetry.history()
+
     def fit(self):
         """
         ================================================================================================================
@@ -196,19 +543,42 @@ class L_BFGS_B:
         [m]         [int]                   : The optimiser option. Please refer to SciPy;
         [maxls]     [int]                   : The optimiser option. Please refer to SciPy;
         [maxfun]    [int]                   : Maximum number of iterations for training;
+        [weighting] [Weighting]             : The adaptive weighting of the loss terms (None for the unit weights);
         [result]    [tuple]                 : The result returned by the optimiser;
-        [his_l1]    [list of float32]       : History values of the l1 loss term;
-        [his_l2]    [list of float32]       : History values of the l2 loss term.
+        [his_l1]    [ndarray]               : History values of the l1 loss term;
+        [his_l2]    [ndarray]               : History values of the l2 loss term.
 
         ================================================================================================================
         """
 
         ### Get initial weights and biases
-        initial_weights = np.concatenate([ w.flatten() for w in self.pinn.get_weights() ])
+        initial_weights = np.concatenate([ v.numpy().flatten() for v in self.variables ])
 
         ### Optimise the weights and biases via the L-BFGS-B optimiser
         print('Optimizer: L-BFGS-B (Provided by Scipy package)')
         print('Initializing ...')
-        result = scipy.optimize.fmin_l_bfgs_b(func=self.pi_loss, x0=initial_weights,
-            factr=self.factr, pgtol=self.pgtol, m=self.m, maxls=self.maxls, maxfun=self.maxfun)
-        return result, [np.array(self.his_loss_ge), np.array(self.his_loss_bc)]
\ No newline at end of file
+        if self.weighting is None:
+            result = scipy.optimize.fmin_l_bfgs_b(func=self.pi_loss, x0=initial_weights,
+                factr=self.factr, pgtol=self.pgtol, m=self.m, maxls=self.maxls, maxfun=int(self.maxfun - self.iter))
+        else:
+            ### Update the weights of the loss terms every 'every' evaluations, outside the L-BFGS-B optimiser, which is
+            ### restarted on the reweighted loss from the last weights and biases until it converges
+            result = (initial_weights, np.nan, {'warnflag': 1})
+            while result[2]['warnflag'] == 1 and self.iter < self.maxfun:
+                self.weighting.update(self)
+                result = scipy.optimize.fmin_l_bfgs_b(func=self.pi_loss, x0=result[0], factr=self.factr,
+                    pgtol=self.pgtol, m=self.m, maxls=self.maxls,
+                    maxfun=int(min(self.weighting.every, self.maxfun - self.iter)))
+
+            ### Report the unweighted loss of the final weights and biases
+            self.set_weights(result[0])
+            loss = Collocation_Loss(self.pinn(self.x_train), self.y_train)[0]
+            result = (result[0], float(loss), result[2])
+
+        ### Report how many evaluations were returned from the cache
+        print('Cache: %d hits, %d misses' % (self.hits, self.misses))
+
+        ### Count the evaluations before the checkpoint as well, if the training is resumed
+        result[2]['funcalls'] = int(self.iter)
+
+        return result, self.history()
\ No newline at end of file
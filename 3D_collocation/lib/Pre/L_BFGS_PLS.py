@@ -0,0 +1,317 @@
+import concurrent.futures
+import numpy as np
+from lib.Pre.L_BFGS_B import L_BFGS_B
+
+class L_BFGS_PLS(L_BFGS_B):
+    """
+    ====================================================================================================================
+
+    This is the class for the L-BFGS optimiser with the parallel multi-point line search. It shares the physics-informed
+    loss with the L-BFGS-B optimiser (see L_BFGS_B.py), but instead of trying the step lengths one at a time, each round
+    of the line search evaluates n_candidates step lengths at once, t0 * 2^(1-k) for k = 0, ..., n_candidates - 1, on
+    replicas of the PINN in a thread pool (the compiled TensorFlow functions release the GIL). Among the candidates,
+    the lowest loss satisfying the strong Wolfe conditions is accepted, otherwise the lowest loss satisfying the Armijo
+    condition; if there is none, the next round continues below the smallest candidate. The search direction is given
+    by the two-loop recursion in NumPy, and the convergence tests follow the ones of the SciPy optimiser (factr, pgtol
+    and maxfun). This class include 7 functions, including:
+        1. __init__()         : Initialise the parameters for the L-BFGS optimiser with the parallel line search;
+        2. direction()        : Obtain the search direction by the two-loop recursion;
+        3. evaluate()         : Evaluate the loss and the gradients at several weights and biases in parallel;
+        4. line_search()      : Search the step length with the candidates evaluated in parallel;
+        5. state()            : Return the state of the optimiser for the checkpoints;
+        6. restore()          : Restore the state of the optimiser from a checkpoint;
+        7. fit()              : Execute training process.
+
+    ====================================================================================================================
+    """
+
+    def __init__(self, pinn, x_train, y_train, dx, build, build_args=(), n_candidates=4, factr=10, pgtol=1e-10, m=50,
+                 maxls=50, maxfun=40000, c1=1e-4, c2=0.9, **kwargs):
+        """
+        ================================================================================================================
+
+        This function is to initialise the parameters used in the L-BFGS optimiser with the parallel line search.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [pinn]      [Keras model]           : The Physics-informed neural network;
+        [x_train]   [list]                  : PINN input list, contains all the coordinates information;
+        [y_train]   [list]                  : PINN boundary condition list, contains the traction boundary condition;
+        [dx]        [float]                 : Sample points interval;
+        [build]     [function]              : The module-level function that builds up the FNNs and the PINN, whose
+                                              last output is a PINN with the same structure as pinn;
+        [build_args][tuple]                 : The arguments of the build function;
+        [n_candidates] [int]                : Number of step lengths evaluated at once;
+        [factr]     [int]                   : Stop when the relative reduction of the loss is below factr * eps;
+        [pgtol]     [float]                 : Stop when the maximum absolute gradient is below pgtol;
+        [m]         [int]                   : Number of the stored correction pairs;
+        [maxls]     [int]                   : Maximum number of line search evaluations per iteration;
+        [maxfun]    [int]                   : Maximum number of function evaluations for training;
+        [c1]        [float]                 : The sufficient decrease (Armijo) parameter of the line search;
+        [c2]        [float]                 : The curvature parameter of the line search;
+        [kwargs]    [dict]                  : The other options of the L-BFGS-B optimiser (e.g., chunk_size);
+        [replicas]  [list]                  : The optimisers on the replicas of the PINN, which evaluate the candidates
+                                              (the first one is this optimiser itself);
+        [S]         [list]                  : The stored steps, from the oldest to the newest;
+        [Y]         [list]                  : The stored gradient changes, in the same order as S.
+
+        ================================================================================================================
+        """
+
+        super().__init__(pinn, x_train, y_train, dx, factr=factr, pgtol=pgtol, m=m, maxls=maxls, maxfun=maxfun,
+                         **kwargs)
+        self.c1 = c1
+        self.c2 = c2
+        self.replicas = [self] + [ L_BFGS_B(build(*build_args)[-1], x_train, y_train, dx, **kwargs)
+                                   for _ in range(n_candidates - 1) ]
+        self.S = []
+        self.Y = []
+
+    def direction(self, g):
+        """
+        ================================================================================================================
+
+        This function is to obtain the search direction by the two-loop recursion.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [g]         [ndarray]               : The current flat gradients;
+        [rho]       [list]                  : The reciprocals of s.y of the stored pairs;
+        [gamma]     [float]                 : The scaling of the initial inverse Hessian;
+        [d]         [ndarray]               : The search direction.
+
+        ================================================================================================================
+        """
+
+        q = g.copy()
+        rho = [ 1. / np.dot(s, y) for s, y in zip(self.S, self.Y) ]
+        alpha = []
+        for s, y, r in zip(reversed(self.S), reversed(self.Y), reversed(rho)):
+            a = r * np.dot(s, q)
+            q = q - a * y
+            alpha.append(a)
+        gamma = np.dot(self.S[-1], self.Y[-1]) / np.dot(self.Y[-1], self.Y[-1]) if self.S else 1.
+        q = gamma * q
+        for s, y, r, a in zip(self.S, self.Y, rho, reversed(alpha)):
+            b = r * np.dot(y, q)
+            q = q + (a - b) * s
+
+        return -q
+
+    def evaluate(self, points):
+        """
+        ================================================================================================================
+
+        This function is to evaluate the loss and the gradients at several weights and biases in parallel, one on each
+        replica of the PINN, and to record the history of the loss terms.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [points]    [list]                  : The flat weights and biases to be evaluated;
+        [pool]      [ThreadPoolExecutor]    : The thread pool that runs one evaluation per replica;
+        [results]   [list]                  : The (loss, grads, l1, l2) at each of the weights and biases;
+        [telemetry] [Telemetry]             : The preallocated history of the evaluations.
+
+        ================================================================================================================
+        """
+
+        futures = [ self.pool.submit(replica.cached_loss_grad, x) for replica, x in zip(self.replicas, points) ]
+        results = [ f.result() for f in futures ]
+        for loss, grads, l1, l2 in results:
+            self.iter = self.iter + 1
+            self.telemetry.record(self.iter, l1, l2, np.linalg.norm(grads))
+
+        return results
+
+    def line_search(self, x, f, g, d):
+        """
+        ================================================================================================================
+
+        This function is to search the step length with the candidates evaluated in parallel.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [x]         [ndarray]               : The current flat weights and biases;
+        [f]         [float]                 : The current physics-informed loss;
+        [g]         [ndarray]               : The current flat gradients;
+        [d]         [ndarray]               : The search direction;
+        [t0]        [float]                 : The largest step length but one of the current round;
+        [steps]     [ndarray]               : The candidate step lengths of the current round;
+        [wolfe]     [list]                  : Indices of the candidates satisfying the strong Wolfe conditions;
+        [armijo]    [list]                  : Indices of the candidates satisfying the Armijo condition;
+        [accepted]  [tuple]                 : The accepted (x, f, g, l1, l2), or None if the line search fails.
+
+        ================================================================================================================
+        """
+
+        gd = np.dot(g, d)
+        t0 = 1. if self.S else min(1., 1. / np.linalg.norm(g))
+        n = len(self.replicas)
+        ls = 0
+        while ls < self.maxls and self.iter < self.maxfun:
+            k = int(min(n, self.maxls - ls, self.maxfun - self.iter))
+            steps = t0 * 2. ** (1 - np.arange(k))
+            results = self.evaluate([ x + t * d for t in steps ])
+            ls = ls + k
+
+            ### Pick up the lowest loss satisfying the strong Wolfe conditions, or else the Armijo condition
+            armijo = [ i for i, (f_t, g_t, _, _) in enumerate(results)
+                       if np.isfinite(f_t) and f_t <= f + self.c1 * steps[i] * gd ]
+            wolfe = [ i for i in armijo if abs(np.dot(results[i][1], d)) <= self.c2 * abs(gd) ]
+            for candidates in (wolfe, armijo):
+                if candidates:
+                    i = min(candidates, key=lambda i: results[i][0])
+                    return x + steps[i] * d, results[i][0], results[i][1], results[i][2], results[i][3]
+
+            ### Continue below the smallest candidate
+            t0 = steps[-1] / 2.
+
+        return None
+
+    def state(self):
+        """
+        ================================================================================================================
+
+        This function is to return the state of the optimiser for the checkpoints (see Checkpoint.py), including the
+        stored correction pairs, so that the resumed optimiser keeps its curvature information.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [S]         [ndarray]               : The stored steps, one per row;
+        [Y]         [ndarray]               : The stored gradient changes, one per row.
+
+        ================================================================================================================
+        """
+
+        state = super().state()
+        state['S'] = np.array(self.S).reshape(len(self.S), -1)
+        state['Y'] = np.array(self.Y).reshape(len(self.Y), -1)
+
+        return state
+
+    def restore(self, state):
+        """
+        ================================================================================================================
+
+        This function is to restore the state of the optimiser from a checkpoint (the weights and biases are restored
+        by set_weights()).
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [state]     [dict]                  : The state of the training loaded from the checkpoint.
+
+        ================================================================================================================
+        """
+
+        super().restore(state)
+        if 'S' in state:
+            self.S = list(state['S'])
+            self.Y = list(state['Y'])
+
+        return None
+
+    def fit(self):
+        """
+        ================================================================================================================
+
+        This function is to execute training process.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [ini_w]     [ndarray]               : The initial weights and biases;
+        [pool]      [ThreadPoolExecutor]    : The thread pool that runs one evaluation per replica;
+        [x]         [ndarray]               : The current flat weights and biases;
+        [f]         [float]                 : The current physics-informed loss;
+        [g]         [ndarray]               : The current flat gradients;
+        [nit]       [int]                   : Number of iterations;
+        [warnflag]  [int]                   : -1 while running; 0 if converged; 1 if maxfun is reached; 2 if the line
+                                              search fails;
+        [result]    [tuple]                 : The result in the same form as the one returned by the SciPy optimiser,
+                                              (weights and biases, final loss, {'funcalls', 'nit', 'warnflag'});
+        [his_l1]    [ndarray]               : History values of the l1 loss term;
+        [his_l2]    [ndarray]               : History values of the l2 loss term.
+
+        ================================================================================================================
+        """
+
+        ### Get initial weights and biases
+        ini_w = np.concatenate([ v.numpy().flatten() for v in self.variables ]).astype('float64')
+
+        print('Optimizer: L-BFGS (Parallel multi-point line search with %d candidates)' % len(self.replicas))
+        print('Initializing ...\n')
+        self.pool = concurrent.futures.ThreadPoolExecutor(max_workers=len(self.replicas))
+
+        ### Shut the thread pool down however the iterations end, including a Stop raised by the budgets and the exit
+        ### of the checkpoint
+        try:
+            x = ini_w
+            f, g, _, _ = self.evaluate([x])[0]
+            eps = np.finfo(np.float64).eps
+            nit = 0
+            warnflag = -1
+
+            while warnflag < 0:
+
+                ### Obtain the search direction, and restart from the steepest descent direction if it does not descend
+                d = self.direction(g)
+                if np.dot(g, d) >= 0.:
+                    self.S, self.Y = [], []
+                    d = -g
+
+                accepted = self.line_search(x, f, g, d)
+                if accepted is None:
+                    warnflag = 1 if self.iter >= self.maxfun else 2
+                    break
+
+                ### Store the new correction pair if it satisfies the curvature condition
+                x_new, f_new, g_new, l1, l2 = accepted
+                s = x_new - x
+                y = g_new - g
+                if np.dot(s, y) > eps * np.dot(y, y):
+                    self.S = (self.S + [s])[-self.m:]
+                    self.Y = (self.Y + [y])[-self.m:]
+
+                ### Move to the new weights and biases and apply the convergence tests
+                f_old = f
+                x, f, g = x_new, f_new, g_new
+                nit = nit + 1
+                if nit % 10 == 0:
+                    print('Iter: %d   Evaluations: %d   Loss = %.4g' % (nit, self.iter, f))
+                if (f_old - f) / max(abs(f_old), abs(f), 1.) <= self.factr * eps:
+                    warnflag = 0
+                elif np.max(np.abs(g)) <= self.pgtol:
+                    warnflag = 0
+                elif self.iter >= self.maxfun:
+                    warnflag = 1
+
+                ### Hand the state at the accepted weights and biases to the checkpoint, which is saved if due
+                if self.checkpoint is not None:
+                    self.checkpoint.step(self, x)
+
+                ### Check the budgets of the training at the accepted weights and biases, which stop it if any is met
+                if self.budget is not None:
+                    self.budget.check(self, f, l1, l2, x)
+        finally:
+            self.pool.shutdown()
+
+        ### Set the accepted weights and biases back to the neural network, as the last evaluations may be the rejected
+        ### candidates on the replicas
+        self.set_weights(x)
+
+        result = (x, f, {'funcalls': int(self.iter), 'nit': nit, 'warnflag': warnflag})
+
+        return result, self.history()
@@ -55,3 +55,54 @@ def Collocation_Loss(y_p, y):
     loss = l1 + l2
 
     return loss, l1, l2
+
+def Collocation_Residual(y_p, y):
+    """
+    ====================================================================================================================
+
+    Collocation residual function, which gives the per-point residuals of the collocation loss as one flat vector r,
+    so that sum(r^2) equals the final loss of Collocation_Loss(). It is used by the least-squares optimisers (see
+    LM.py).
+
+    --------------------------------------------------------------------------------------------------------------------
+
+    Name        Type                    Info.
+
+    [y_p]       [list]                  : Outputs from the PINN;
+    [y]         [list]                  : The ground truth data;
+    [terms]     [list]                  : The residuals of the equilibrium equation and the traction boundary condition
+                                          (see Collocation_Terms());
+    [r]         [Keras tensor]          : The flat residual vector.
+
+    ====================================================================================================================
+    """
+
+    terms, _ = Collocation_Terms(y_p, y)
+    r = tf.concat([ tf.reshape(t, [-1]) for t in terms ], axis=0)
+
+    return r
+
+def Collocation_Terms(y_p, y):
+    """
+    ====================================================================================================================
+
+    Collocation terms function, which gives the residuals of each output of the PINN separately, so that the sum of
+    squares of each is one term of the collocation loss (three from the equilibrium equation, and fifteen from the
+    traction boundaries). It is used by the adaptive weighting of the loss terms (see Weighting.py) and by
+    Collocation_Residual().
+
+    --------------------------------------------------------------------------------------------------------------------
+
+    Name        Type                    Info.
+
+    [y_p]       [list]                  : Outputs from the PINN;
+    [y]         [list]                  : The ground truth data;
+    [terms]     [list]                  : The residuals of each output (unscaled, as the loss terms are sums);
+    [n_eq]      [int]                   : Number of the terms from the equilibrium equation, which come first.
+
+    ====================================================================================================================
+    """
+
+    terms = [ y_p[i] for i in range(13) ] + [ y_p[13] - y[0] ] + [ y_p[i] for i in range(14, 18) ]
+
+    return terms, 3
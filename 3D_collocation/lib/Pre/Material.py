@@ -37,7 +37,8 @@ def Material(U_x, U_y, U_z, V_x, V_y, V_z, W_x, W_y, W_z,
     [W_xz]      [Keras tensor]          : Second-order derivative of displacement w with respect to x and z directions;
     [W_yy]      [Keras tensor]          : Second-order derivative of displacement w with respect to y direction;
     [W_yz]      [Keras tensor]          : Second-order derivative of displacement w with respect to y and z directions;
-    [W_zz]      [Keras tensor]          : Second-order derivative of displacement w with respect to z direction;
+    [W_zz]      [Keras tensor]          : Second-order derivative of displacement w with respect to z direction
+                                          (the second-order derivatives are None if they are not required);
     [e1]        [Keras tensor]          : Normal strain for x direction;
     [e2]        [Keras tensor]          : Normal strain for y direction;
     [e3]        [Keras tensor]          : Normal strain for z direction;
@@ -80,9 +81,12 @@ def Material(U_x, U_y, U_z, V_x, V_y, V_z, W_x, W_y, W_z,
     s23 = 2 * G * e23
     s13 = 2 * G * e13
 
-    ### Calculate the residual from equilibrium equation
-    Gex = (G + la) * (U_xx + V_xy + W_xz) + G * (U_xx + U_yy + U_zz)
-    Gey = (G + la) * (V_yy + U_xy + W_yz) + G * (V_xx + V_yy + V_zz)
-    Gez = (G + la) * (W_zz + U_xz + V_yz) + G * (W_xx + W_yy + W_zz)
+    ### Calculate the residual from equilibrium equation (not available if the second-order derivatives are not provided)
+    if U_xx is None:
+        Gex, Gey, Gez = None, None, None
+    else:
+        Gex = (G + la) * (U_xx + V_xy + W_xz) + G * (U_xx + U_yy + U_zz)
+        Gey = (G + la) * (V_yy + U_xy + W_yz) + G * (V_xx + V_yy + V_zz)
+        Gez = (G + la) * (W_zz + U_xz + V_yz) + G * (W_xx + W_yy + W_zz)
 
     return e1, e2, e3, e12, e23, e13, s1, s2, s3, s12, s23, s13, Gex, Gey, Gez
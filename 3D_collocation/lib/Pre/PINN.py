@@ -3,8 +3,10 @@ from lib.Pre.Material import Material
 from lib.Pre.Dif_op_x import Dif_x
 from lib.Pre.Dif_op_y import Dif_y
 from lib.Pre.Dif_op_z import Dif_z
+from lib.Pre.Dif_op_xyz import Dif_xyz
+from lib.Pre.Dif_plan import Dif_plan, Dif_terms, Dif_merge
 
-def PINN(net_u, net_v, net_w, E, mu):
+def PINN(net_u, net_v, net_w, E, mu, sizes=None, taylor=False, fused=False):
     """
     ====================================================================================================================
 
@@ -27,100 +29,158 @@ def PINN(net_u, net_v, net_w, E, mu):
     [Gex]       [Keras tensor]          : Residual from the equilibrium equation for x direction;
     [Gey]       [Keras tensor]          : Residual from the equilibrium equation for y direction;
     [sigma_r]   [Keras tensor]          : Stress at the right tip of the rod;
+    [plan]      [dict]                  : The highest derivative order required by each point set;
+    [x_bc]      [Keras tensor]          : Coordinates of the sample points on all the traction boundaries, stacked in
+                                          the order of x1u, x1b, x2u, x2b, x3u and x3b (only if sizes is given);
+    [sizes]     [list of int]           : Number of sample points on each traction boundary. If given, the PINN takes
+                                          the stacked inputs [x, x_bc] and evaluates all the traction boundaries in one
+                                          single pass; otherwise, it takes one input for each point set;
     [E]         [float]                 : Young's module;
-    [mu]        [float]                 : Poisson ratio.
+    [mu]        [float]                 : Poisson ratio;
+    [taylor]    [bool]                  : Whether to obtain the differential terms by the Taylor-mode forward sweep;
+    [fused]     [bool]                  : Whether to obtain the differential terms of u, v and w by the fused
+                                          differential operator (see Dif_op_xyz.py) instead of the separate ones.
 
     ====================================================================================================================
     """
 
-    ### Declare inputs
+    ### Declare input for the domain
     x = tf.keras.layers.Input(shape=(3,))
-    x1u = tf.keras.layers.Input(shape=(3,))
-    x1b = tf.keras.layers.Input(shape=(3,))
-    x2u = tf.keras.layers.Input(shape=(3,))
-    x2b = tf.keras.layers.Input(shape=(3,))
-    x3u = tf.keras.layers.Input(shape=(3,))
-    x3b = tf.keras.layers.Input(shape=(3,))
-
-    ### Initialize the differential operators
-    dif_x = Dif_x(net_u)
-    dif_y = Dif_y(net_v)
-    dif_z = Dif_z(net_w)
-    
-    ### Obtain partial derivatives with respect to x and y
-    U_x, U_y, U_z, U_xx, U_xy, U_xz, U_yy, U_yz, U_zz = dif_x(x)
-    V_x, V_y, V_z, V_xx, V_xy, V_xz, V_yy, V_yz, V_zz = dif_y(x)
-    W_x, W_y, W_z, W_xx, W_xy, W_xz, W_yy, W_yz, W_zz = dif_z(x)
-
-    U_1u_x, U_1u_y, U_1u_z, U_1u_xx, U_1u_xy, U_1u_xz, U_1u_yy, U_1u_yz, U_1u_zz = dif_x(x1u)
-    V_1u_x, V_1u_y, V_1u_z, V_1u_xx, V_1u_xy, V_1u_xz, V_1u_yy, V_1u_yz, V_1u_zz = dif_y(x1u)
-    W_1u_x, W_1u_y, W_1u_z, W_1u_xx, W_1u_xy, W_1u_xz, W_1u_yy, W_1u_yz, W_1u_zz = dif_z(x1u)
-
-    U_1b_x, U_1b_y, U_1b_z, U_1b_xx, U_1b_xy, U_1b_xz, U_1b_yy, U_1b_yz, U_1b_zz = dif_x(x1b)
-    V_1b_x, V_1b_y, V_1b_z, V_1b_xx, V_1b_xy, V_1b_xz, V_1b_yy, V_1b_yz, V_1b_zz = dif_y(x1b)
-    W_1b_x, W_1b_y, W_1b_z, W_1b_xx, W_1b_xy, W_1b_xz, W_1b_yy, W_1b_yz, W_1b_zz = dif_z(x1b)
-
-    U_2u_x, U_2u_y, U_2u_z, U_2u_xx, U_2u_xy, U_2u_xz, U_2u_yy, U_2u_yz, U_2u_zz = dif_x(x2u)
-    V_2u_x, V_2u_y, V_2u_z, V_2u_xx, V_2u_xy, V_2u_xz, V_2u_yy, V_2u_yz, V_2u_zz = dif_y(x2u)
-    W_2u_x, W_2u_y, W_2u_z, W_2u_xx, W_2u_xy, W_2u_xz, W_2u_yy, W_2u_yz, W_2u_zz = dif_z(x2u)
-
-    U_2b_x, U_2b_y, U_2b_z, U_2b_xx, U_2b_xy, U_2b_xz, U_2b_yy, U_2b_yz, U_2b_zz = dif_x(x2b)
-    V_2b_x, V_2b_y, V_2b_z, V_2b_xx, V_2b_xy, V_2b_xz, V_2b_yy, V_2b_yz, V_2b_zz = dif_y(x2b)
-    W_2b_x, W_2b_y, W_2b_z, W_2b_xx, W_2b_xy, W_2b_xz, W_2b_yy, W_2b_yz, W_2b_zz = dif_z(x2b)
 
-    U_3u_x, U_3u_y, U_3u_z, U_3u_xx, U_3u_xy, U_3u_xz, U_3u_yy, U_3u_yz, U_3u_zz = dif_x(x3u)
-    V_3u_x, V_3u_y, V_3u_z, V_3u_xx, V_3u_xy, V_3u_xz, V_3u_yy, V_3u_yz, V_3u_zz = dif_y(x3u)
-    W_3u_x, W_3u_y, W_3u_z, W_3u_xx, W_3u_xy, W_3u_xz, W_3u_yy, W_3u_yz, W_3u_zz = dif_z(x3u)
-
-    U_3b_x, U_3b_y, U_3b_z, U_3b_xx, U_3b_xy, U_3b_xz, U_3b_yy, U_3b_yz, U_3b_zz = dif_x(x3b)
-    V_3b_x, V_3b_y, V_3b_z, V_3b_xx, V_3b_xy, V_3b_xz, V_3b_yy, V_3b_yz, V_3b_zz = dif_y(x3b)
-    W_3b_x, W_3b_y, W_3b_z, W_3b_xx, W_3b_xy, W_3b_xz, W_3b_yy, W_3b_yz, W_3b_zz = dif_z(x3b)
+    ### Plan the derivative orders required by each point set from the Material outputs it contributes
+    plan = Dif_plan({'x': ['Gex', 'Gey', 'Gez'],
+                     'x1u': ['s1', 's12', 's13'], 'x1b': ['s12', 's13'],
+                     'x2u': ['s2', 's12', 's23'], 'x2b': ['s12', 's23'],
+                     'x3u': ['s3', 's23', 's13'], 'x3b': ['s23', 's13']})
+
+    ### Initialize the differential operators for u, v and w, one for each of the planned orders (the separate ones
+    ### by default, as the fused one is slower on the cube, see Benchmark_Dif_op.py)
+    if fused:
+        dif = { o: Dif_xyz(net_u, net_v, net_w, order=o, taylor=taylor) for o in set(plan.values()) }
+    else:
+        dif = { o: Dif_merge(Dif_x(net_u, order=o, taylor=taylor), Dif_y(net_v, order=o, taylor=taylor),
+                             Dif_z(net_w, order=o, taylor=taylor)) for o in set(plan.values()) }
+    
+    ### Obtain partial derivatives of u, v and w with respect to x, y and z in the domain
+    (U_x, U_y, U_z, V_x, V_y, V_z, W_x, W_y, W_z,
+        U_xx, U_xy, U_xz, U_yy, U_yz, U_zz,
+        V_xx, V_xy, V_xz, V_yy, V_yz, V_zz,
+        W_xx, W_xy, W_xz, W_yy, W_yz, W_zz) = Dif_terms(dif[plan['x']](x), 27)
 
-    ### Obtain the residuals from stress boundary conditions
+    ### Obtain the residuals from the governing equations
     _, _, _, _, _, _, _, _, _, _, _, _, Gex, Gey, Gez = Material(
         U_x, U_y, U_z, V_x, V_y, V_z, W_x, W_y, W_z,
         U_xx, U_xy, U_xz, U_yy, U_yz, U_zz,
         V_xx, V_xy, V_xz, V_yy, V_yz, V_zz,
         W_xx, W_xy, W_xz, W_yy, W_yz, W_zz, E, mu)
 
-    _, _, _, _, _, _, s11u, _, _, s121u, _, s131u, _, _, _ = Material(
-        U_1u_x, U_1u_y, U_1u_z, V_1u_x, V_1u_y, V_1u_z, W_1u_x, W_1u_y, W_1u_z,
-        U_1u_xx, U_1u_xy, U_1u_xz, U_1u_yy, U_1u_yz, U_1u_zz,
-        V_1u_xx, V_1u_xy, V_1u_xz, V_1u_yy, V_1u_yz, V_1u_zz,
-        W_1u_xx, W_1u_xy, W_1u_xz, W_1u_yy, W_1u_yz, W_1u_zz, E, mu)
-
-    _, _, _, _, _, _, _, _, _, s121b, _, s131b, _, _, _ = Material(
-        U_1b_x, U_1b_y, U_1b_z, V_1b_x, V_1b_y, V_1b_z, W_1b_x, W_1b_y, W_1b_z,
-        U_1b_xx, U_1b_xy, U_1b_xz, U_1b_yy, U_1b_yz, U_1b_zz,
-        V_1b_xx, V_1b_xy, V_1b_xz, V_1b_yy, V_1b_yz, V_1b_zz,
-        W_1b_xx, W_1b_xy, W_1b_xz, W_1b_yy, W_1b_yz, W_1b_zz, E, mu)
-
-    _, _, _, _, _, _, _, s22u, _, s122u, s232u, _, _, _, _ = Material(
-        U_2u_x, U_2u_y, U_2u_z, V_2u_x, V_2u_y, V_2u_z, W_2u_x, W_2u_y, W_2u_z,
-        U_2u_xx, U_2u_xy, U_2u_xz, U_2u_yy, U_2u_yz, U_2u_zz,
-        V_2u_xx, V_2u_xy, V_2u_xz, V_2u_yy, V_2u_yz, V_2u_zz,
-        W_2u_xx, W_2u_xy, W_2u_xz, W_2u_yy, W_2u_yz, W_2u_zz, E, mu)
-
-    _, _, _, _, _, _, _, _, _, s122b, s232b, _, _, _, _ = Material(
-        U_2b_x, U_2b_y, U_2b_z, V_2b_x, V_2b_y, V_2b_z, W_2b_x, W_2b_y, W_2b_z,
-        U_2b_xx, U_2b_xy, U_2b_xz, U_2b_yy, U_2b_yz, U_2b_zz,
-        V_2b_xx, V_2b_xy, V_2b_xz, V_2b_yy, V_2b_yz, V_2b_zz,
-        W_2b_xx, W_2b_xy, W_2b_xz, W_2b_yy, W_2b_yz, W_2b_zz, E, mu)
-
-    _, _, _, _, _, _, _, _, s33u, _, s233u, s133u, _, _, _ = Material(
-        U_3u_x, U_3u_y, U_3u_z, V_3u_x, V_3u_y, V_3u_z, W_3u_x, W_3u_y, W_3u_z,
-        U_3u_xx, U_3u_xy, U_3u_xz, U_3u_yy, U_3u_yz, U_3u_zz,
-        V_3u_xx, V_3u_xy, V_3u_xz, V_3u_yy, V_3u_yz, V_3u_zz,
-        W_3u_xx, W_3u_xy, W_3u_xz, W_3u_yy, W_3u_yz, W_3u_zz, E, mu)
-
-    _, _, _, _, _, _, _, _, _, _, s233b, s133b, _, _, _ = Material(
-        U_3b_x, U_3b_y, U_3b_z, V_3b_x, V_3b_y, V_3b_z, W_3b_x, W_3b_y, W_3b_z,
-        U_3b_xx, U_3b_xy, U_3b_xz, U_3b_yy, U_3b_yz, U_3b_zz,
-        V_3b_xx, V_3b_xy, V_3b_xz, V_3b_yy, V_3b_yz, V_3b_zz,
-        W_3b_xx, W_3b_xy, W_3b_xz, W_3b_yy, W_3b_yz, W_3b_zz, E, mu)
+    if sizes is None:
+        ### Declare inputs for each traction boundary
+        x1u = tf.keras.layers.Input(shape=(3,))
+        x1b = tf.keras.layers.Input(shape=(3,))
+        x2u = tf.keras.layers.Input(shape=(3,))
+        x2b = tf.keras.layers.Input(shape=(3,))
+        x3u = tf.keras.layers.Input(shape=(3,))
+        x3b = tf.keras.layers.Input(shape=(3,))
+        inputs = [x, x1u, x1b, x2u, x2b, x3u, x3b]
+
+        ### Obtain partial derivatives of u, v and w with respect to x, y and z on each traction boundary
+        (U_1u_x, U_1u_y, U_1u_z, V_1u_x, V_1u_y, V_1u_z, W_1u_x, W_1u_y, W_1u_z,
+            U_1u_xx, U_1u_xy, U_1u_xz, U_1u_yy, U_1u_yz, U_1u_zz,
+            V_1u_xx, V_1u_xy, V_1u_xz, V_1u_yy, V_1u_yz, V_1u_zz,
+            W_1u_xx, W_1u_xy, W_1u_xz, W_1u_yy, W_1u_yz, W_1u_zz) = Dif_terms(dif[plan['x1u']](x1u), 27)
+
+        (U_1b_x, U_1b_y, U_1b_z, V_1b_x, V_1b_y, V_1b_z, W_1b_x, W_1b_y, W_1b_z,
+            U_1b_xx, U_1b_xy, U_1b_xz, U_1b_yy, U_1b_yz, U_1b_zz,
+            V_1b_xx, V_1b_xy, V_1b_xz, V_1b_yy, V_1b_yz, V_1b_zz,
+            W_1b_xx, W_1b_xy, W_1b_xz, W_1b_yy, W_1b_yz, W_1b_zz) = Dif_terms(dif[plan['x1b']](x1b), 27)
+
+        (U_2u_x, U_2u_y, U_2u_z, V_2u_x, V_2u_y, V_2u_z, W_2u_x, W_2u_y, W_2u_z,
+            U_2u_xx, U_2u_xy, U_2u_xz, U_2u_yy, U_2u_yz, U_2u_zz,
+            V_2u_xx, V_2u_xy, V_2u_xz, V_2u_yy, V_2u_yz, V_2u_zz,
+            W_2u_xx, W_2u_xy, W_2u_xz, W_2u_yy, W_2u_yz, W_2u_zz) = Dif_terms(dif[plan['x2u']](x2u), 27)
+
+        (U_2b_x, U_2b_y, U_2b_z, V_2b_x, V_2b_y, V_2b_z, W_2b_x, W_2b_y, W_2b_z,
+            U_2b_xx, U_2b_xy, U_2b_xz, U_2b_yy, U_2b_yz, U_2b_zz,
+            V_2b_xx, V_2b_xy, V_2b_xz, V_2b_yy, V_2b_yz, V_2b_zz,
+            W_2b_xx, W_2b_xy, W_2b_xz, W_2b_yy, W_2b_yz, W_2b_zz) = Dif_terms(dif[plan['x2b']](x2b), 27)
+
+        (U_3u_x, U_3u_y, U_3u_z, V_3u_x, V_3u_y, V_3u_z, W_3u_x, W_3u_y, W_3u_z,
+            U_3u_xx, U_3u_xy, U_3u_xz, U_3u_yy, U_3u_yz, U_3u_zz,
+            V_3u_xx, V_3u_xy, V_3u_xz, V_3u_yy, V_3u_yz, V_3u_zz,
+            W_3u_xx, W_3u_xy, W_3u_xz, W_3u_yy, W_3u_yz, W_3u_zz) = Dif_terms(dif[plan['x3u']](x3u), 27)
+
+        (U_3b_x, U_3b_y, U_3b_z, V_3b_x, V_3b_y, V_3b_z, W_3b_x, W_3b_y, W_3b_z,
+            U_3b_xx, U_3b_xy, U_3b_xz, U_3b_yy, U_3b_yz, U_3b_zz,
+            V_3b_xx, V_3b_xy, V_3b_xz, V_3b_yy, V_3b_yz, V_3b_zz,
+            W_3b_xx, W_3b_xy, W_3b_xz, W_3b_yy, W_3b_yz, W_3b_zz) = Dif_terms(dif[plan['x3b']](x3b), 27)
+
+        ### Obtain the residuals from stress boundary conditions
+        _, _, _, _, _, _, s11u, _, _, s121u, _, s131u, _, _, _ = Material(
+            U_1u_x, U_1u_y, U_1u_z, V_1u_x, V_1u_y, V_1u_z, W_1u_x, W_1u_y, W_1u_z,
+            U_1u_xx, U_1u_xy, U_1u_xz, U_1u_yy, U_1u_yz, U_1u_zz,
+            V_1u_xx, V_1u_xy, V_1u_xz, V_1u_yy, V_1u_yz, V_1u_zz,
+            W_1u_xx, W_1u_xy, W_1u_xz, W_1u_yy, W_1u_yz, W_1u_zz, E, mu)
+
+        _, _, _, _, _, _, _, _, _, s121b, _, s131b, _, _, _ = Material(
+            U_1b_x, U_1b_y, U_1b_z, V_1b_x, V_1b_y, V_1b_z, W_1b_x, W_1b_y, W_1b_z,
+            U_1b_xx, U_1b_xy, U_1b_xz, U_1b_yy, U_1b_yz, U_1b_zz,
+            V_1b_xx, V_1b_xy, V_1b_xz, V_1b_yy, V_1b_yz, V_1b_zz,
+            W_1b_xx, W_1b_xy, W_1b_xz, W_1b_yy, W_1b_yz, W_1b_zz, E, mu)
+
+        _, _, _, _, _, _, _, s22u, _, s122u, s232u, _, _, _, _ = Material(
+            U_2u_x, U_2u_y, U_2u_z, V_2u_x, V_2u_y, V_2u_z, W_2u_x, W_2u_y, W_2u_z,
+            U_2u_xx, U_2u_xy, U_2u_xz, U_2u_yy, U_2u_yz, U_2u_zz,
+            V_2u_xx, V_2u_xy, V_2u_xz, V_2u_yy, V_2u_yz, V_2u_zz,
+            W_2u_xx, W_2u_xy, W_2u_xz, W_2u_yy, W_2u_yz, W_2u_zz, E, mu)
+
+        _, _, _, _, _, _, _, _, _, s122b, s232b, _, _, _, _ = Material(
+            U_2b_x, U_2b_y, U_2b_z, V_2b_x, V_2b_y, V_2b_z, W_2b_x, W_2b_y, W_2b_z,
+            U_2b_xx, U_2b_xy, U_2b_xz, U_2b_yy, U_2b_yz, U_2b_zz,
+            V_2b_xx, V_2b_xy, V_2b_xz, V_2b_yy, V_2b_yz, V_2b_zz,
+            W_2b_xx, W_2b_xy, W_2b_xz, W_2b_yy, W_2b_yz, W_2b_zz, E, mu)
+
+        _, _, _, _, _, _, _, _, s33u, _, s233u, s133u, _, _, _ = Material(
+            U_3u_x, U_3u_y, U_3u_z, V_3u_x, V_3u_y, V_3u_z, W_3u_x, W_3u_y, W_3u_z,
+            U_3u_xx, U_3u_xy, U_3u_xz, U_3u_yy, U_3u_yz, U_3u_zz,
+            V_3u_xx, V_3u_xy, V_3u_xz, V_3u_yy, V_3u_yz, V_3u_zz,
+            W_3u_xx, W_3u_xy, W_3u_xz, W_3u_yy, W_3u_yz, W_3u_zz, E, mu)
+
+        _, _, _, _, _, _, _, _, _, _, s233b, s133b, _, _, _ = Material(
+            U_3b_x, U_3b_y, U_3b_z, V_3b_x, V_3b_y, V_3b_z, W_3b_x, W_3b_y, W_3b_z,
+            U_3b_xx, U_3b_xy, U_3b_xz, U_3b_yy, U_3b_yz, U_3b_zz,
+            V_3b_xx, V_3b_xy, V_3b_xz, V_3b_yy, V_3b_yz, V_3b_zz,
+            W_3b_xx, W_3b_xy, W_3b_xz, W_3b_yy, W_3b_yz, W_3b_zz, E, mu)
+    else:
+        ### Declare one stacked input for all the traction boundaries (x1u, x1b, x2u, x2b, x3u and x3b)
+        x_bc = tf.keras.layers.Input(shape=(3,))
+        inputs = [x, x_bc]
+
+        ### Obtain partial derivatives of u, v and w with respect to x, y and z on all the traction boundaries in one
+        ### pass
+        order = max([ plan[k] for k in ['x1u', 'x1b', 'x2u', 'x2b', 'x3u', 'x3b'] ])
+        (U_bc_x, U_bc_y, U_bc_z, V_bc_x, V_bc_y, V_bc_z, W_bc_x, W_bc_y, W_bc_z,
+            U_bc_xx, U_bc_xy, U_bc_xz, U_bc_yy, U_bc_yz, U_bc_zz,
+            V_bc_xx, V_bc_xy, V_bc_xz, V_bc_yy, V_bc_yz, V_bc_zz,
+            W_bc_xx, W_bc_xy, W_bc_xz, W_bc_yy, W_bc_yz, W_bc_zz) = Dif_terms(dif[order](x_bc), 27)
+
+        ### Obtain the stresses on all the traction boundaries
+        _, _, _, _, _, _, s1, s2, s3, s12, s23, s13, _, _, _ = Material(
+            U_bc_x, U_bc_y, U_bc_z, V_bc_x, V_bc_y, V_bc_z, W_bc_x, W_bc_y, W_bc_z,
+            U_bc_xx, U_bc_xy, U_bc_xz, U_bc_yy, U_bc_yz, U_bc_zz,
+            V_bc_xx, V_bc_xy, V_bc_xz, V_bc_yy, V_bc_yz, V_bc_zz,
+            W_bc_xx, W_bc_xy, W_bc_xz, W_bc_yy, W_bc_yz, W_bc_zz, E, mu)
+
+        ### Split the stresses into each traction boundary by the precomputed segment sizes
+        s11u, _, _, _, _, _ = tf.split(s1, sizes, axis=0)
+        _, _, s22u, _, _, _ = tf.split(s2, sizes, axis=0)
+        _, _, _, _, s33u, _ = tf.split(s3, sizes, axis=0)
+        s121u, s121b, s122u, s122b, _, _ = tf.split(s12, sizes, axis=0)
+        _, _, s232u, s232b, s233u, s233b = tf.split(s23, sizes, axis=0)
+        s131u, s131b, _, _, s133u, s133b = tf.split(s13, sizes, axis=0)
 
     ### build up the PINN
-    pinn = tf.keras.models.Model(inputs=[x, x1u, x1b, x2u, x2b, x3u, x3b],
+    pinn = tf.keras.models.Model(inputs=inputs,
         outputs=[Gex, Gey, Gez,
             s11u, s121u, s131u, s121b, s131b,
             s22u, s122u, s232u, s122b, s232b,
@@ -0,0 +1,261 @@
+import numpy as np
+import tensorflow as tf
+from lib.Pre.L_BFGS_B import L_BFGS_B
+from lib.Pre.Parallel import Parallel
+from lib.Pre.Loss import Collocation_Terms
+
+class RAR(L_BFGS_B):
+    """
+    ====================================================================================================================
+
+    This is the class for the residual-based adaptive refinement (RAR) of the domain points, which runs between the
+    stages of the optimiser schedule (see Schedule.py), e.g.,
+        Schedule([Adam(...), rar, L_BFGS_B(...), rar, L_BFGS_B(...)]),
+    where the same refinement appears before each stage that trains on the refined domain points. At each refinement,
+    the residual of the equilibrium equation, r = sqrt(sum of the squared residuals of each equation), is evaluated
+    chunk by chunk on the current domain points and on a large pool of candidate points, so that the peak memory only
+    depends on the chunk size. The n_add unused candidates with the largest residuals, above the root mean square of
+    the residuals of the current points, are added, and the points whose residual stays below 'prune' times the root
+    mean square for 'patience' refinements in a row are dropped. The refined domain points are handed to the given
+    stages, which go on from the current weights and biases. They are saved in the checkpoints of these stages, so that
+    a resumed schedule trains on the same points. As an optimiser schedule stage, it subclasses the L-BFGS-B optimiser
+    for the handling of the weights and biases, the checkpoints and the (empty) history, but does not train the PINN.
+    This class include 6 functions, including:
+        1. __init__()         : Initialise the parameters for the refinement;
+        2. residual()         : Calculate the residual of the equilibrium equation at each point of a chunk;
+        3. residuals()        : Calculate the residuals of a set of points chunk by chunk;
+        4. points()           : Return the current domain points and the state of the refinement;
+        5. assign()           : Hand the domain points to this refinement and to the stages;
+        6. fit()              : Execute the refinement.
+
+    ====================================================================================================================
+    """
+
+    def __init__(self, pinn, x_train, y_train, dx, pool, stages, n_add=500, prune=0.1, patience=2, min_points=1000,
+                 chunk_size=8192):
+        """
+        ================================================================================================================
+
+        This function is to initialise the parameters used in the refinement.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [pinn]      [Keras model]           : The Physics-informed neural network;
+        [x_train]   [list]                  : PINN input list, contains all the coordinates information;
+        [y_train]   [list]                  : PINN boundary condition list, contains the traction boundary condition;
+        [dx]        [float]                 : Sample points interval;
+        [pool]      [ndarray or str]        : The candidate domain points, or the path of a .npy file, which is then
+                                              memory-mapped and read chunk by chunk;
+        [stages]    [list]                  : The optimisers that train on the refined domain points (the
+                                              data-parallel optimiser and the mini-batches of the Adam optimiser are
+                                              not supported, as they hold their own copies of the points);
+        [n_add]     [int]                   : Maximum number of candidate points added at each refinement;
+        [prune]     [float]                 : The threshold of the residual below which a point is dropped, relative
+                                              to the root mean square of the residuals;
+        [patience]  [int]                   : Number of refinements in a row that a point stays below the threshold
+                                              before it is dropped;
+        [min_points][int]                   : Minimum number of domain points kept;
+        [chunk_size][int]                   : Number of points evaluated at once;
+        [n_eq]      [int]                   : Number of the PINN outputs from the equilibrium equation;
+        [used]      [ndarray]               : Whether each candidate point has been added;
+        [low]       [ndarray]               : Number of refinements in a row that each domain point stayed below the
+                                              threshold;
+        [refinement][RAR]                   : The refinement whose domain points are saved in the checkpoints of this
+                                              refinement and of the stages (see L_BFGS_B.state()).
+
+        ================================================================================================================
+        """
+
+        for stage in stages:
+            if isinstance(stage, Parallel) or getattr(stage, 'iterator', None) is not None:
+                raise ValueError('The refinement requires the optimisers to hold the domain points themselves.')
+
+        super().__init__(pinn, x_train, y_train, dx, maxfun=1)
+        self.pool = np.load(pool, mmap_mode='r') if isinstance(pool, str) else pool
+        self.stages = stages
+        self.n_add = n_add
+        self.prune = prune
+        self.patience = patience
+        self.min_points = min_points
+        self.rar_chunk_size = chunk_size
+        _, self.n_eq = Collocation_Terms(self.pinn([self.x_train[0][:1]] + self.x_train[1:]), self.y_train)
+        self.used = np.zeros(len(self.pool), dtype=bool)
+        self.low = np.zeros(len(self.x_train[0]), dtype=int)
+
+        ### Save the domain points in the checkpoints of this refinement and of the stages
+        self.refinement = self
+        for stage in stages:
+            stage.refinement = self
+
+    @tf.function
+    def residual(self, x, x_bc, y):
+        """
+        ================================================================================================================
+
+        This function is to calculate the residual of the equilibrium equation at each point of a chunk, and the l2 loss
+        term of the traction boundary condition.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [x]         [Keras tensor]          : One chunk of the points;
+        [x_bc]      [list]                  : The point sets of the traction boundaries;
+        [y]         [list]                  : PINN boundary condition list, contains the traction boundary condition;
+        [y_p]       [list]                  : List of predictions from the PINN;
+        [r]         [Keras tensor]          : The residual of the equilibrium equation at each point;
+        [l2]        [Keras tensor]          : The l2 loss term.
+
+        ================================================================================================================
+        """
+
+        y_p = self.pinn([x] + x_bc)
+        r = tf.sqrt(tf.add_n([ tf.square(tf.reshape(y_p[i], [-1])) for i in range(self.n_eq) ]))
+        terms, n_eq = Collocation_Terms(y_p, y)
+        l2 = tf.add_n([ tf.reduce_sum(tf.square(t)) for t in terms[n_eq:] ])
+
+        return r, l2
+
+    def residuals(self, x, mask=None):
+        """
+        ================================================================================================================
+
+        This function is to calculate the residuals of a set of points chunk by chunk.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [x]         [ndarray]               : The points (may be memory-mapped);
+        [mask]      [ndarray]               : Whether each point is skipped (None to evaluate all the points);
+        [r]         [ndarray]               : The residual at each point (0 for the skipped points);
+        [l2]        [float]                 : The l2 loss term.
+
+        ================================================================================================================
+        """
+
+        r = np.zeros(len(x))
+        l2 = 0.
+        for start in range(0, len(x), self.rar_chunk_size):
+            end = min(start + self.rar_chunk_size, len(x))
+            if mask is not None and np.all(mask[start:end]):
+                continue
+            x_c = tf.constant(np.asarray(x[start:end]), dtype=self.dtype)
+            r_c, l2 = self.residual(x_c, self.x_train[1:], self.y_train)
+            r[start:end] = r_c.numpy()
+        if mask is not None:
+            r[mask] = 0.
+
+        return r, float(l2)
+
+    def points(self):
+        """
+        ================================================================================================================
+
+        This function is to return the current domain points and the state of the refinement, which are saved in the
+        checkpoints of the stages (see L_BFGS_B.state()).
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [x_domain]  [ndarray]               : The current domain points;
+        [rar_used]  [ndarray]               : Whether each candidate point has been added;
+        [rar_low]   [ndarray]               : Number of refinements in a row that each domain point stayed below the
+                                              threshold.
+
+        ================================================================================================================
+        """
+
+        return {'x_domain': np.asarray(self.x_train[0]), 'rar_used': self.used, 'rar_low': self.low}
+
+    def assign(self, state):
+        """
+        ================================================================================================================
+
+        This function is to hand the domain points to this refinement and to the stages, which go on from the current
+        weights and biases (also used to restore them from a checkpoint, see L_BFGS_B.restore()).
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [state]     [dict]                  : The domain points and the state of the refinement (see points()).
+
+        ================================================================================================================
+        """
+
+        self.used = np.array(state['rar_used'], dtype=bool)
+        self.low = np.array(state['rar_low'], dtype=int)
+        for stage in [self] + list(self.stages):
+            for replica in getattr(stage, 'replicas', [stage]):
+                x = np.array(state['x_domain'], dtype=self.dtype)
+                replica.x_train[0] = x if replica.chunk_size is not None else tf.constant(x, dtype=self.dtype)
+                replica.cache.clear()
+
+        return None
+
+    def fit(self):
+        """
+        ================================================================================================================
+
+        This function is to execute the refinement.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [x]         [ndarray]               : The current domain points;
+        [r]         [ndarray]               : The residuals of the current domain points;
+        [rms]       [float]                 : The root mean square of the residuals of the current domain points;
+        [keep]      [ndarray]               : Whether each current domain point is kept;
+        [r_pool]    [ndarray]               : The residuals of the unused candidate points;
+        [ids]       [ndarray]               : The indices of the added candidate points;
+        [x_new]     [ndarray]               : The refined domain points;
+        [result]    [tuple]                 : The result in the same form as the one returned by the SciPy optimiser,
+                                              (weights and biases, loss on the refined points, {'funcalls',
+                                              'n_points', 'n_added', 'n_dropped'});
+        [his_l1]    [ndarray]               : History values of the l1 loss term (empty);
+        [his_l2]    [ndarray]               : History values of the l2 loss term (empty).
+
+        ================================================================================================================
+        """
+
+        print('Refinement: RAR (residual-based adaptive refinement of the domain points)')
+
+        ### Evaluate the residuals of the current domain points, and count the ones that stay below the threshold
+        x = np.asarray(self.x_train[0])
+        r, l2 = self.residuals(x)
+        rms = np.sqrt(np.mean(np.square(r)))
+        self.low = np.where(r < self.prune * rms, self.low + 1, 0)
+
+        ### Drop the points that stayed below the threshold long enough, but keep the min_points largest residuals
+        keep = self.low < self.patience
+        if np.sum(keep) < self.min_points:
+            keep[np.argsort(-r)[:self.min_points]] = True
+
+        ### Add the unused candidates with the largest residuals, above the root mean square
+        r_pool, _ = self.residuals(self.pool, mask=self.used)
+        ids = np.argpartition(-r_pool, min(self.n_add, len(r_pool)) - 1)[:self.n_add] if len(r_pool) > 0 else []
+        ids = np.sort([ i for i in ids if r_pool[i] > rms ]).astype(int)
+        used = self.used.copy()
+        used[ids] = True
+
+        x_new = np.vstack([x[keep], np.asarray(self.pool[ids]).reshape(-1, x.shape[1]).astype(x.dtype)])
+        r_new = np.concatenate([r[keep], r_pool[ids]])
+        low = np.concatenate([self.low[keep], np.zeros(len(ids), dtype=int)])
+        print('Domain points: %d (%d added, %d dropped), residual RMS = %.4g\n'
+              % (len(x_new), len(ids), np.sum(~keep), rms))
+
+        ### Hand the refined domain points to the stages (and to this refinement)
+        self.assign({'x_domain': x_new, 'rar_used': used, 'rar_low': low})
+
+        ### The loss on the refined points, from the residuals already evaluated
+        l1 = np.mean(np.square(r_new)) if self.reduction == 'mean' else np.sum(np.square(r_new))
+        weights = np.concatenate([ v.numpy().flatten() for v in self.variables ])
+        result = (weights, float(l1 + l2), {'funcalls': 0, 'n_points': len(x_new), 'n_added': len(ids),
+                                             'n_dropped': int(np.sum(~keep))})
+
+        return result, self.history()
@@ -0,0 +1,264 @@
+import numpy as np
+import scipy.stats.qmc
+import tensorflow as tf
+from lib.Pre.Loss import Collocation_Terms
+
+class Sampler:
+    """
+    ====================================================================================================================
+
+    This is the class for the vectorised generator of the sample points in the interior and on the boundaries of a
+    box-shaped domain, which is used by Input_Info() and, to regenerate the domain points every 'every' steps, by the
+    Adam optimiser. Five methods are available:
+        'grid'      : The uniform grid including the end points, with the same number of points along each axis (the
+                      original point sets of Input_Info());
+        'random'    : The uniform random points;
+        'sobol'     : The scrambled Sobol' sequence (balanced for the numbers of points which are powers of 2);
+        'halton'    : The scrambled Halton sequence;
+        'lhs'       : The Latin hypercube sampling.
+    The quasi-random sequences reach the same integration error with far fewer points than the random points. Each set
+    of points is drawn from its own stream, seeded by the seed, the key of the set (e.g., one key per boundary) and the
+    number of the regeneration, so that the sets are reproducible and the regenerated sets are the same after a resumed
+    training. The regenerated domain points may also be importance-sampled from a larger set of candidates, with the
+    probabilities proportional to r^power / mean(r^power) + mix, where r is the residual of the equilibrium equation
+    at each candidate, so that the points concentrate where the residual is large. This class include 7 functions,
+    including:
+        1. __init__()         : Initialise the settings of the sampler;
+        2. unit()             : Generate the points in the unit hypercube;
+        3. interior()         : Generate the points in the interior of the box;
+        4. boundary()         : Generate the points on one face of the box;
+        5. importance()       : Draw the points from the candidates by the residual-weighted importance sampling;
+        6. residual()         : Calculate the residual of the equilibrium equation at each candidate;
+        7. step()             : Regenerate the domain points of the optimiser if 'every' steps have passed.
+
+    ====================================================================================================================
+    """
+
+    def __init__(self, method='sobol', seed=0, every=None, lower=None, upper=None, oversample=0, power=1., mix=1.,
+                 chunk_size=8192):
+        """
+        ================================================================================================================
+
+        This function is to initialise the settings of the sampler.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [method]    [str]                   : The sampling method ('grid', 'random', 'sobol', 'halton' or 'lhs');
+        [seed]      [int]                   : The random seed of the sampler;
+        [every]     [int]                   : Number of steps between two regenerations of the domain points (None to
+                                              keep them fixed);
+        [lower]     [list]                  : The lower corner of the domain of the regenerated points (None for the
+                                              bounds of the initial domain points);
+        [upper]     [list]                  : The upper corner of the domain of the regenerated points (None for the
+                                              bounds of the initial domain points);
+        [oversample][int]                   : Number of candidates per regenerated point for the importance sampling (0
+                                              to regenerate the points by the method directly);
+        [power]     [float]                 : The power of the residual in the probabilities of the importance sampling;
+        [mix]       [float]                 : The uniform part of the probabilities of the importance sampling;
+        [chunk_size][int]                   : Number of candidates whose residuals are evaluated at once;
+        [last]      [int]                   : The number of the last regeneration (None before the first one).
+
+        ================================================================================================================
+        """
+
+        if method not in ('grid', 'random', 'sobol', 'halton', 'lhs'):
+            raise ValueError('Unknown sampling method: ' + str(method) + '.')
+
+        self.method = method
+        self.seed = seed
+        self.every = every
+        self.lower = lower
+        self.upper = upper
+        self.oversample = oversample
+        self.power = power
+        self.mix = mix
+        self.chunk_size = chunk_size
+        self.last = None
+
+    def unit(self, n, d, key=0):
+        """
+        ================================================================================================================
+
+        This function is to generate n points in the unit hypercube [0, 1]^d.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [n]         [int]                   : Number of points (a d-th power for the grid);
+        [d]         [int]                   : Number of dimensions;
+        [key]       [int or list]           : The key of the stream of the points;
+        [rng]       [Generator]             : The random number generator of the stream;
+        [u]         [ndarray]               : The points.
+
+        ================================================================================================================
+        """
+
+        rng = np.random.default_rng([self.seed] + list(np.atleast_1d(key)))
+
+        if self.method == 'grid':
+            m = int(round(n ** (1. / d)))
+            if m ** d != n:
+                raise ValueError('The grid requires a number of points which is a %d-th power, got %d.' % (d, n))
+            axes = np.meshgrid(*[ np.linspace(0., 1., m) ] * d, indexing='ij')
+            u = np.stack([ a.reshape(-1) for a in axes ], axis=1)
+        elif self.method == 'random':
+            u = rng.random((n, d))
+        elif self.method == 'sobol':
+            u = scipy.stats.qmc.Sobol(d, scramble=True, seed=rng).random(n)
+        elif self.method == 'halton':
+            u = scipy.stats.qmc.Halton(d, scramble=True, seed=rng).random(n)
+        else:
+            u = scipy.stats.qmc.LatinHypercube(d, seed=rng).random(n)
+
+        return u
+
+    def interior(self, n, lower, upper, key=0):
+        """
+        ================================================================================================================
+
+        This function is to generate n points in the interior of the box [lower, upper].
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [n]         [int]                   : Number of points;
+        [lower]     [list]                  : The lower corner of the box;
+        [upper]     [list]                  : The upper corner of the box;
+        [key]       [int or list]           : The key of the stream of the points.
+
+        ================================================================================================================
+        """
+
+        lower, upper = np.asarray(lower, dtype='float64'), np.asarray(upper, dtype='float64')
+
+        return lower + (upper - lower) * self.unit(n, len(lower), key)
+
+    def boundary(self, n, lower, upper, axis, value, key=0):
+        """
+        ================================================================================================================
+
+        This function is to generate n points on the face of the box [lower, upper] where the coordinate 'axis' equals
+        'value'.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [n]         [int]                   : Number of points;
+        [lower]     [list]                  : The lower corner of the box;
+        [upper]     [list]                  : The upper corner of the box;
+        [axis]      [int]                   : The axis normal to the face;
+        [value]     [float]                 : The coordinate of the face along the axis;
+        [key]       [int or list]           : The key of the stream of the points;
+        [free]      [list]                  : The axes along the face.
+
+        ================================================================================================================
+        """
+
+        lower, upper = np.asarray(lower, dtype='float64'), np.asarray(upper, dtype='float64')
+        free = [ i for i in range(len(lower)) if i != axis ]
+        x = np.full((n, len(lower)), float(value))
+        x[:, free] = lower[free] + (upper[free] - lower[free]) * self.unit(n, len(free), key)
+
+        return x
+
+    def importance(self, n, x, r, key=0):
+        """
+        ================================================================================================================
+
+        This function is to draw n distinct points from the candidates, with the probabilities proportional to
+        r^power / mean(r^power) + mix.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [n]         [int]                   : Number of points;
+        [x]         [ndarray]               : The candidates;
+        [r]         [ndarray]               : The residual at each candidate;
+        [key]       [int or list]           : The key of the stream of the points;
+        [p]         [ndarray]               : The probability of each candidate.
+
+        ================================================================================================================
+        """
+
+        rng = np.random.default_rng([self.seed] + list(np.atleast_1d(key)))
+        p = np.power(np.abs(r), self.power)
+        p = p / max(np.mean(p), np.finfo(np.float64).tiny) + self.mix
+        p = p / np.sum(p)
+
+        return x[rng.choice(len(x), size=n, replace=False, p=p)]
+
+    def residual(self, opt, x):
+        """
+        ================================================================================================================
+
+        This function is to calculate the residual of the equilibrium equation at each candidate, r = sqrt(sum of the
+        squared residuals of each equation), chunk by chunk.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [opt]       [class]                 : The optimiser;
+        [x]         [ndarray]               : The candidates;
+        [n_eq]      [int]                   : Number of the PINN outputs from the equilibrium equation;
+        [r]         [ndarray]               : The residual at each candidate.
+
+        ================================================================================================================
+        """
+
+        r = np.zeros(len(x))
+        for start in range(0, len(x), self.chunk_size):
+            x_c = tf.constant(x[start:start + self.chunk_size], dtype=opt.dtype)
+            y_p = opt.pinn([x_c] + list(opt.x_train[1:]))
+            _, n_eq = Collocation_Terms(y_p, opt.y_train)
+            r[start:start + len(x_c)] = np.sqrt(sum([ np.square(np.reshape(y_p[i], -1)) for i in range(n_eq) ]))
+
+        return r
+
+    def step(self, opt):
+        """
+        ================================================================================================================
+
+        This function is to regenerate the domain points of the optimiser if 'every' steps have passed since the last
+        regeneration (called by the Adam optimiser between the chunks of steps, see Adam.py). The number of the
+        regeneration, iter // every, keys the stream of the points.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [opt]       [class]                 : The optimiser, whose domain points (x_train[0]) are a tf.Variable;
+        [k]         [int]                   : The number of the regeneration;
+        [x]         [ndarray]               : The regenerated domain points.
+
+        ================================================================================================================
+        """
+
+        if self.every is None or opt.iter // self.every == self.last:
+            return None
+
+        k = opt.iter // self.every
+        self.last = k
+
+        ### Take the domain of the regenerated points from the initial domain points, if not given
+        n, d = opt.x_train[0].shape
+        if self.lower is None or self.upper is None:
+            x = opt.x_train[0].numpy()
+            self.lower = np.min(x, axis=0) if self.lower is None else self.lower
+            self.upper = np.max(x, axis=0) if self.upper is None else self.upper
+
+        ### Regenerate the domain points, by the importance sampling from the candidates if required
+        if self.oversample > 0:
+            x = self.interior(self.oversample * n, self.lower, self.upper, key=[0, k])
+            x = self.importance(n, x, self.residual(opt, x), key=[1, k])
+        else:
+            x = self.interior(n, self.lower, self.upper, key=[0, k])
+        opt.x_train[0].assign(x.astype(opt.dtype))
+
+        return None
@@ -0,0 +1,139 @@
+import numpy as np
+from lib.Pre.Budget import Stop
+
+class Schedule:
+    """
+    ====================================================================================================================
+
+    This is the class for the optimiser schedule. It executes a list of optimisers one after another on the same PINN,
+    e.g., the Adam optimiser as a warm-up followed by the L-BFGS-B optimiser for refinement. As all the optimisers share
+    the trainable variables of the PINN, the weights and biases reached by one stage are naturally handed off to the
+    next stage. If a checkpoint is given (see Checkpoint.py), the state of the training is checkpointed at the start of
+    each stage and during the stages, and the schedule can be resumed from the latest checkpoint. If budgets are given
+    (see Budget.py), the schedule stops as soon as any of them is met, with the history up to the stop. This class
+    include 3 functions, including:
+        1. __init__()         : Initialise the optimiser schedule;
+        2. restore()          : Restore the schedule from the latest checkpoint;
+        3. fit()              : Execute training process.
+
+    ====================================================================================================================
+    """
+
+    def __init__(self, stages, checkpoint=None):
+        """
+        ================================================================================================================
+
+        This function is to initialise the optimiser schedule.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [stages]    [list]                  : The initialised optimisers (e.g., Adam, L_BFGS_B and L_BFGS_TF), in the
+                                              order of execution;
+        [checkpoint][Checkpoint]            : The checkpoint of the training (None if the training is not
+                                              checkpointed);
+        [start]     [int]                   : The stage to start from;
+        [funcalls]  [int]                   : Number of function calls of the stages before the start;
+        [his_l1]    [list]                  : History values of the l1 loss term of the stages before the start;
+        [his_l2]    [list]                  : History values of the l2 loss term of the stages before the start;
+        [budget]    [Budget]                : The budgets of the training, set by Train() (None if there is no budget).
+
+        ================================================================================================================
+        """
+
+        self.stages = stages
+        self.checkpoint = checkpoint
+        self.start = 0
+        self.funcalls = 0
+        self.his_l1 = []
+        self.his_l2 = []
+        self.budget = None
+        for stage in self.stages:
+            stage.checkpoint = checkpoint
+
+    def restore(self):
+        """
+        ================================================================================================================
+
+        This function is to restore the schedule from the latest checkpoint: the stage to start from, the weights and
+        biases, the history of the previous stages, and the state of the optimiser of that stage.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [state]     [dict]                  : The state of the training loaded from the checkpoint.
+
+        ================================================================================================================
+        """
+
+        state = None if self.checkpoint is None else self.checkpoint.load()
+        if state is None:
+            print('No checkpoint is found, the training starts from the initial weights and biases\n')
+            return None
+
+        self.start = int(state['stage'])
+        self.funcalls = int(state['funcalls'])
+        self.his_l1 = [state['his_l1']]
+        self.his_l2 = [state['his_l2']]
+        stage = self.stages[self.start]
+        stage.set_weights(state['weights'])
+        stage.restore(state)
+        print('Resumed from %s: stage %d, iteration %d\n' % (self.checkpoint.path, self.start + 1, state['iter']))
+
+        return None
+
+    def fit(self):
+        """
+        ================================================================================================================
+
+        This function is to execute training process.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [result]    [tuple]                 : The result returned by the last executed optimiser, with the number of
+                                              function calls of all the stages (and the budget criterion met, if any);
+        [his_l1]    [ndarray]               : History values of the l1 loss term of all the stages;
+        [his_l2]    [ndarray]               : History values of the l2 loss term of all the stages.
+
+        ================================================================================================================
+        """
+
+        ### Execute the optimisers one after another, from the restored stage
+        his_l1, his_l2 = list(self.his_l1), list(self.his_l2)
+        funcalls = self.funcalls
+        for i in range(self.start, len(self.stages)):
+            stage = self.stages[i]
+
+            ### Hand the state of the schedule to the checkpoint, and save the checkpoint at the start of each stage
+            ### (but the first one, which starts from the initial or the restored weights and biases)
+            if self.checkpoint is not None:
+                self.checkpoint.context = {'stage': i, 'funcalls': funcalls,
+                                           'his_l1': np.concatenate([np.zeros(0)] + his_l1),
+                                           'his_l2': np.concatenate([np.zeros(0)] + his_l2)}
+                if i > self.start:
+                    self.checkpoint.step(stage, force=True)
+
+            ### Execute the stage, or stop it when any of the budgets is met, with the history up to the stop
+            stage.budget = self.budget
+            try:
+                result, his_loss = stage.fit()
+            except Stop as stop:
+                result, his_loss = stop.result, stage.history()
+            his_l1.append(his_loss[0])
+            his_l2.append(his_loss[1])
+            funcalls = funcalls + result[2]['funcalls']
+            if 'stop' in result[2]:
+                break
+
+        ### Wait for the last checkpoint to be written
+        if self.checkpoint is not None:
+            self.checkpoint.wait()
+
+        ### Count the function calls of all the stages
+        result[2]['funcalls'] = funcalls
+
+        return result, [np.concatenate(his_l1), np.concatenate(his_l2)]
\ No newline at end of file
@@ -0,0 +1,29 @@
+import numpy as np
+
+def Stack(x_train, groups):
+    """
+    ====================================================================================================================
+
+    This function is to stack the point sets of the PINN input list into groups, so that each group is evaluated by
+    the networks and the differential operators in one single pass. The number of sample points of each point set is
+    also returned, which is used by the PINN to split the results back to each boundary condition.
+
+    --------------------------------------------------------------------------------------------------------------------
+
+    Name        Type                    Info.
+
+    [x_train]   [List]                  : PINN input list, contains all the coordinates information;
+    [groups]    [list of list]          : Indices of the point sets in x_train to be stacked into each group;
+    [x_stack]   [List]                  : The stacked PINN input list, one array for each group;
+    [sizes]     [list of list]          : Number of sample points of each point set in each group.
+
+    ====================================================================================================================
+    """
+
+    ### Stack the point sets of each group
+    x_stack = [ np.vstack([ x_train[i] for i in g ]) for g in groups ]
+
+    ### Record the number of sample points of each point set
+    sizes = [ [ len(x_train[i]) for i in g ] for g in groups ]
+
+    return x_stack, sizes
@@ -0,0 +1,158 @@
+import tensorflow as tf
+
+class Taylor(tf.keras.layers.Layer):
+    """
+    ====================================================================================================================
+
+    This is the class for calculating the value, the Jacobian and the Hessian of the hard-constrained displacement
+    output (the FNN's output times one of the coordinates) in one single forward sweep. Instead of nesting the
+    GradientTape functions, the derivatives with respect to the FNN's input are pushed forward layer by layer, using
+    the closed-form derivatives of the tanh activation:
+        z = a W + b,  h = tanh(z),  t' = 1 - h^2,  t'' = -2 h t',
+        J_z = J_a W,  H_z = H_a W,  J_h = t' J_z,  H_h = t'' (J_z x J_z) + t' H_z.
+    The value, the d Jacobian rows and only the d (d + 1) / 2 rows of the upper triangle of the symmetric Hessian are
+    stacked in one (n, 1 + d + d (d + 1) / 2, width) tensor, which is pushed through each kernel by one single matmul,
+    instead of the (n, d, d, width) products of the full Hessian. The kernels and biases are read from the Dense layers
+    of the FNN, so that the outputs stay differentiable with respect to the weights and biases. On the small FNNs of
+    these problems, the sweep has been measured slower than the nested GradientTape functions (see Benchmark_Dif_op.py
+    in the '3D_collocation' folder, which also prints the peak memory of each operator on a GPU), so that it is only
+    used if asked for (taylor=True).
+    This class include 2 functions, including:
+        1. __init__()         : Initialise the parameters for the forward sweep;
+        2. call()             : Calculate the value, the Jacobian and the Hessian.
+
+    ====================================================================================================================
+    """
+
+    def __init__(self, fnn, axis, order=2, **kwargs):
+        """
+        ================================================================================================================
+
+        This function is to initialise for the forward sweep.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [fnn]       [Keras model]           : The Feedforward Neural Network, built by FNN() with the tanh activation;
+        [axis]      [int]                   : Index of the coordinate multiplied to the FNN's output;
+        [order]     [int]                   : The highest order of the derivatives to be calculated (1 or 2);
+        [dense]     [list]                  : The Dense layers of the FNN.
+
+        ================================================================================================================
+        """
+        self.fnn = fnn
+        self.axis = axis
+        self.order = order
+        self.dense = [ l for l in fnn.layers if isinstance(l, tf.keras.layers.Dense) ]
+
+        ### Only the tanh hidden layers and the linear output layer have the closed-form derivatives implemented
+        for l in self.dense[:-1]:
+            if l.activation.__name__ != 'tanh':
+                raise ValueError('Taylor only supports the tanh activation, got ' + l.activation.__name__ + '.')
+        if self.dense[-1].activation.__name__ != 'linear':
+            raise ValueError('Taylor only supports the linear output layer.')
+
+
+        ### Keep the coordinates, the derivatives and the loss in the floating-point type of the inputs, as the layer
+        ### would otherwise follow the mixed precision policy and cast the coordinates to bfloat16 (see Precision.py)
+        super().__init__(dtype=kwargs.pop('dtype', tf.keras.backend.floatx()), **kwargs)
+
+    def call(self, x):
+        """
+        ================================================================================================================
+
+        This function is to calculate the value, the Jacobian and the Hessian.
+
+        ----------------------------------------------------------------------------------------------------------------
+
+        Name        Type                    Info.
+
+        [x]         [Keras tensor]          : The coordinate array, with the shape of (n, d);
+        [pairs]     [list]                  : The index pairs (i, j), i <= j, of the upper triangle of the Hessian, row
+                                              by row (empty, if order = 1);
+        [S]         [Keras tensor]          : The value, the Jacobian rows and the Hessian rows of the output of each
+                                              layer, stacked with the shape of (n, 1 + d + len(pairs), width);
+        [z]         [Keras tensor]          : The pre-activation of each layer, with the shape of (n, width);
+        [J_z]       [Keras tensor]          : The Jacobian of z, with the shape of (n, d, width);
+        [H_z]       [Keras tensor]          : The upper triangle of the Hessian of z, with the shape of (n, len(pairs),
+                                              width);
+        [t1]        [Keras tensor]          : The first-order derivative of tanh, t';
+        [t2]        [Keras tensor]          : The second-order derivative of tanh, t'';
+        [x_k]       [Keras tensor]          : The coordinate multiplied to the FNN's output;
+        [e_k]       [Keras tensor]          : The unit vector along the coordinate x_k;
+        [U]         [Keras tensor]          : The displacement predictions, U = y x_k;
+        [dU]        [Keras tensor]          : The Jacobian of U, dU_i = J_i x_k + y e_k,i, with the shape of (n, d);
+        [ddU]       [Keras tensor]          : The upper triangle of the Hessian of U, ddU_ij = H_ij x_k + J_i e_k,j +
+                                              J_j e_k,i, with the shape of (n, len(pairs)) (None, if order = 1).
+
+        ================================================================================================================
+        """
+
+        d = x.shape[-1]
+        pairs = [ (i, j) for i in range(d) for j in range(i, d) ] if self.order == 2 else []
+        I, K = [ p[0] for p in pairs ], [ p[1] for p in pairs ]
+        n = tf.shape(x)[0]
+
+        ### Stack the value, the Jacobian (the unit vectors) and the Hessian (zero) of the input
+        S = tf.concat([x[:, tf.newaxis, :], tf.tile(tf.eye(d, dtype=x.dtype)[tf.newaxis], [n, 1, 1]),
+                       tf.zeros([n, len(pairs), d], dtype=x.dtype)], axis=1)
+
+        ### Push the stacked rows forward through the Dense layers
+        for l in self.dense:
+            ### All the rows go through the kernel in one matmul, and only the value takes the bias
+            Z = tf.matmul(tf.reshape(S, [-1, l.kernel.shape[0]]), l.kernel)
+            Z = tf.reshape(Z, [n, 1 + d + len(pairs), l.kernel.shape[1]])
+            z, J_z, H_z = Z[:, 0] + l.bias, Z[:, 1:1 + d], Z[:, 1 + d:]
+
+            ### The output layer is linear
+            if l is self.dense[-1]:
+                break
+
+            a = tf.tanh(z)
+            t1 = 1. - a * a
+            rows = [a[:, tf.newaxis], t1[:, tf.newaxis] * J_z]
+            if self.order == 2:
+                t2 = -2. * a * t1
+                rows.append(t2[:, tf.newaxis] * tf.gather(J_z, I, axis=1) * tf.gather(J_z, K, axis=1) +
+                            t1[:, tf.newaxis] * H_z)
+            S = tf.concat(rows, axis=1)
+
+        ### Apply the product rule to the hard-constrained output U = y x_k
+        y, J, H = z, J_z[..., 0], H_z[..., 0]
+        x_k = x[..., self.axis, tf.newaxis]
+        e_k = tf.one_hot(self.axis, d, dtype=x.dtype)
+        U = y * x_k
+        dU = J * x_k + y * e_k
+        if self.order == 1:
+            return U, dU, None
+
+        ddU = H * x_k + tf.gather(J, I, axis=1) * tf.gather(e_k, K) + tf.gather(J, K, axis=1) * tf.gather(e_k, I)
+
+        return U, dU, ddU
+
+def Taylor_terms(dU, ddU):
+    """
+    ====================================================================================================================
+
+    This function is to pick up the differential terms from the Jacobian and the Hessian, in the same order as the
+    differential operators, i.e., the first-order derivatives followed by the upper triangle of the Hessian row by row
+    (e.g., U_x, U_y, U_xx, U_xy, U_yy in 2D).
+
+    --------------------------------------------------------------------------------------------------------------------
+
+    Name        Type                    Info.
+
+    [dU]        [Keras tensor]          : The Jacobian of the displacement output, with the shape of (n, d);
+    [ddU]       [Keras tensor]          : The upper triangle of the Hessian of the displacement output, row by row,
+                                          with the shape of (n, d (d + 1) / 2), or None;
+    [terms]     [tuple]                 : The differential terms, each with the shape of (n, 1).
+
+    ====================================================================================================================
+    """
+
+    terms = tuple(dU[..., i, tf.newaxis] for i in range(dU.shape[-1]))
+    if ddU is not None:
+        terms = terms + tuple(ddU[..., p, tf.newaxis] for p in range(ddU.shape[-1]))
+
+    return terms
@@ -0,0 +1,49 @@
+import numpy as np
+import scipy.io
+import tensorflow as tf
+
+def Validation(net_u, net_v, net_w, path='FEA.mat', key='U', n_points=20000):
+    """
+    ====================================================================================================================
+
+    Validation function is to build up the validation function of the cube problem, which returns the relative L2 error
+    of the predicted displacements against the FEA displacements at a fixed random subset of the FEA nodes (see
+    Budget.py). The FEA nodes are stored as 'X' in FEA.mat, and the FEA displacements must be stored next to them as
+    key, with the shape of (number of nodes, 3). The shipped FEA.mat only holds the nodes ('X') and the elements ('E'),
+    so that the FEA displacements must be added to it before the validation can be used.
+
+    --------------------------------------------------------------------------------------------------------------------
+
+    Name        Type                    Info.
+
+    [net_u]     [keras model]           : The FNN for displacement u;
+    [net_v]     [keras model]           : The FNN for displacement v;
+    [net_w]     [keras model]           : The FNN for displacement w;
+    [path]      [str]                   : The path of the FEA results;
+    [key]       [str]                   : The key of the FEA displacements in the FEA results;
+    [n_points]  [int]                   : Number of the validation nodes (None for all the FEA nodes);
+    [x]         [array of float]        : The validation nodes;
+    [U]         [array of float]        : The FEA displacements at the validation nodes;
+    [validation][function]              : The function that returns the relative L2 error of the current FNNs.
+
+    ====================================================================================================================
+    """
+
+    C = scipy.io.loadmat(path)
+    if key not in C:
+        raise ValueError('No FEA displacements (' + key + ') are found in ' + path + ', the validation cannot be built.')
+
+    ### Pick up a fixed subset of the FEA nodes, so that the validation stays cheap on the fine FEA mesh
+    x, U = C['X'], C[key]
+    if n_points is not None and n_points < len(x):
+        ids = np.random.default_rng(0).choice(len(x), n_points, replace=False)
+        x, U = x[ids], U[ids]
+    x = x.astype(tf.keras.backend.floatx())
+
+    def validation():
+        ### The displacements satisfy the fixed faces by u = x * net_u, v = y * net_v and w = z * net_w, as in
+        ### PINN.py
+        U_p = np.hstack([net_u(x).numpy() * x[:, 0:1], net_v(x).numpy() * x[:, 1:2], net_w(x).numpy() * x[:, 2:3]])
+        return np.linalg.norm(U_p - U) / np.linalg.norm(U)
+
+    return validation
\ No newline at end of file
@@ -1,6 +1,6 @@
 import time
 
-def Train(l_bfgs_b):
+def Train(opt, resume=False, budget=None):
     """
     ====================================================================================================================
 
@@ -10,6 +10,11 @@ def Train(l_bfgs_b):
 
     Name        Type                    Info.
 
+    [opt]       [class]                 : The initialised optimiser (or optimiser schedule);
+    [resume]    [bool]                  : Whether the training continues from the latest checkpoint (the optimiser
+                                          schedule must be given a checkpoint, see Checkpoint.py);
+    [budget]    [Budget]                : The budgets of the training (wall-clock time, target loss, plateau and
+                                          validation error, see Budget.py), None to train until the optimisers stop;
     [result]    [tuple]                 : The result returned by the optimiser;
     [his_loss]  [list]                  : History values of the loss terms;
     [t]         [float]                 : CPU time used for training;
@@ -19,8 +24,17 @@ def Train(l_bfgs_b):
     ====================================================================================================================
     """
 
+    ### Restore the optimiser schedule from the latest checkpoint, if required
+    if resume:
+        opt.restore()
+
+    ### Hand the budgets to the optimiser schedule, and start their wall-clock time
+    if budget is not None:
+        opt.budget = budget
+        budget.start()
+
     time_start = time.time()
-    hist, his_loss = l_bfgs_b.fit()
+    hist, his_loss = opt.fit()
     time_end = time.time()
     
     T = time_end-time_start
@@ -31,6 +45,8 @@ def Train(l_bfgs_b):
     print('Time cost is', T, 's')
     print('Final loss is', L, '')
     print('Training converges by', it, 'iterations\n')
+    if 'stop' in hist[2]:
+        print('Training is stopped by the budget:', hist[2]['stop'], '\n')
     print('*************************************************\n')
     
     return T, L, it, his_loss
\ No newline at end of file